@@ -0,0 +1,301 @@
+"""
+Benchmark del almacén: operaciones del sistema con recorrido de lista vs con índices.
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/almacen.py [--tamanios 1000,10000,100000] [--repeticiones 200]
+                                 [--max-lineal 1000000] [--sin-memoria] [--salida resultados.json]
+
+Para cada tamaño de grupo (de 1k a 10M) y cada implementación mide:
+- poblar: estudiantes por segundo al generar el grupo (lo que hace poblar_datos_iniciales) y,
+  con tracemalloc, la memoria pico de esa carga.
+- agregar, eliminar, buscar por carné, buscar por nombre, promedio superior a 9.5 y promedio
+  general: operaciones por segundo y latencias p50/p99 en microsegundos.
+
+"lista" reproduce los recorridos de la versión original de student_management.py (lista de
+diccionarios más set de carnés); "indexado" es GestorEstudiantes. La lista solo se mide hasta
+--max-lineal estudiantes, porque cada consulta recorre el grupo completo.
+
+El resultado se escribe como JSON (en --salida o en la salida estándar) con claves en orden
+fijo, para poder comparar dos corridas con diff; el resumen legible va a la salida de errores.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gestion_estudiantes import AsignadorCarnes, ESQUEMA_CLI, GeneradorEstudiantes, GestorEstudiantes
+
+# Correlativo de 6 dígitos y 100 años: caben hasta 99.999.900 carnés, suficiente para 10M
+ESQUEMA_BENCH = ESQUEMA_CLI._replace(patron_carne=r"0905-[0-9]{2}-[0-9]{6}")
+ANIOS = range(100)
+
+TAMANIOS = [1_000, 10_000, 100_000]
+REPETICIONES_LINEAL = 20  # Tope de repeticiones para la lista: cada operación recorre todo el grupo
+UMBRAL = 9.5
+
+
+def maximo_correlativo(tamanio):
+    """Correlativos por año que necesita un grupo del tamaño dado, con holgura.
+
+    El asignador reserva un byte por correlativo posible de cada año: con el máximo de 6 dígitos
+    serían ~100 MB, que se contarían como memoria del grupo.
+    """
+    return max(999, 2 * -(-tamanio // len(ANIOS)))
+
+
+class ListaEstudiantes:
+    """Los recorridos de la versión original: lista de diccionarios y set de carnés."""
+
+    nombre = "lista"
+
+    def __init__(self, tamanio):
+        self.estudiantes = []
+        self.carnes = set()
+        self.asignador = AsignadorCarnes(ESQUEMA_BENCH, maximo=maximo_correlativo(tamanio))
+
+    def poblar(self, cantidad, semilla):
+        generador = GeneradorEstudiantes(semilla, ESQUEMA_BENCH, self.asignador, anios=ANIOS)
+        for estudiante in generador.estudiantes(cantidad):
+            self.agregar(estudiante)
+
+    def agregar(self, estudiante):
+        if estudiante['carne'] in self.carnes:
+            return False
+        self.estudiantes.append(estudiante)
+        self.carnes.add(estudiante['carne'])
+        return True
+
+    def eliminar(self, carne):
+        encontrado = None
+        for estudiante in self.estudiantes:
+            if estudiante['carne'] == carne:
+                encontrado = estudiante
+                break
+        if encontrado:
+            self.estudiantes.remove(encontrado)
+            self.carnes.remove(carne)
+        return encontrado
+
+    def buscar_carne(self, carne):
+        for estudiante in self.estudiantes:
+            if estudiante['carne'] == carne:
+                return estudiante
+        return None
+
+    def buscar_nombre(self, termino):
+        termino = termino.lower()
+        return [est for est in self.estudiantes if termino in est['nombre'].lower()]
+
+    def superiores(self, umbral):
+        return [est for est in self.estudiantes if est['promedio'] > umbral]
+
+    def promedio(self):
+        if not self.estudiantes:
+            return None
+        return sum(est['promedio'] for est in self.estudiantes) / len(self.estudiantes)
+
+    def __len__(self):
+        return len(self.estudiantes)
+
+
+class Indexado:
+    """Las mismas operaciones sobre GestorEstudiantes (índices, registros compactos)."""
+
+    nombre = "indexado"
+
+    def __init__(self, tamanio):
+        self.sistema = GestorEstudiantes(ESQUEMA_BENCH, maximo_correlativo=maximo_correlativo(tamanio))
+
+    def poblar(self, cantidad, semilla):
+        self.sistema.poblar(cantidad, semilla=semilla, anios=ANIOS)
+
+    def agregar(self, estudiante):
+        return self.sistema.agregar(estudiante)
+
+    def eliminar(self, carne):
+        return self.sistema.eliminar(carne)
+
+    def buscar_carne(self, carne):
+        return self.sistema.obtener(carne)
+
+    def buscar_nombre(self, termino):
+        return self.sistema.buscar(termino)
+
+    def superiores(self, umbral):
+        return self.sistema.superiores_a(umbral)
+
+    def promedio(self):
+        return self.sistema.promedio_general()
+
+    def __len__(self):
+        return len(self.sistema)
+
+
+IMPLEMENTACIONES = [ListaEstudiantes, Indexado]
+
+
+def resumir(tiempos_ns):
+    """Operaciones por segundo y latencias (µs) de una lista de duraciones en nanosegundos."""
+    tiempos = sorted(tiempos_ns)
+    total = sum(tiempos)
+
+    def percentil(p):
+        # Rango más cercano: el menor tiempo que cubre al p% de las mediciones
+        return tiempos[max(0, -(-len(tiempos) * p // 100) - 1)] / 1000
+
+    return {
+        "repeticiones": len(tiempos),
+        "ops_por_segundo": round(len(tiempos) * 1e9 / total, 1) if total else None,
+        "p50_us": round(percentil(50), 2),
+        "p99_us": round(percentil(99), 2),
+        "media_us": round(total / len(tiempos) / 1000, 2),
+    }
+
+
+def cronometrar(funcion, argumentos):
+    """Duración en ns de funcion(argumento) para cada argumento."""
+    reloj = time.perf_counter_ns
+    tiempos = []
+    for argumento in argumentos:
+        inicio = reloj()
+        funcion(argumento)
+        tiempos.append(reloj() - inicio)
+    return tiempos
+
+
+def nuevos_estudiantes(cantidad):
+    """Estudiantes con carnés fuera del rango que usa poblar (correlativos desde 900000)."""
+    return [{'nombre': f"Nuevo Estudiante {i}", 'carne': f"0905-{i % 100:02d}-{900000 + i:06d}",
+             'materias': [("Cálculo I", 4)], 'promedio': 7.5} for i in range(cantidad)]
+
+
+def medir_memoria(clase, tamanio, semilla):
+    """Memoria pico (bytes) de poblar un grupo nuevo bajo tracemalloc."""
+    gc.collect()
+    tracemalloc.start()
+    implementacion = clase(tamanio)
+    implementacion.poblar(tamanio, semilla)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del implementacion
+    return pico
+
+
+def medir(clase, tamanio, repeticiones, semilla, con_memoria):
+    implementacion = clase(tamanio)
+    gc.collect()
+    inicio = time.perf_counter()
+    implementacion.poblar(tamanio, semilla)
+    segundos = time.perf_counter() - inicio
+
+    aleatorio = random.Random(semilla)
+    if clase is ListaEstudiantes:
+        repeticiones = min(repeticiones, REPETICIONES_LINEAL)
+        carnes = [est['carne'] for est in implementacion.estudiantes]
+        nombres = [est['nombre'] for est in aleatorio.sample(implementacion.estudiantes, repeticiones)]
+    else:
+        carnes = list(implementacion.sistema.set_carnes)
+        nombres = [implementacion.sistema.obtener(carne)['nombre']
+                   for carne in aleatorio.sample(carnes, repeticiones)]
+    muestra = aleatorio.sample(carnes, repeticiones)
+
+    operaciones = {}
+    operaciones["agregar"] = resumir(cronometrar(implementacion.agregar, nuevos_estudiantes(repeticiones)))
+    eliminados = []
+    operaciones["eliminar"] = resumir(cronometrar(lambda carne: eliminados.append(implementacion.eliminar(carne)),
+                                                  muestra))
+    for estudiante in eliminados:  # Se restauran para que el grupo conserve su tamaño
+        implementacion.agregar(estudiante)
+    operaciones["buscar_carne"] = resumir(cronometrar(implementacion.buscar_carne, muestra))
+    operaciones["buscar_nombre"] = resumir(cronometrar(implementacion.buscar_nombre, nombres))
+    operaciones["promedio_superior"] = resumir(cronometrar(implementacion.superiores, [UMBRAL] * repeticiones))
+    operaciones["promedio_general"] = resumir(cronometrar(lambda _: implementacion.promedio(),
+                                                          range(repeticiones)))
+
+    resultado = {
+        "implementacion": clase.nombre,
+        "tamanio": tamanio,
+        "poblar": {"segundos": round(segundos, 3), "estudiantes_por_segundo": round(tamanio / segundos, 1)},
+        "operaciones": operaciones,
+    }
+    del implementacion
+    if con_memoria:
+        resultado["memoria_pico_bytes"] = medir_memoria(clase, tamanio, semilla)
+    return resultado
+
+
+def comparar(resultados):
+    """Cuántas veces más rápida (p50) es la versión indexada que la lista, por tamaño y operación."""
+    por_clave = {(r["implementacion"], r["tamanio"]): r for r in resultados}
+    comparacion = []
+    for (implementacion, tamanio), lista in sorted(por_clave.items()):
+        indexado = por_clave.get(("indexado", tamanio))
+        if implementacion != "lista" or indexado is None:
+            continue
+        comparacion.append({
+            "tamanio": tamanio,
+            "aceleracion_p50": {
+                operacion: round(medida["p50_us"] / max(indexado["operaciones"][operacion]["p50_us"], 0.01), 2)
+                for operacion, medida in lista["operaciones"].items()
+            },
+        })
+    return comparacion
+
+
+def imprimir_resumen(resultado):
+    print(f"\n{resultado['implementacion']} - {resultado['tamanio']:,} estudiantes: "
+          f"poblar {resultado['poblar']['estudiantes_por_segundo']:,.0f} est/s"
+          + (f", memoria pico {resultado['memoria_pico_bytes'] / 1e6:,.1f} MB"
+             if "memoria_pico_bytes" in resultado else ""), file=sys.stderr)
+    for operacion, medida in resultado["operaciones"].items():
+        print(f"  {operacion:18s} {medida['ops_por_segundo']:14,.0f} op/s  "
+              f"p50 {medida['p50_us']:12,.1f} µs  p99 {medida['p99_us']:12,.1f} µs", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del almacén de estudiantes")
+    parser.add_argument("--tamanios", default=",".join(map(str, TAMANIOS)),
+                        help="tamaños de grupo separados por coma (p. ej. 1000,10000,10000000)")
+    parser.add_argument("--repeticiones", type=int, default=200, help="mediciones por operación")
+    parser.add_argument("--max-lineal", type=int, default=1_000_000,
+                        help="tamaño máximo para medir la versión con recorrido de lista")
+    parser.add_argument("--sin-memoria", action="store_true", help="no medir la memoria pico (más rápido)")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--salida", help="archivo JSON de resultados (por omisión, la salida estándar)")
+    argumentos = parser.parse_args()
+
+    resultados = []
+    for tamanio in (int(t) for t in argumentos.tamanios.split(",")):
+        for clase in IMPLEMENTACIONES:
+            if clase is ListaEstudiantes and tamanio > argumentos.max_lineal:
+                continue
+            repeticiones = min(argumentos.repeticiones, tamanio)
+            resultado = medir(clase, tamanio, repeticiones, argumentos.semilla, not argumentos.sin_memoria)
+            imprimir_resumen(resultado)
+            resultados.append(resultado)
+
+    informe = {
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "semilla": argumentos.semilla,
+        "umbral_promedio": UMBRAL,
+        "resultados": resultados,
+        "comparacion": comparar(resultados),
+    }
+    texto = json.dumps(informe, ensure_ascii=False, indent=2)
+    if argumentos.salida:
+        with open(argumentos.salida, "w", encoding="utf-8") as archivo:
+            archivo.write(texto + "\n")
+    else:
+        print(texto)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""
+Benchmark del almacén SQLite frente al almacén en memoria.
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/almacen_sqlite.py [--tamanios 1000,10000,100000] [--repeticiones 200]
+                                        [--sin-sincronizar] [--salida resultados.json]
+
+Para cada tamaño mide en GestorEstudiantes ("memoria") y en AlmacenSQLite ("sqlite", en un
+directorio temporal):
+- poblar: estudiantes por segundo de la carga inicial (en SQLite, una sola transacción).
+- agregar y eliminar: una transacción por operación, como en el menú interactivo; en SQLite
+  cada una espera el fsync salvo con --sin-sincronizar (synchronous=NORMAL).
+- agregar_lote: las mismas altas dentro de un solo lote (una transacción, un fsync).
+- buscar por carné, buscar por nombre (FTS5), promedio superior a 9.5 y promedio general.
+
+Las latencias se resumen igual que en benchmarks/almacen.py (p50/p99 en µs y operaciones por
+segundo). Para SQLite se informa además el tamaño de la base en disco. El resultado es JSON
+(en --salida o en la salida estándar) y el resumen legible va a la salida de errores.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gestion_estudiantes import AlmacenSQLite, AsignadorCarnes, GeneradorEstudiantes, GestorEstudiantes
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from almacen import (ANIOS, ESQUEMA_BENCH, UMBRAL, cronometrar, imprimir_resumen, maximo_correlativo,
+                     nuevos_estudiantes, resumir)
+
+TAMANIOS = [1_000, 10_000, 100_000]
+
+
+class Memoria:
+    """GestorEstudiantes sin persistencia: el almacén indexado en memoria."""
+
+    nombre = "memoria"
+
+    def __init__(self, tamanio, directorio, sincronizar):
+        self.sistema = GestorEstudiantes(ESQUEMA_BENCH, maximo_correlativo=maximo_correlativo(tamanio))
+
+    def poblar(self, cantidad, semilla):
+        self.sistema.poblar(cantidad, semilla=semilla, anios=ANIOS)
+
+    def lote(self):
+        return self.sistema.lote()
+
+    def carnes(self):
+        return list(self.sistema.set_carnes)
+
+    def agregar(self, estudiante):
+        return self.sistema.agregar(estudiante)
+
+    def eliminar(self, carne):
+        return self.sistema.eliminar(carne)
+
+    def buscar_carne(self, carne):
+        return self.sistema.obtener(carne)
+
+    def buscar_nombre(self, termino):
+        return self.sistema.buscar(termino)
+
+    def superiores(self, umbral):
+        return self.sistema.superiores_a(umbral)
+
+    def promedio(self):
+        return self.sistema.promedio_general()
+
+    def cerrar(self):
+        pass
+
+
+class SQLite:
+    """Las mismas operaciones sobre AlmacenSQLite."""
+
+    nombre = "sqlite"
+
+    def __init__(self, tamanio, directorio, sincronizar):
+        self.tamanio = tamanio
+        self.almacen = AlmacenSQLite(os.path.join(directorio, "estudiantes.db"), ESQUEMA_BENCH, sincronizar=sincronizar)
+        self.almacen.abrir()
+
+    def poblar(self, cantidad, semilla):
+        asignador = AsignadorCarnes(ESQUEMA_BENCH, maximo=maximo_correlativo(self.tamanio))
+        generador = GeneradorEstudiantes(semilla, ESQUEMA_BENCH, asignador, anios=ANIOS)
+        self.almacen.agregar_varios(generador.estudiantes(cantidad))
+
+    def lote(self):
+        return self.almacen.lote()
+
+    def carnes(self):
+        return [est['carne'] for est in self.almacen]
+
+    def agregar(self, estudiante):
+        return self.almacen.agregar(estudiante)
+
+    def eliminar(self, carne):
+        return self.almacen.eliminar(carne)
+
+    def buscar_carne(self, carne):
+        return self.almacen.obtener(carne)
+
+    def buscar_nombre(self, termino):
+        return self.almacen.buscar_por_nombre(termino)
+
+    def superiores(self, umbral):
+        return self.almacen.superiores_a(umbral)
+
+    def promedio(self):
+        return self.almacen.promedio()
+
+    def cerrar(self):
+        self.almacen.cerrar()
+
+
+IMPLEMENTACIONES = [Memoria, SQLite]
+
+
+def tamanio_en_disco(directorio):
+    return sum(os.path.getsize(os.path.join(directorio, nombre)) for nombre in os.listdir(directorio))
+
+
+def medir(clase, tamanio, repeticiones, semilla, sincronizar):
+    with tempfile.TemporaryDirectory(prefix="bench_sqlite_") as directorio:
+        implementacion = clase(tamanio, directorio, sincronizar)
+        gc.collect()
+        inicio = time.perf_counter()
+        implementacion.poblar(tamanio, semilla)
+        segundos = time.perf_counter() - inicio
+
+        aleatorio = random.Random(semilla)
+        carnes = implementacion.carnes()
+        muestra = aleatorio.sample(carnes, repeticiones)
+        nombres = [implementacion.buscar_carne(carne)['nombre'] for carne in aleatorio.sample(carnes, repeticiones)]
+        nuevos = nuevos_estudiantes(2 * repeticiones)
+
+        operaciones = {}
+        operaciones["agregar"] = resumir(cronometrar(implementacion.agregar, nuevos[:repeticiones]))
+        with implementacion.lote():
+            operaciones["agregar_lote"] = resumir(cronometrar(implementacion.agregar, nuevos[repeticiones:]))
+        eliminados = []
+        operaciones["eliminar"] = resumir(cronometrar(lambda carne: eliminados.append(implementacion.eliminar(carne)),
+                                                      muestra))
+        with implementacion.lote():  # Se restauran para que el grupo conserve su tamaño
+            for estudiante in eliminados:
+                implementacion.agregar(estudiante)
+        operaciones["buscar_carne"] = resumir(cronometrar(implementacion.buscar_carne, muestra))
+        operaciones["buscar_nombre"] = resumir(cronometrar(implementacion.buscar_nombre, nombres))
+        operaciones["promedio_superior"] = resumir(cronometrar(implementacion.superiores, [UMBRAL] * repeticiones))
+        operaciones["promedio_general"] = resumir(cronometrar(lambda _: implementacion.promedio(),
+                                                              range(repeticiones)))
+
+        resultado = {
+            "implementacion": clase.nombre,
+            "tamanio": tamanio,
+            "poblar": {"segundos": round(segundos, 3), "estudiantes_por_segundo": round(tamanio / segundos, 1)},
+            "operaciones": operaciones,
+        }
+        implementacion.cerrar()
+        if clase is SQLite:
+            resultado["disco_bytes"] = tamanio_en_disco(directorio)
+    return resultado
+
+
+def comparar(resultados):
+    """Cuántas veces más lenta (p50) es SQLite que la memoria, por tamaño y operación."""
+    por_clave = {(r["implementacion"], r["tamanio"]): r for r in resultados}
+    comparacion = []
+    for (implementacion, tamanio), memoria in sorted(por_clave.items()):
+        sqlite = por_clave.get(("sqlite", tamanio))
+        if implementacion != "memoria" or sqlite is None:
+            continue
+        comparacion.append({
+            "tamanio": tamanio,
+            "sqlite_sobre_memoria_p50": {
+                operacion: round(sqlite["operaciones"][operacion]["p50_us"] / max(medida["p50_us"], 0.01), 2)
+                for operacion, medida in memoria["operaciones"].items()
+            },
+        })
+    return comparacion
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del almacén SQLite frente al almacén en memoria")
+    parser.add_argument("--tamanios", default=",".join(map(str, TAMANIOS)),
+                        help="tamaños de grupo separados por coma")
+    parser.add_argument("--repeticiones", type=int, default=200, help="mediciones por operación")
+    parser.add_argument("--sin-sincronizar", action="store_true",
+                        help="SQLite con synchronous=NORMAL (sin fsync por transacción)")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--salida", help="archivo JSON de resultados (por omisión, la salida estándar)")
+    argumentos = parser.parse_args()
+
+    resultados = []
+    for tamanio in (int(t) for t in argumentos.tamanios.split(",")):
+        for clase in IMPLEMENTACIONES:
+            repeticiones = min(argumentos.repeticiones, tamanio)
+            resultado = medir(clase, tamanio, repeticiones, argumentos.semilla, not argumentos.sin_sincronizar)
+            imprimir_resumen(resultado)
+            if "disco_bytes" in resultado:
+                print(f"  base en disco {resultado['disco_bytes'] / 1e6:,.1f} MB", file=sys.stderr)
+            resultados.append(resultado)
+
+    informe = {
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "sqlite": sqlite3.sqlite_version,
+        "sincronizar": not argumentos.sin_sincronizar,
+        "semilla": argumentos.semilla,
+        "umbral_promedio": UMBRAL,
+        "resultados": resultados,
+        "comparacion": comparar(resultados),
+    }
+    texto = json.dumps(informe, ensure_ascii=False, indent=2)
+    if argumentos.salida:
+        with open(argumentos.salida, "w", encoding="utf-8") as archivo:
+            archivo.write(texto + "\n")
+    else:
+        print(texto)
+
+
+if __name__ == "__main__":
+    main()
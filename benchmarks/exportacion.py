@@ -0,0 +1,51 @@
+"""
+Benchmark de exportación: estudiantes por segundo para cada formato.
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/exportacion.py [num_estudiantes] [directorio]
+
+Por omisión genera 1.000.000 de estudiantes en un almacén compacto y exporta a CSV, JSONL
+(con y sin gzip) y a la instantánea columnar dentro de un directorio temporal.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gestion_estudiantes import AlmacenEstudiantes, ESQUEMA_CLI, exportar
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from memoria_registros import datos_ejemplo
+
+FORMATOS = ["estudiantes.csv", "estudiantes.csv.gz", "estudiantes.jsonl",
+            "estudiantes.jsonl.gz", "estudiantes.col"]
+
+
+def main():
+    num_estudiantes = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    directorio = sys.argv[2] if len(sys.argv) > 2 else tempfile.mkdtemp(prefix="bench_export_")
+    os.makedirs(directorio, exist_ok=True)
+
+    almacen = AlmacenEstudiantes(ESQUEMA_CLI, compacto=True)
+    for nombre, carne, materias, promedio in datos_ejemplo(num_estudiantes):
+        almacen.agregar({'nombre': nombre, 'carne': carne, 'materias': materias, 'promedio': promedio})
+
+    print(f"Exportando {num_estudiantes} estudiantes a {directorio}")
+    for nombre_archivo in FORMATOS:
+        ruta = os.path.join(directorio, nombre_archivo)
+        inicio = time.perf_counter()
+        cantidad = exportar(almacen, ruta)
+        segundos = time.perf_counter() - inicio
+        megas = os.path.getsize(ruta) / 1e6
+        print(f"{nombre_archivo:22s} {segundos:7.2f} s  {cantidad / segundos:12,.0f} est/s  {megas:8.1f} MB")
+
+    inicio = time.perf_counter()
+    cantidad = exportar(almacen, os.path.join(directorio, "honor.csv"), promedio_minimo=9.0)
+    segundos = time.perf_counter() - inicio
+    print(f"{'honor.csv (> 9.0)':22s} {segundos:7.2f} s  {cantidad} estudiantes")
+
+
+if __name__ == "__main__":
+    main()
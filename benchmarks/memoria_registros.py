@@ -0,0 +1,76 @@
+"""
+Benchmark de memoria: diccionario por estudiante vs RegistroEstudiante compacto.
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/memoria_registros.py [num_estudiantes]
+
+Mide con tracemalloc los bytes asignados al construir los mismos estudiantes con cada
+representación y muestra el costo por estudiante.
+"""
+
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gestion_estudiantes import RegistroEstudiante
+
+MATERIAS = ["Programación", "Cálculo", "Física", "Química", "Historia", "Literatura",
+            "Álgebra Lineal", "Estadística Aplicada", "Bases de Datos", "Redes de Computadoras"]
+SUFIJOS = ["I", "II", "Avanzada", "Fundamental"]
+
+
+# Carnés 0905-YY-xxxx distintos: 100 años de 10.000 correlativos
+MAXIMO_ESTUDIANTES = 100 * 10000
+
+
+def datos_ejemplo(num_estudiantes, semilla=0):
+    """Genera tuplas (nombre, carné, materias, promedio) con la forma de poblar_datos_iniciales.
+
+    Los carnés son válidos para ESQUEMA_CLI y distintos entre sí (10.000 por año a partir del 18),
+    así los archivos exportados con estos datos se pueden volver a importar.
+    """
+    if num_estudiantes > MAXIMO_ESTUDIANTES:
+        raise ValueError(f"El formato 0905-YY-xxxx admite a lo sumo {MAXIMO_ESTUDIANTES} carnés distintos.")
+    aleatorio = random.Random(semilla)
+    catalogo = [f"{m} {s}" for m in MATERIAS for s in SUFIJOS]
+    for i in range(num_estudiantes):
+        materias = [(nombre, aleatorio.randint(2, 5))
+                    for nombre in aleatorio.sample(catalogo, aleatorio.randint(2, 5))]
+        yield (f"Estudiante {i}", f"0905-{(18 + i // 10000) % 100:02d}-{i % 10000:04d}", materias,
+               round(aleatorio.uniform(5.0, 10.0), 1))
+
+
+def medir(constructor, datos):
+    """Bytes asignados para mantener vivos todos los objetos construidos."""
+    tracemalloc.start()
+    inicial = tracemalloc.get_traced_memory()[0]
+    objetos = [constructor(*fila) for fila in datos]
+    final = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objetos
+    return final - inicial
+
+
+def como_dict(nombre, carne, materias, promedio):
+    return {'nombre': nombre, 'carne': carne, 'materias': materias, 'promedio': promedio}
+
+
+def main():
+    num_estudiantes = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    # Las filas se generan antes de medir: solo cuenta el contenedor de cada estudiante y sus materias
+    filas = list(datos_ejemplo(num_estudiantes))
+    filas_dict = [(n, c, list(m), p) for n, c, m, p in filas]
+    bytes_dict = medir(como_dict, filas_dict) + sum(
+        sys.getsizeof(m) + sum(sys.getsizeof(t) for t in m) for _, _, m, _ in filas_dict)
+    bytes_compacto = medir(RegistroEstudiante, filas)
+
+    print(f"Estudiantes: {num_estudiantes}")
+    print(f"dict + lista de tuplas: {bytes_dict / num_estudiantes:8.1f} bytes/estudiante")
+    print(f"RegistroEstudiante:     {bytes_compacto / num_estudiantes:8.1f} bytes/estudiante")
+    print(f"Reducción: {100 * (1 - bytes_compacto / bytes_dict):.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Benchmark de consultas en paralelo: escalamiento por cantidad de procesos.
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/paralelo.py [--tamanio 1000000] [--procesos 1,2,4,8] [--repeticiones 5]
+                                  [--salida resultados.json]
+
+Genera un grupo de --tamanio estudiantes directamente como instantánea columnar (en un
+directorio temporal) y mide tres recorridos completos:
+- promedio_superior: estudiantes con promedio > 9.5, de mayor a menor.
+- buscar_nombre: estudiantes cuyo nombre contiene un apellido.
+- promedio_general: cantidad, promedio, mínimo y máximo.
+
+"secuencial" es el recorrido en el mismo proceso sobre InstantaneaColumnar; después se mide
+ConsultasParalelas con cada cantidad de --procesos (por omisión, potencias de 2 hasta los
+núcleos de la máquina). La aceleración es la mediana secuencial dividida por la mediana con N
+procesos; no puede superar a los núcleos disponibles, que se informan en el JSON.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gestion_estudiantes import (AsignadorCarnes, ConsultasParalelas, ESQUEMA_CLI, GeneradorEstudiantes,
+                                 InstantaneaColumnar, escribir_instantanea_columnar)
+
+ESQUEMA_BENCH = ESQUEMA_CLI._replace(patron_carne=r"0905-[0-9]{2}-[0-9]{6}")
+ANIOS = range(100)
+
+UMBRAL = 9.5
+TERMINO = "rodríguez"
+
+
+def procesos_por_omision():
+    nucleos = os.cpu_count() or 1
+    procesos = [1]
+    while procesos[-1] * 2 <= nucleos:
+        procesos.append(procesos[-1] * 2)
+    if procesos[-1] != nucleos:
+        procesos.append(nucleos)
+    return procesos
+
+
+def generar(ruta, tamanio, semilla):
+    asignador = AsignadorCarnes(ESQUEMA_BENCH, maximo=max(999, 2 * -(-tamanio // len(ANIOS))))
+    generador = GeneradorEstudiantes(semilla, ESQUEMA_BENCH, asignador, anios=ANIOS)
+    escribir_instantanea_columnar(ruta, generador.estudiantes(tamanio), ESQUEMA_BENCH)
+
+
+def cronometrar(funcion, repeticiones):
+    """Mediana y mínimo (ms) de `repeticiones` llamadas a funcion()."""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    tiempos.sort()
+    return {"mediana_ms": round(tiempos[len(tiempos) // 2], 2), "minimo_ms": round(tiempos[0], 2)}
+
+
+def consultas_secuenciales(instantanea):
+    def superiores():
+        posiciones = instantanea.posiciones_superiores_a(UMBRAL)
+        promedios = instantanea.promedios
+        posiciones.sort(key=lambda i: -promedios[i])
+        return [instantanea.registro(i, ESQUEMA_BENCH) for i in posiciones]
+
+    def buscar():
+        return [instantanea.registro(i, ESQUEMA_BENCH) for i in range(len(instantanea))
+                if TERMINO in instantanea.nombre(i).lower()]
+
+    def agregados():
+        promedios = instantanea.promedios
+        return len(promedios), instantanea.promedio_general(), min(promedios), max(promedios)
+
+    return {"promedio_superior": superiores, "buscar_nombre": buscar, "promedio_general": agregados}
+
+
+def consultas_paralelas(consultas):
+    return {
+        "promedio_superior": lambda: consultas.superiores_a(UMBRAL),
+        "buscar_nombre": lambda: consultas.buscar_por_nombre(TERMINO),
+        "promedio_general": consultas.estadisticas,
+    }
+
+
+def medir(funciones, repeticiones):
+    return {operacion: cronometrar(funcion, repeticiones) for operacion, funcion in funciones.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de consultas en paralelo por cantidad de procesos")
+    parser.add_argument("--tamanio", type=int, default=1_000_000, help="estudiantes del grupo")
+    parser.add_argument("--procesos", default=",".join(map(str, procesos_por_omision())),
+                        help="cantidades de procesos separadas por coma (p. ej. 1,2,4,8,16)")
+    parser.add_argument("--repeticiones", type=int, default=5, help="mediciones por consulta")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--salida", help="archivo JSON de resultados (por omisión, la salida estándar)")
+    argumentos = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "grupo.col")
+        inicio = time.perf_counter()
+        generar(ruta, argumentos.tamanio, argumentos.semilla)
+        print(f"Grupo de {argumentos.tamanio:,} estudiantes generado en "
+              f"{time.perf_counter() - inicio:.1f} s", file=sys.stderr)
+
+        with InstantaneaColumnar(ruta) as instantanea:
+            secuencial = medir(consultas_secuenciales(instantanea), argumentos.repeticiones)
+        print("\nsecuencial", file=sys.stderr)
+        for operacion, medida in secuencial.items():
+            print(f"  {operacion:18s} {medida['mediana_ms']:12,.1f} ms", file=sys.stderr)
+
+        resultados = []
+        for procesos in (int(p) for p in argumentos.procesos.split(",")):
+            with ConsultasParalelas(ruta, ESQUEMA_BENCH, procesos) as consultas:
+                operaciones = medir(consultas_paralelas(consultas), argumentos.repeticiones)
+            for operacion, medida in operaciones.items():
+                medida["aceleracion"] = round(secuencial[operacion]["mediana_ms"] / max(medida["mediana_ms"], 0.01), 2)
+            resultados.append({"procesos": procesos, "operaciones": operaciones})
+            print(f"\n{procesos} procesos", file=sys.stderr)
+            for operacion, medida in operaciones.items():
+                print(f"  {operacion:18s} {medida['mediana_ms']:12,.1f} ms  x{medida['aceleracion']:.2f}",
+                      file=sys.stderr)
+
+    informe = {
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "nucleos": os.cpu_count(),
+        "tamanio": argumentos.tamanio,
+        "semilla": argumentos.semilla,
+        "umbral_promedio": UMBRAL,
+        "termino": TERMINO,
+        "secuencial": secuencial,
+        "resultados": resultados,
+    }
+    texto = json.dumps(informe, ensure_ascii=False, indent=2)
+    if argumentos.salida:
+        with open(argumentos.salida, "w", encoding="utf-8") as archivo:
+            archivo.write(texto + "\n")
+    else:
+        print(texto)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Motor compartido del Sistema de Gestión de Estudiantes.
+
+Contiene las estructuras de datos indexadas que usan student_management.py y las
+versiones de propuestaRony (CLI y GUI). Las tres interfaces trabajan a través de
+GestorEstudiantes (sistema.py), que las reúne detrás de una sola interfaz.
+"""
+
+import importlib
+
+from .adaptadores import adaptar_estudiante
+from .agregados import EstadisticasGrupo
+from .almacen import (EVENTO_ACTUALIZADO, EVENTO_AGREGADO, EVENTO_ELIMINADO, EVENTO_LIMPIADO,
+                      AlmacenEstudiantes)
+from .analitica import HAY_NUMPY, AnaliticaGrupo, cohorte_de
+from .busqueda import BuscadorIncremental
+from .carnes import AsignadorCarnes, CarnesAgotadosError
+from .columnar import InstantaneaColumnar, escribir_instantanea_columnar
+from .consultas import Consulta
+from .esquema import ESQUEMA_CLI, ESQUEMA_RONY, Esquema
+from .exportacion import exportar
+from .generador import GeneradorEstudiantes, generar_archivo, poblar_almacen
+from .importacion import ResultadoImportacion, importar_archivo, importar_filas
+from .indices import IndiceMaterias, IndiceNombres, IndicePromedio, normalizar
+from .lotes import ResumenLote, ejecutar_archivo, ejecutar_operaciones
+from .particiones import AlmacenParticionado
+from .persistencia import Persistencia
+from .registro import CATALOGO_MATERIAS, RegistroEstudiante, RegistroEstudianteRony, tipo_registro
+from .sistema import GestorEstudiantes
+
+# Se importan al usarlos por primera vez: sqlite3 y multiprocessing alargan el arranque de las
+# interfaces, que no los necesitan
+_PEREZOSOS = {
+    "AlmacenSQLite": ".almacen_sqlite",
+    "ConsultasParalelas": ".paralelo",
+}
+
+
+def __getattr__(nombre):
+    modulo = _PEREZOSOS.get(nombre)
+    if modulo is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+    valor = getattr(importlib.import_module(modulo, __name__), nombre)
+    globals()[nombre] = valor
+    return valor
+
+
+__all__ = [
+    "adaptar_estudiante",
+    "AlmacenEstudiantes",
+    "AlmacenParticionado",
+    "AlmacenSQLite",
+    "AnaliticaGrupo",
+    "AsignadorCarnes",
+    "BuscadorIncremental",
+    "CarnesAgotadosError",
+    "CATALOGO_MATERIAS",
+    "cohorte_de",
+    "Consulta",
+    "ConsultasParalelas",
+    "Esquema",
+    "ESQUEMA_CLI",
+    "ESQUEMA_RONY",
+    "escribir_instantanea_columnar",
+    "EstadisticasGrupo",
+    "EVENTO_ACTUALIZADO",
+    "EVENTO_AGREGADO",
+    "EVENTO_ELIMINADO",
+    "EVENTO_LIMPIADO",
+    "ejecutar_archivo",
+    "ejecutar_operaciones",
+    "exportar",
+    "generar_archivo",
+    "GeneradorEstudiantes",
+    "GestorEstudiantes",
+    "HAY_NUMPY",
+    "importar_archivo",
+    "importar_filas",
+    "IndiceMaterias",
+    "IndiceNombres",
+    "IndicePromedio",
+    "InstantaneaColumnar",
+    "normalizar",
+    "Persistencia",
+    "poblar_almacen",
+    "RegistroEstudiante",
+    "RegistroEstudianteRony",
+    "ResultadoImportacion",
+    "ResumenLote",
+    "tipo_registro",
+]
@@ -0,0 +1,43 @@
+"""
+Adaptadores entre los dos formatos de registro de estudiante.
+
+ESQUEMA_CLI usa claves en minúscula, carné de 4 dígitos y materias (nombre, créditos);
+ESQUEMA_RONY usa claves capitalizadas, carné de 5 dígitos y materias como nombres sueltos.
+adaptar_estudiante convierte un registro de un formato al otro: renombra las claves, ajusta
+la forma de las materias y rellena o recorta los ceros del correlativo del carné.
+"""
+
+from .carnes import PREFIJO_CARNE, digitos_del_esquema
+
+
+def adaptar_carne(carne, origen, destino):
+    """Carné del formato `origen` reescrito con los dígitos de `destino`.
+
+    Lanza ValueError si el correlativo no cabe (p. ej. 0905-24-12345 no tiene equivalente de 4 dígitos).
+    """
+    digitos_destino = digitos_del_esquema(destino)
+    if digitos_del_esquema(origen) == digitos_destino:
+        return carne
+    _, anio, correlativo = carne.split("-")
+    numero = int(correlativo)
+    if numero >= 10 ** digitos_destino:
+        raise ValueError(f"El carné {carne} no tiene equivalente de {digitos_destino} dígitos.")
+    return f"{PREFIJO_CARNE}-{anio}-{numero:0{digitos_destino}d}"
+
+
+def adaptar_materias(materias, destino, creditos_por_omision=0):
+    """Materias en la forma de `destino`: se quitan los créditos o se completan con creditos_por_omision."""
+    if destino.materias_con_creditos:
+        return [(materia, creditos_por_omision) if isinstance(materia, str) else tuple(materia)
+                for materia in materias]
+    return [materia if isinstance(materia, str) else materia[0] for materia in materias]
+
+
+def adaptar_estudiante(estudiante, origen, destino, creditos_por_omision=0):
+    """Diccionario con los datos de `estudiante` (formato `origen`) en el formato `destino`."""
+    return {
+        destino.nombre: estudiante[origen.nombre],
+        destino.carne: adaptar_carne(estudiante[origen.carne], origen, destino),
+        destino.materias: adaptar_materias(estudiante[origen.materias], destino, creditos_por_omision),
+        destino.promedio: estudiante[origen.promedio],
+    }
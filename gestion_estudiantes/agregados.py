@@ -0,0 +1,151 @@
+"""
+Estadísticas del grupo mantenidas de forma incremental.
+
+EstadisticasGrupo se registra como índice del almacén y se actualiza en cada agregar/eliminar,
+de modo que el promedio general y demás estadísticas se consultan en O(1) en lugar de volver a
+sumar todos los promedios:
+
+- Suma compensada (Kahan-Neumaier): la suma no acumula error de redondeo al crecer el grupo
+  ni al restar los promedios de los estudiantes eliminados.
+- Media y varianza con el algoritmo de Welford, incluida su versión inversa para eliminar.
+- Mínimo y máximo con montículos (heapq) y eliminación perezosa: los valores eliminados se
+  anotan y se descartan cuando llegan a la cima.
+- Total de créditos inscritos (las materias sin créditos cuentan 0).
+"""
+
+import heapq
+import math
+from collections import Counter
+
+
+def creditos_de(materias):
+    """Suma de créditos de una lista de materias; los strings (sin créditos) cuentan 0."""
+    return sum(materia[1] for materia in materias if not isinstance(materia, str))
+
+
+class _MonticuloPerezoso:
+    """Montículo de mínimos con eliminación perezosa."""
+
+    def __init__(self):
+        self._valores = []
+        self._eliminados = Counter()
+        self._cantidad_eliminados = 0
+
+    def agregar(self, valor):
+        heapq.heappush(self._valores, valor)
+
+    def eliminar(self, valor):
+        self._eliminados[valor] += 1
+        self._cantidad_eliminados += 1
+        # Si la mayoría son valores eliminados, reconstruir para no crecer sin límite
+        if self._cantidad_eliminados * 2 > len(self._valores):
+            self._reconstruir()
+
+    def cima(self):
+        """Menor valor vigente o None si está vacío."""
+        valores = self._valores
+        while valores and self._eliminados[valores[0]]:
+            self._descontar(heapq.heappop(valores))
+        return valores[0] if valores else None
+
+    def limpiar(self):
+        self._valores.clear()
+        self._eliminados.clear()
+        self._cantidad_eliminados = 0
+
+    def _descontar(self, valor):
+        self._eliminados[valor] -= 1
+        if not self._eliminados[valor]:
+            del self._eliminados[valor]
+        self._cantidad_eliminados -= 1
+
+    def _reconstruir(self):
+        vigentes = []
+        for valor in self._valores:
+            if self._eliminados[valor]:
+                self._descontar(valor)
+            else:
+                vigentes.append(valor)
+        heapq.heapify(vigentes)
+        self._valores = vigentes
+
+
+class EstadisticasGrupo:
+    """Cantidad, suma, media, varianza, mínimo, máximo y créditos del grupo en O(1)."""
+
+    def __init__(self, esquema):
+        self.esquema = esquema
+        self.limpiar()
+
+    def limpiar(self):
+        self.cantidad = 0
+        self.creditos_totales = 0
+        self._suma = 0.0
+        self._compensacion = 0.0  # Error de redondeo acumulado de la suma (Neumaier)
+        self._media = 0.0
+        self._m2 = 0.0            # Suma de cuadrados de las desviaciones (Welford)
+        self._minimos = _MonticuloPerezoso()
+        self._maximos = _MonticuloPerezoso()  # Guarda valores negados
+
+    def _sumar(self, valor):
+        total = self._suma + valor
+        if abs(self._suma) >= abs(valor):
+            self._compensacion += (self._suma - total) + valor
+        else:
+            self._compensacion += (valor - total) + self._suma
+        self._suma = total
+
+    def indexar(self, estudiante):
+        valor = estudiante[self.esquema.promedio]
+        self.cantidad += 1
+        self._sumar(valor)
+        delta = valor - self._media
+        self._media += delta / self.cantidad
+        self._m2 += delta * (valor - self._media)
+        self._minimos.agregar(valor)
+        self._maximos.agregar(-valor)
+        self.creditos_totales += creditos_de(estudiante[self.esquema.materias])
+
+    def desindexar(self, estudiante):
+        valor = estudiante[self.esquema.promedio]
+        self.creditos_totales -= creditos_de(estudiante[self.esquema.materias])
+        self.cantidad -= 1
+        if self.cantidad == 0:
+            self.limpiar()
+            return
+        self._sumar(-valor)
+        media_anterior = self._media
+        self._media = (media_anterior * (self.cantidad + 1) - valor) / self.cantidad
+        self._m2 = max(0.0, self._m2 - (valor - self._media) * (valor - media_anterior))
+        self._minimos.eliminar(valor)
+        self._maximos.eliminar(-valor)
+
+    # --- Consultas ---
+
+    @property
+    def suma(self):
+        """Suma compensada de los promedios."""
+        return self._suma + self._compensacion
+
+    def promedio(self):
+        """Promedio general del grupo o None si no hay estudiantes."""
+        if not self.cantidad:
+            return None
+        return self.suma / self.cantidad
+
+    def varianza(self):
+        """Varianza poblacional de los promedios o None si no hay estudiantes."""
+        if not self.cantidad:
+            return None
+        return self._m2 / self.cantidad
+
+    def desviacion_estandar(self):
+        varianza = self.varianza()
+        return None if varianza is None else math.sqrt(varianza)
+
+    def minimo(self):
+        return self._minimos.cima()
+
+    def maximo(self):
+        cima = self._maximos.cima()
+        return None if cima is None else -cima
@@ -0,0 +1,235 @@
+"""
+Almacén de estudiantes con índice hash por carné.
+
+Los registros se guardan en una lista en orden de inserción (para la vista "mostrar todos")
+y un diccionario carné -> posición permite localizar a cualquier estudiante en O(1).
+
+Al eliminar no se desplaza la lista: la posición se marca con una lápida (None) y la lista
+se compacta solo cuando las lápidas superan la mitad de las posiciones. Así eliminar cuesta
+O(1) amortizado en lugar de las dos pasadas completas de buscar + list.remove.
+
+Además del índice por carné, el almacén mantiene índices secundarios (ver indices.py) que
+se actualizan de forma incremental en cada agregar/eliminar:
+- promedios (IndicePromedio): consultas por umbral, rango y mejores/peores N.
+- nombres (IndiceNombres): búsqueda parcial por nombre sin recorrer todo el grupo.
+- materias (IndiceMaterias): inscritos y cantidad por materia, intersección y unión de materias.
+- estadisticas (EstadisticasGrupo): promedio general, varianza, mínimo, máximo y créditos en O(1).
+
+Con compacto=True los estudiantes se guardan como RegistroEstudiante (ver registro.py), que
+ocupa mucho menos memoria que un diccionario y se lee igual que uno.
+
+Las interfaces pueden suscribirse a los cambios (suscribir): cada agregar, eliminar, actualizar
+o limpiar se notifica como (evento, carné, estudiante), de modo que una vista aplica solo la
+fila que cambió en lugar de reconstruirse completa.
+"""
+
+from .agregados import EstadisticasGrupo
+from .esquema import ESQUEMA_CLI
+from .indices import IndiceMaterias, IndiceNombres, IndicePromedio
+from .registro import tipo_registro
+
+# No vale la pena compactar listas pequeñas
+MINIMO_LAPIDAS_COMPACTAR = 64
+
+# Eventos de cambio notificados a los suscriptores
+EVENTO_AGREGADO = "agregado"
+EVENTO_ELIMINADO = "eliminado"
+EVENTO_ACTUALIZADO = "actualizado"
+EVENTO_LIMPIADO = "limpiado"  # Se notifica con carné y estudiante None
+
+
+class AlmacenEstudiantes:
+    """Colección ordenada de estudiantes indexada por carné.
+
+    Se comporta como una secuencia de solo lectura (len, iteración, `in` por carné),
+    por lo que puede reemplazar a la lista de estudiantes en el código existente.
+    Si se pasa `set_carnes`, el almacén lo mantiene sincronizado con los carnés registrados.
+    Con `compacto=True` los diccionarios recibidos se convierten en registros compactos.
+    """
+
+    def __init__(self, esquema=ESQUEMA_CLI, set_carnes=None, compacto=False):
+        self.esquema = esquema
+        self._tipo_registro = tipo_registro(esquema) if compacto else None
+        self.set_carnes = set_carnes if set_carnes is not None else set()
+        self._registros = []   # Estudiantes en orden de inserción (None = lápida)
+        self._posiciones = {}  # carné -> índice en _registros
+        self._lapidas = 0
+        self._fijaciones = 0  # Recorridos por tramos en curso (ver fijar_posiciones)
+
+        self.promedios = IndicePromedio(esquema)
+        self.nombres = IndiceNombres(esquema)
+        self.materias = IndiceMaterias(esquema)
+        self.estadisticas = EstadisticasGrupo(esquema)
+        self._indices = [self.promedios, self.nombres, self.materias, self.estadisticas]
+        self._suscriptores = []
+
+    def __len__(self):
+        return len(self._posiciones)
+
+    def __iter__(self):
+        for estudiante in self._registros:
+            if estudiante is not None:
+                yield estudiante
+
+    def __contains__(self, carne):
+        return carne in self._posiciones
+
+    def __repr__(self):
+        return f"AlmacenEstudiantes({len(self)} estudiantes)"
+
+    def obtener(self, carne):
+        """Devuelve el estudiante con ese carné o None si no existe. O(1)."""
+        posicion = self._posiciones.get(carne)
+        if posicion is None:
+            return None
+        return self._registros[posicion]
+
+    def posicion(self, carne):
+        """Posición del estudiante en el orden de inserción (sirve para ordenar, no es estable tras eliminar)."""
+        return self._posiciones[carne]
+
+    def buscar_por_nombre(self, termino, incluir_carne=False):
+        """Estudiantes cuyo nombre contiene el término (sin distinguir mayúsculas), en orden de inserción.
+
+        Equivale a `termino.lower() in nombre.lower()` sobre todos los estudiantes, pero solo
+        verifica los candidatos del índice de trigramas. Con incluir_carne=True también se
+        incluye al estudiante cuyo carné sea exactamente el término.
+        """
+        termino_lower = termino.lower()
+        clave_nombre = self.esquema.nombre
+        candidatos = self.nombres.candidatos(termino)
+        if candidatos is None:
+            return [est for est in self
+                    if termino_lower in est[clave_nombre].lower()
+                    or (incluir_carne and est[self.esquema.carne] == termino)]
+
+        resultados = [carne for carne in candidatos
+                      if termino_lower in self.obtener(carne)[clave_nombre].lower()]
+        if incluir_carne and termino in self._posiciones and termino not in resultados:
+            resultados.append(termino)
+        resultados.sort(key=self._posiciones.__getitem__)
+        return [self._registros[self._posiciones[carne]] for carne in resultados]
+
+    def agregar(self, estudiante):
+        """Agrega un estudiante al final y devuelve el registro guardado.
+
+        Lanza ValueError si el carné ya existe.
+        """
+        carne = estudiante[self.esquema.carne]
+        if carne in self._posiciones:
+            raise ValueError(f"El carné {carne} ya existe.")
+        if self._tipo_registro is not None:
+            estudiante = self._tipo_registro.desde(estudiante)
+        self._posiciones[carne] = len(self._registros)
+        self._registros.append(estudiante)
+        self.set_carnes.add(carne)
+        for indice in self._indices:
+            indice.indexar(estudiante)
+        self._notificar(EVENTO_AGREGADO, carne, estudiante)
+        return estudiante
+
+    def actualizar(self, estudiante):
+        """Reemplaza al estudiante con el mismo carné, conservando su posición, y devuelve el registro guardado.
+
+        Lanza ValueError si el carné no existe. Los índices que definan reindexar(anterior, nuevo)
+        lo reciben en un solo paso; al resto se le desindexa el anterior y se le indexa el nuevo.
+        """
+        carne = estudiante[self.esquema.carne]
+        posicion = self._posiciones.get(carne)
+        if posicion is None:
+            raise ValueError(f"El carné {carne} no existe.")
+        if self._tipo_registro is not None:
+            estudiante = self._tipo_registro.desde(estudiante)
+        anterior = self._registros[posicion]
+        self._registros[posicion] = estudiante
+        for indice in self._indices:
+            reindexar = getattr(indice, "reindexar", None)
+            if reindexar is not None:
+                reindexar(anterior, estudiante)
+            else:
+                indice.desindexar(anterior)
+                indice.indexar(estudiante)
+        self._notificar(EVENTO_ACTUALIZADO, carne, estudiante)
+        return estudiante
+
+    def eliminar(self, carne):
+        """Elimina al estudiante por carné y lo devuelve, o None si no existe. O(1) amortizado."""
+        posicion = self._posiciones.pop(carne, None)
+        if posicion is None:
+            return None
+        estudiante = self._registros[posicion]
+        self._registros[posicion] = None
+        self._lapidas += 1
+        self.set_carnes.discard(carne)
+        for indice in self._indices:
+            indice.desindexar(estudiante)
+        if (not self._fijaciones and self._lapidas >= MINIMO_LAPIDAS_COMPACTAR
+                and self._lapidas * 2 > len(self._registros)):
+            self._compactar()
+        self._notificar(EVENTO_ELIMINADO, carne, estudiante)
+        return estudiante
+
+    def fijar_posiciones(self):
+        """Pospone la compactación hasta soltar_posiciones(), para recorrer por tramos con tramo()."""
+        self._fijaciones += 1
+
+    def soltar_posiciones(self):
+        self._fijaciones -= 1
+
+    def tramo(self, posicion, cantidad):
+        """(estudiantes, siguiente posición) de hasta `cantidad` posiciones desde `posicion`, en orden de inserción.
+
+        Permite recorrer el almacén soltando el candado entre tramos: mientras las posiciones estén
+        fijas, las altas se agregan al final y las bajas dejan lápidas, así ningún estudiante cambia
+        de posición. Al llegar al final devuelve ([], posicion).
+        """
+        fin = min(posicion + cantidad, len(self._registros))
+        if fin <= posicion:
+            return [], posicion
+        return [est for est in self._registros[posicion:fin] if est is not None], fin
+
+    def limpiar(self):
+        """Elimina todos los estudiantes."""
+        self._registros.clear()
+        self._posiciones.clear()
+        self._lapidas = 0
+        self.set_carnes.clear()
+        for indice in self._indices:
+            indice.limpiar()
+        self._notificar(EVENTO_LIMPIADO, None, None)
+
+    def registrar_indice(self, indice, indexar_existentes=True):
+        """Agrega un índice secundario (o cualquier objeto con su interfaz) al almacén.
+
+        Con indexar_existentes=False solo recibirá los cambios posteriores, como la bitácora
+        de persistencia.
+        """
+        if indexar_existentes:
+            for estudiante in self:
+                indice.indexar(estudiante)
+        self._indices.append(indice)
+        return indice
+
+    def quitar_indice(self, indice):
+        """Deja de notificar cambios a un índice registrado."""
+        self._indices.remove(indice)
+
+    def suscribir(self, funcion):
+        """Registra funcion(evento, carné, estudiante) para recibir cada cambio ya aplicado. Devuelve la función."""
+        self._suscriptores.append(funcion)
+        return funcion
+
+    def desuscribir(self, funcion):
+        """Deja de notificar cambios a una función suscrita."""
+        self._suscriptores.remove(funcion)
+
+    def _notificar(self, evento, carne, estudiante):
+        for funcion in self._suscriptores:
+            funcion(evento, carne, estudiante)
+
+    def _compactar(self):
+        """Quita las lápidas conservando el orden de inserción y recalcula las posiciones."""
+        clave_carne = self.esquema.carne
+        self._registros = [est for est in self._registros if est is not None]
+        self._posiciones = {est[clave_carne]: i for i, est in enumerate(self._registros)}
+        self._lapidas = 0
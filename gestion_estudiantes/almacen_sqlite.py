@@ -0,0 +1,348 @@
+"""
+Almacén de estudiantes sobre SQLite (módulo sqlite3 de la biblioteca estándar).
+
+Es una alternativa a AlmacenEstudiantes + Persistencia para instalaciones que prefieren
+confiar la durabilidad a SQLite. Las tablas están normalizadas:
+- estudiantes(id, carne, nombre, promedio): id sigue el orden de inserción; índices por
+  carné (UNIQUE) y por promedio.
+- materias(id, nombre, clave): cada nombre de materia una sola vez; clave es el nombre
+  normalizado (sin acentos ni mayúsculas), indexado, para buscar igual que IndiceMaterias.
+- inscripciones(estudiante, orden, materia, creditos): una fila por materia de cada
+  estudiante, con índice por materia. creditos es NULL en los esquemas sin créditos.
+- resumen(cantidad, suma): lo mantienen triggers, así el promedio general no recorre la tabla.
+  suma es un INTEGER en millonésimas de punto (ESCALA_SUMA): sumar y restar enteros es exacto,
+  así que la suma no acumula error de redondeo tras muchas altas y bajas como lo haría un REAL.
+- nombres_fts: tabla FTS5 con el tokenizador trigram sobre los nombres (sincronizada con
+  triggers), para buscar subcadenas con el índice. Si el SQLite instalado no tiene FTS5 con
+  trigram (anterior a 3.34), la búsqueda recorre los nombres.
+
+La base usa journal_mode=WAL. Con sincronizar=True (por omisión) cada transacción confirmada
+llega al disco (synchronous=FULL); con False se usa synchronous=NORMAL, que no corrompe la base
+pero puede perder las últimas transacciones si se corta la luz.
+
+Fuera de un lote cada agregar o eliminar es su propia transacción. Dentro de
+`with almacen.lote():` todas las operaciones van en una sola transacción, que se confirma al
+salir (o se revierte completa si sale una excepción). Las sentencias son constantes, así que
+sqlite3 las prepara una vez y reutiliza la sentencia preparada de su caché.
+
+Las consultas devuelven diccionarios con las claves del esquema, en el mismo orden que el
+almacén en memoria.
+
+Alcance: AlmacenSQLite ofrece las operaciones básicas del almacén (agregar, eliminar, obtener,
+recorrer, buscar por nombre, promedio superior a, promedio general e inscritos), pero no los
+índices en memoria (promedios, nombres, materias, estadisticas), los eventos (suscribir) ni
+set_carnes. Por eso no reemplaza a AlmacenEstudiantes dentro de GestorEstudiantes y las tres
+interfaces siguen usando AlmacenEstudiantes + Persistencia; se usa directamente desde scripts
+(ver benchmarks/almacen_sqlite.py).
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from .esquema import ESQUEMA_CLI
+from .indices import N_GRAMA, normalizar
+
+# Millonésimas de punto por unidad de promedio en resumen.suma
+ESCALA_SUMA = 1_000_000
+
+# Sentencias preparadas que sqlite3 guarda en su caché por conexión
+SENTENCIAS_EN_CACHE = 64
+
+_ESQUEMA_SQL = f"""
+CREATE TABLE IF NOT EXISTS estudiantes (
+    id INTEGER PRIMARY KEY,
+    carne TEXT NOT NULL UNIQUE,
+    nombre TEXT NOT NULL,
+    promedio REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS estudiantes_promedio ON estudiantes (promedio);
+
+CREATE TABLE IF NOT EXISTS materias (
+    id INTEGER PRIMARY KEY,
+    nombre TEXT NOT NULL UNIQUE,
+    clave TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS materias_clave ON materias (clave);
+
+CREATE TABLE IF NOT EXISTS inscripciones (
+    estudiante INTEGER NOT NULL REFERENCES estudiantes (id) ON DELETE CASCADE,
+    orden INTEGER NOT NULL,
+    materia INTEGER NOT NULL REFERENCES materias (id),
+    creditos INTEGER,
+    PRIMARY KEY (estudiante, orden)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS inscripciones_materia ON inscripciones (materia, estudiante);
+
+CREATE TABLE IF NOT EXISTS resumen (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    cantidad INTEGER NOT NULL,
+    suma INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO resumen VALUES (0, 0, 0);
+
+CREATE TRIGGER IF NOT EXISTS estudiantes_agregado AFTER INSERT ON estudiantes BEGIN
+    UPDATE resumen SET cantidad = cantidad + 1,
+        suma = suma + CAST(round(new.promedio * {ESCALA_SUMA}) AS INTEGER) WHERE id = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS estudiantes_eliminado AFTER DELETE ON estudiantes BEGIN
+    UPDATE resumen SET cantidad = cantidad - 1,
+        suma = suma - CAST(round(old.promedio * {ESCALA_SUMA}) AS INTEGER) WHERE id = 0;
+END;
+"""
+
+_ESQUEMA_FTS = """
+CREATE VIRTUAL TABLE IF NOT EXISTS nombres_fts USING fts5 (
+    nombre, content='estudiantes', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS nombres_fts_agregado AFTER INSERT ON estudiantes BEGIN
+    INSERT INTO nombres_fts (rowid, nombre) VALUES (new.id, new.nombre);
+END;
+CREATE TRIGGER IF NOT EXISTS nombres_fts_eliminado AFTER DELETE ON estudiantes BEGIN
+    INSERT INTO nombres_fts (nombres_fts, rowid, nombre) VALUES ('delete', old.id, old.nombre);
+END;
+"""
+
+# Columnas de un estudiante con sus inscripciones (una fila por materia; LEFT JOIN para los que no tienen)
+_SELECCION = """
+SELECT e.id, e.carne, e.nombre, e.promedio, i.materia, i.creditos
+FROM estudiantes e LEFT JOIN inscripciones i ON i.estudiante = e.id
+"""
+
+SQL_INSERTAR = "INSERT INTO estudiantes (carne, nombre, promedio) VALUES (?, ?, ?)"
+SQL_INSCRIBIR = "INSERT INTO inscripciones (estudiante, orden, materia, creditos) VALUES (?, ?, ?, ?)"
+SQL_NUEVA_MATERIA = "INSERT INTO materias (nombre, clave) VALUES (?, ?)"
+SQL_ELIMINAR = "DELETE FROM estudiantes WHERE id = ?"
+SQL_EXISTE = "SELECT 1 FROM estudiantes WHERE carne = ?"
+SQL_OBTENER = _SELECCION + "WHERE e.carne = ? ORDER BY i.orden"
+SQL_TODOS = _SELECCION + "ORDER BY e.id, i.orden"
+SQL_SUPERIORES = _SELECCION + "WHERE e.promedio > ? ORDER BY e.promedio DESC, e.id DESC, i.orden"
+SQL_INSCRITOS = (_SELECCION + "WHERE e.id IN (SELECT estudiante FROM inscripciones WHERE materia IN "
+                 "(SELECT id FROM materias WHERE clave = ?)) ORDER BY e.carne, i.orden")
+SQL_BUSCAR_FTS = (_SELECCION + "WHERE e.id IN (SELECT rowid FROM nombres_fts WHERE nombres_fts MATCH ?) "
+                  "OR e.carne = ? ORDER BY e.id, i.orden")
+SQL_RESUMEN = "SELECT cantidad, suma FROM resumen WHERE id = 0"
+
+
+class AlmacenSQLite:
+    """Estudiantes guardados en una base SQLite, con las operaciones básicas del almacén en memoria.
+
+    ruta: archivo de la base (se crea si no existe, con sus carpetas); ":memory:" para pruebas.
+    Hay que llamar a abrir() antes de usarlo y a cerrar() al terminar. Todas las operaciones
+    toman `candado`, así que se puede usar desde varios hilos.
+    """
+
+    def __init__(self, ruta, esquema=ESQUEMA_CLI, sincronizar=True):
+        if os.path.isdir(ruta):
+            raise ValueError(f"{ruta} es una carpeta; AlmacenSQLite recibe la ruta del archivo de la base.")
+        self.ruta = ruta
+        self.esquema = esquema
+        self.sincronizar = sincronizar
+        self.candado = threading.RLock()
+        self.busqueda_fts = False
+        self._conexion = None
+        self._lotes_abiertos = 0
+        self._materias = {}  # nombre -> id
+        self._nombres_materia = {}  # id -> nombre
+
+    def __repr__(self):
+        return f"AlmacenSQLite({self.ruta!r})"
+
+    # --- Ciclo de vida ---
+
+    def abrir(self):
+        """Abre (o crea) la base. Devuelve True si ya tenía estudiantes."""
+        if self._conexion is not None:
+            raise RuntimeError("La base ya está abierta.")
+        if self.ruta != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.ruta)), exist_ok=True)
+        # isolation_level=None: las transacciones se abren y confirman explícitamente en lote()
+        conexion = sqlite3.connect(self.ruta, isolation_level=None, check_same_thread=False,
+                                   cached_statements=SENTENCIAS_EN_CACHE)
+        conexion.execute("PRAGMA journal_mode = WAL")
+        conexion.execute(f"PRAGMA synchronous = {'FULL' if self.sincronizar else 'NORMAL'}")
+        conexion.execute("PRAGMA foreign_keys = ON")
+        conexion.executescript(_ESQUEMA_SQL)
+        try:
+            conexion.executescript(_ESQUEMA_FTS)
+            self.busqueda_fts = True
+        except sqlite3.OperationalError:
+            self.busqueda_fts = False  # SQLite sin FTS5 o sin el tokenizador trigram
+        self._conexion = conexion
+        self._cargar_materias()
+        return len(self) > 0
+
+    def _cargar_materias(self):
+        self._materias = {}
+        self._nombres_materia = {}
+        for id_materia, nombre in self._conexion.execute("SELECT id, nombre FROM materias"):
+            self._materias[nombre] = id_materia
+            self._nombres_materia[id_materia] = nombre
+
+    def cerrar(self):
+        with self.candado:
+            if self._conexion is not None:
+                self._conexion.close()
+                self._conexion = None
+
+    def __enter__(self):
+        self.abrir()
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    @contextmanager
+    def lote(self):
+        """Ejecuta las operaciones del bloque en una sola transacción.
+
+        Se confirma al salir del bloque más externo; si sale una excepción se revierte todo el
+        lote. Los lotes se pueden anidar.
+        """
+        with self.candado:
+            if not self._lotes_abiertos:
+                self._conexion.execute("BEGIN")
+            self._lotes_abiertos += 1
+            try:
+                yield self
+            except BaseException:
+                self._lotes_abiertos -= 1
+                if not self._lotes_abiertos:
+                    self._conexion.execute("ROLLBACK")
+                    self._cargar_materias()  # Las materias nuevas del lote también se revirtieron
+                raise
+            self._lotes_abiertos -= 1
+            if not self._lotes_abiertos:
+                self._conexion.execute("COMMIT")
+
+    # --- Armado de registros ---
+
+    def _id_materia(self, nombre):
+        id_materia = self._materias.get(nombre)
+        if id_materia is None:
+            id_materia = self._conexion.execute(SQL_NUEVA_MATERIA, (nombre, normalizar(nombre.strip()))).lastrowid
+            self._materias[nombre] = id_materia
+            self._nombres_materia[id_materia] = nombre
+        return id_materia
+
+    def _registros(self, filas):
+        """Agrupa las filas (una por materia, consecutivas por estudiante) en diccionarios del esquema."""
+        esquema = self.esquema
+        nombres_materia = self._nombres_materia
+        con_creditos = esquema.materias_con_creditos
+        actual = None
+        id_actual = None
+        for id_estudiante, carne, nombre, promedio, materia, creditos in filas:
+            if id_estudiante != id_actual:
+                if actual is not None:
+                    yield actual
+                id_actual = id_estudiante
+                actual = {esquema.nombre: nombre, esquema.carne: carne, esquema.materias: [],
+                          esquema.promedio: promedio}
+            if materia is not None:
+                nombre_materia = nombres_materia[materia]
+                actual[esquema.materias].append((nombre_materia, creditos) if con_creditos else nombre_materia)
+        if actual is not None:
+            yield actual
+
+    # --- Altas y bajas ---
+
+    def agregar(self, estudiante):
+        """Agrega un estudiante y lo devuelve. Lanza ValueError si el carné ya existe."""
+        esquema = self.esquema
+        carne = estudiante[esquema.carne]
+        with self.lote():
+            try:
+                id_estudiante = self._conexion.execute(
+                    SQL_INSERTAR, (carne, estudiante[esquema.nombre], float(estudiante[esquema.promedio]))).lastrowid
+            except sqlite3.IntegrityError:
+                raise ValueError(f"El carné {carne} ya existe.") from None
+            inscripciones = []
+            for orden, materia in enumerate(estudiante[esquema.materias]):
+                if isinstance(materia, str):
+                    nombre, creditos = materia, None
+                else:
+                    nombre, creditos = materia[0], materia[1]
+                inscripciones.append((id_estudiante, orden, self._id_materia(nombre), creditos))
+            self._conexion.executemany(SQL_INSCRIBIR, inscripciones)
+        return estudiante
+
+    def agregar_varios(self, estudiantes):
+        """Agrega muchos estudiantes en una sola transacción. Devuelve cuántos agregó.
+
+        Un carné repetido revierte el lote completo (ValueError).
+        """
+        cantidad = 0
+        with self.lote():
+            for estudiante in estudiantes:
+                self.agregar(estudiante)
+                cantidad += 1
+        return cantidad
+
+    def eliminar(self, carne):
+        """Elimina al estudiante (y sus inscripciones) y lo devuelve, o None si no existe."""
+        with self.lote():
+            filas = self._conexion.execute(SQL_OBTENER, (carne,)).fetchall()
+            if not filas:
+                return None
+            self._conexion.execute(SQL_ELIMINAR, (filas[0][0],))
+        return next(self._registros(filas))
+
+    def limpiar(self):
+        with self.lote():
+            self._conexion.execute("DELETE FROM estudiantes")
+
+    # --- Consultas ---
+
+    def obtener(self, carne):
+        """El estudiante con ese carné o None (índice UNIQUE de carné)."""
+        with self.candado:
+            return next(self._registros(self._conexion.execute(SQL_OBTENER, (carne,))), None)
+
+    def __contains__(self, carne):
+        with self.candado:
+            return self._conexion.execute(SQL_EXISTE, (carne,)).fetchone() is not None
+
+    def __len__(self):
+        with self.candado:
+            return self._conexion.execute(SQL_RESUMEN).fetchone()[0]
+
+    def __iter__(self):
+        """Todos los estudiantes en orden de inserción (se leen de una vez con el candado tomado)."""
+        with self.candado:
+            return iter(list(self._registros(self._conexion.execute(SQL_TODOS))))
+
+    def buscar_por_nombre(self, termino, incluir_carne=False):
+        """Estudiantes cuyo nombre contiene el término (sin distinguir mayúsculas), en orden de inserción.
+
+        Con FTS5 se consultan solo los candidatos del índice trigram; cada candidato se verifica con
+        `termino.lower() in nombre.lower()`, igual que el almacén en memoria.
+        """
+        termino_lower = termino.lower()
+        carne = termino if incluir_carne else None  # carne = NULL no coincide con nadie
+        with self.candado:
+            if self.busqueda_fts and len(termino) >= N_GRAMA:
+                # Entre comillas dobles el término es una sola frase; el trigram busca la subcadena
+                filas = self._conexion.execute(SQL_BUSCAR_FTS, ('"' + termino.replace('"', '""') + '"', carne))
+            else:
+                filas = self._conexion.execute(SQL_TODOS)
+            clave_nombre, clave_carne = self.esquema.nombre, self.esquema.carne
+            return [est for est in self._registros(filas)
+                    if termino_lower in est[clave_nombre].lower() or est[clave_carne] == carne]
+
+    def superiores_a(self, umbral):
+        """Estudiantes con promedio > umbral, de mayor a menor (índice de promedio)."""
+        with self.candado:
+            return list(self._registros(self._conexion.execute(SQL_SUPERIORES, (umbral,))))
+
+    def promedio(self):
+        """Promedio general, o None si no hay estudiantes. O(1): lee la tabla resumen."""
+        with self.candado:
+            cantidad, suma = self._conexion.execute(SQL_RESUMEN).fetchone()
+        return suma / (ESCALA_SUMA * cantidad) if cantidad else None
+
+    def inscritos(self, materia):
+        """Estudiantes inscritos en la materia (sin distinguir acentos ni mayúsculas), ordenados por carné."""
+        with self.candado:
+            return list(self._registros(self._conexion.execute(SQL_INSCRITOS, (normalizar(materia.strip()),))))
@@ -0,0 +1,245 @@
+"""
+Analítica vectorizada del grupo (opcional: usa NumPy si está instalado).
+
+AnaliticaGrupo se registra como índice del almacén y mantiene en columnas el promedio, el año
+de cohorte (YY del carné) y los créditos de cada estudiante:
+
+    analitica = almacen.registrar_indice(AnaliticaGrupo(almacen.esquema))
+    analitica.percentiles([25, 50, 75])
+
+Con NumPy las columnas son ndarrays con capacidad que se duplica al crecer, y las consultas
+(percentiles, histograma, promedio por cohorte, máscaras de umbral) se resuelven con operaciones
+vectorizadas. Sin NumPy las columnas son array.array y las mismas consultas usan Python puro,
+con los mismos resultados.
+
+Eliminar mueve al último estudiante a la posición liberada, así las columnas siguen densas y
+la baja cuesta O(1).
+"""
+
+import math
+from array import array
+from importlib.util import find_spec
+
+from .agregados import creditos_de
+
+# NumPy es opcional y tarda en importarse: se comprueba que exista sin cargarlo, y se importa
+# la primera vez que se crea una AnaliticaGrupo que lo usa (importar el paquete sigue siendo barato)
+HAY_NUMPY = find_spec("numpy") is not None
+np = None
+
+_CAPACIDAD_INICIAL = 1024
+
+
+def cohorte_de(carne):
+    """Año de cohorte (YY) de un carné '0905-YY-...', o -1 si no tiene ese formato."""
+    partes = carne.split("-")
+    if len(partes) == 3 and partes[1].isdigit():
+        return int(partes[1])
+    return -1
+
+
+def _cargar_numpy():
+    global np
+    if np is None:
+        import numpy
+        np = numpy
+
+
+class _Mascara(list):
+    """Lista de booleanos que se combina con &, | y ~ como una máscara booleana de NumPy."""
+
+    def _combinar(self, otra, operacion):
+        if len(otra) != len(self):
+            raise ValueError(f"Las máscaras tienen largos distintos: {len(self)} y {len(otra)}")
+        return _Mascara(operacion(bool(a), bool(b)) for a, b in zip(self, otra))
+
+    def __and__(self, otra):
+        return self._combinar(otra, lambda a, b: a and b)
+
+    def __or__(self, otra):
+        return self._combinar(otra, lambda a, b: a or b)
+
+    def __invert__(self):
+        return _Mascara(not valor for valor in self)
+
+    __rand__ = __and__
+    __ror__ = __or__
+
+
+class AnaliticaGrupo:
+    """Columnas de promedio, cohorte y créditos sincronizadas con el almacén."""
+
+    def __init__(self, esquema, usar_numpy=None):
+        if usar_numpy and not HAY_NUMPY:
+            raise ImportError("NumPy no está instalado.")
+        self.esquema = esquema
+        self.usa_numpy = HAY_NUMPY if usar_numpy is None else usar_numpy
+        if self.usa_numpy:
+            _cargar_numpy()
+        self.limpiar()
+
+    def __len__(self):
+        return self._cantidad
+
+    def limpiar(self):
+        self._cantidad = 0
+        self._carnes = []          # Carné en cada posición de las columnas
+        self._posiciones = {}      # carné -> posición
+        if self.usa_numpy:
+            self._promedios = np.empty(_CAPACIDAD_INICIAL, dtype=np.float64)
+            self._cohortes = np.empty(_CAPACIDAD_INICIAL, dtype=np.int16)
+            self._creditos = np.empty(_CAPACIDAD_INICIAL, dtype=np.int32)
+        else:
+            self._promedios = array("d")
+            self._cohortes = array("h")
+            self._creditos = array("l")
+
+    # --- Sincronización con el almacén ---
+
+    def indexar(self, estudiante):
+        carne = estudiante[self.esquema.carne]
+        valores = (estudiante[self.esquema.promedio], cohorte_de(carne),
+                   creditos_de(estudiante[self.esquema.materias]))
+        posicion = self._cantidad
+        if self.usa_numpy:
+            if posicion == len(self._promedios):
+                self._crecer()
+            self._promedios[posicion], self._cohortes[posicion], self._creditos[posicion] = valores
+        else:
+            self._promedios.append(valores[0])
+            self._cohortes.append(valores[1])
+            self._creditos.append(valores[2])
+        self._carnes.append(carne)
+        self._posiciones[carne] = posicion
+        self._cantidad += 1
+
+    def desindexar(self, estudiante):
+        posicion = self._posiciones.pop(estudiante[self.esquema.carne])
+        ultima = self._cantidad - 1
+        if posicion != ultima:
+            for columna in (self._promedios, self._cohortes, self._creditos):
+                columna[posicion] = columna[ultima]
+            carne_movido = self._carnes[ultima]
+            self._carnes[posicion] = carne_movido
+            self._posiciones[carne_movido] = posicion
+        self._carnes.pop()
+        if not self.usa_numpy:
+            for columna in (self._promedios, self._cohortes, self._creditos):
+                columna.pop()
+        self._cantidad = ultima
+
+    def _crecer(self):
+        capacidad = 2 * len(self._promedios)
+        for nombre in ("_promedios", "_cohortes", "_creditos"):
+            anterior = getattr(self, nombre)
+            nueva = np.empty(capacidad, dtype=anterior.dtype)
+            nueva[:self._cantidad] = anterior[:self._cantidad]
+            setattr(self, nombre, nueva)
+
+    # --- Columnas vigentes ---
+
+    @property
+    def promedios(self):
+        return self._promedios[:self._cantidad]
+
+    @property
+    def cohortes(self):
+        return self._cohortes[:self._cantidad]
+
+    @property
+    def creditos(self):
+        return self._creditos[:self._cantidad]
+
+    # --- Consultas por lotes ---
+
+    def percentiles(self, porcentajes):
+        """Percentiles (0-100) de los promedios con interpolación lineal, como numpy.percentile.
+
+        Devuelve una lista con un valor por porcentaje, o None en cada uno si no hay estudiantes.
+        """
+        if not self._cantidad:
+            return [None for _ in porcentajes]
+        if self.usa_numpy:
+            return np.percentile(self.promedios, list(porcentajes)).tolist()
+        ordenados = sorted(self.promedios)
+        resultado = []
+        for porcentaje in porcentajes:
+            h = (len(ordenados) - 1) * porcentaje / 100
+            bajo = math.floor(h)
+            alto = min(bajo + 1, len(ordenados) - 1)
+            resultado.append(ordenados[bajo] + (h - bajo) * (ordenados[alto] - ordenados[bajo]))
+        return resultado
+
+    def percentil(self, porcentaje):
+        return self.percentiles([porcentaje])[0]
+
+    def histograma(self, intervalos=10, rango=(0.0, 10.0)):
+        """Cantidad de estudiantes por intervalo de promedio, como numpy.histogram.
+
+        Devuelve (conteos, bordes). El último intervalo incluye su borde superior y los
+        promedios fuera del rango no se cuentan.
+        """
+        minimo, maximo = rango
+        if self.usa_numpy:
+            conteos, bordes = np.histogram(self.promedios, bins=intervalos, range=rango)
+            return conteos.tolist(), bordes.tolist()
+        ancho = (maximo - minimo) / intervalos
+        bordes = [minimo + i * ancho for i in range(intervalos)] + [maximo]
+        conteos = [0] * intervalos
+        for promedio in self.promedios:
+            if minimo <= promedio <= maximo:
+                conteos[min(int((promedio - minimo) / ancho), intervalos - 1)] += 1
+        return conteos, bordes
+
+    def promedio_por_cohorte(self):
+        """Diccionario año de cohorte (YY) -> promedio de esa cohorte."""
+        if not self._cantidad:
+            return {}
+        if self.usa_numpy:
+            cohortes = self.cohortes.astype(np.int64)
+            desplazamiento = int(cohortes.min())  # Por si hay carnés sin cohorte (-1)
+            indices = cohortes - desplazamiento
+            cantidades = np.bincount(indices)
+            sumas = np.bincount(indices, weights=self.promedios)
+            return {int(i) + desplazamiento: float(sumas[i] / cantidades[i])
+                    for i in np.flatnonzero(cantidades)}
+        sumas = {}
+        cantidades = {}
+        for cohorte, promedio in zip(self.cohortes, self.promedios):
+            sumas[cohorte] = sumas.get(cohorte, 0.0) + promedio
+            cantidades[cohorte] = cantidades.get(cohorte, 0) + 1
+        return {cohorte: sumas[cohorte] / cantidades[cohorte] for cohorte in sorted(sumas)}
+
+    def creditos_por_cohorte(self):
+        """Diccionario año de cohorte (YY) -> total de créditos inscritos."""
+        if self.usa_numpy and self._cantidad:
+            cohortes = self.cohortes.astype(np.int64)
+            desplazamiento = int(cohortes.min())
+            totales = np.bincount(cohortes - desplazamiento, weights=self.creditos)
+            cantidades = np.bincount(cohortes - desplazamiento)
+            return {int(i) + desplazamiento: int(totales[i]) for i in np.flatnonzero(cantidades)}
+        totales = {}
+        for cohorte, creditos in zip(self.cohortes, self.creditos):
+            totales[int(cohorte)] = totales.get(int(cohorte), 0) + int(creditos)
+        return dict(sorted(totales.items()))
+
+    def mascara_superior_a(self, umbral):
+        """Máscara booleana de los estudiantes con promedio > umbral.
+
+        Es un ndarray con NumPy y una lista con Python puro; las dos se combinan con &, | y ~.
+        """
+        if self.usa_numpy:
+            return self.promedios > umbral
+        return _Mascara(promedio > umbral for promedio in self.promedios)
+
+    def mascara_cohorte(self, cohorte):
+        """Máscara booleana de los estudiantes de una cohorte (YY)."""
+        if self.usa_numpy:
+            return self.cohortes == cohorte
+        return _Mascara(valor == cohorte for valor in self.cohortes)
+
+    def carnes_de(self, mascara):
+        """Carnés de las posiciones marcadas por una máscara, sola o combinada con &, | y ~."""
+        if self.usa_numpy:
+            return [self._carnes[i] for i in np.flatnonzero(mascara)]
+        return [carne for carne, marcado in zip(self._carnes, mascara) if marcado]
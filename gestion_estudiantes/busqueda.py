@@ -0,0 +1,81 @@
+"""
+Búsqueda incremental por nombre para interfaces que buscan mientras se escribe.
+
+Cada término consultado se guarda en una caché LRU (término -> carnés en orden de inserción,
+junto con los nombres ya en minúsculas). Si el término nuevo contiene a uno ya consultado (lo
+habitual al seguir escribiendo: "ana" -> "ana p"), sus resultados son un subconjunto de los
+de aquel, así que solo se filtran esos nombres en lugar de volver a consultar el almacén.
+La caché se limita por la cantidad total de resultados guardados, no por la de términos.
+
+El buscador se suscribe a los eventos del almacén y vacía la caché con cada cambio, por lo
+que nunca devuelve resultados desactualizados. No usa candados propios: si el almacén se
+comparte entre hilos, buscar debe llamarse con el mismo candado que protege al almacén.
+"""
+
+from collections import OrderedDict
+
+CAPACIDAD_CACHE = 2_000_000  # Resultados guardados entre todos los términos
+
+
+class BuscadorIncremental:
+    """Búsqueda por nombre parcial (como AlmacenEstudiantes.buscar_por_nombre) con caché y refinamiento."""
+
+    def __init__(self, almacen, capacidad=CAPACIDAD_CACHE, incluir_carne=False):
+        self.almacen = almacen
+        self.capacidad = capacidad
+        self.incluir_carne = incluir_carne
+        self.version = 0  # Aumenta con cada cambio del almacén
+        self._cache = OrderedDict()  # término en minúsculas -> (carnés, nombres en minúsculas)
+        self._guardados = 0
+        almacen.suscribir(self._al_cambiar)
+
+    def buscar(self, termino):
+        """Estudiantes cuyo nombre contiene el término, en orden de inserción."""
+        obtener = self.almacen.obtener
+        return [obtener(carne) for carne in self.carnes(termino)]
+
+    def carnes(self, termino):
+        """Carnés de los estudiantes que coinciden con el término (la lista de la caché: no modificarla)."""
+        clave = termino.lower()
+        entrada = self._cache.get(clave)
+        if entrada is not None:
+            self._cache.move_to_end(clave)
+            return entrada[0]
+
+        base = self._mas_cercano(clave)
+        # Una coincidencia exacta de carné no sale de refinar por nombre: se consulta completo
+        if base is None or (self.incluir_carne and termino in self.almacen):
+            esquema = self.almacen.esquema
+            estudiantes = self.almacen.buscar_por_nombre(termino, self.incluir_carne)
+            entrada = ([est[esquema.carne] for est in estudiantes],
+                       [est[esquema.nombre].lower() for est in estudiantes])
+        else:
+            carnes_base, nombres_base = base
+            posiciones = [i for i, nombre in enumerate(nombres_base) if clave in nombre]
+            entrada = ([carnes_base[i] for i in posiciones], [nombres_base[i] for i in posiciones])
+
+        self._cache[clave] = entrada
+        self._guardados += len(entrada[0])
+        while self._guardados > self.capacidad and len(self._cache) > 1:
+            self._guardados -= len(self._cache.popitem(last=False)[1][0])
+        return entrada[0]
+
+    def _mas_cercano(self, clave):
+        """Entrada del término en caché más largo contenido en `clave`, o None."""
+        mejor = None
+        for anterior in self._cache:
+            if anterior in clave and (mejor is None or len(anterior) > len(mejor)):
+                mejor = anterior
+        return None if mejor is None else self._cache[mejor]
+
+    def limpiar_cache(self):
+        self._cache.clear()
+        self._guardados = 0
+
+    def cerrar(self):
+        """Deja de escuchar los cambios del almacén."""
+        self.almacen.desuscribir(self._al_cambiar)
+
+    def _al_cambiar(self, _evento, _carne, _estudiante):
+        self.limpiar_cache()
+        self.version += 1
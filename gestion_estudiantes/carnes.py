@@ -0,0 +1,164 @@
+"""
+Asignación de carnés por año de inscripción.
+
+Los carnés tienen el formato 0905-YY-<correlativo>. En lugar de probar números hasta dar con
+uno libre, AsignadorCarnes lleva por cada año (YY):
+- un mapa de bits (bytearray) con los correlativos ocupados,
+- un puntero al siguiente correlativo nunca usado, que solo avanza, y
+- una lista de correlativos liberados (montículo), para reutilizarlos empezando por el menor.
+
+Asignar cuesta O(1) amortizado (O(log n) si se reutiliza un liberado), y cuando el año no tiene
+más correlativos se lanza CarnesAgotadosError en lugar de quedarse buscando.
+
+El asignador se registra como índice del almacén: los carnés que se agregan por otra vía
+(ingresados a mano, cargados de disco) se marcan como ocupados y los eliminados se liberan.
+"""
+
+import heapq
+
+PREFIJO_CARNE = "0905"
+
+
+class CarnesAgotadosError(OverflowError):
+    """No quedan correlativos disponibles para el año pedido."""
+
+
+class _CarnesDelAnio:
+    __slots__ = ("ocupados", "siguiente", "liberados", "cantidad_ocupados")
+
+    def __init__(self, minimo, maximo):
+        self.ocupados = bytearray(maximo + 1)
+        self.siguiente = minimo
+        self.liberados = []
+        self.cantidad_ocupados = 0
+
+
+def digitos_del_esquema(esquema):
+    """Cifras del correlativo que acepta el patrón de carné del esquema (4 si no se reconoce)."""
+    for digitos in range(1, 10):
+        if esquema.validar_carne(f"{PREFIJO_CARNE}-00-{'0' * digitos}"):
+            return digitos
+    return 4
+
+
+class AsignadorCarnes:
+    """Asignador de carnés 0905-YY-<correlativo> con `digitos` cifras, entre minimo y maximo.
+
+    Si no se indican los dígitos se toman del patrón de carné del esquema.
+    """
+
+    def __init__(self, esquema, digitos=None, minimo=1, maximo=None, reutilizar_liberados=True):
+        if digitos is None:
+            digitos = digitos_del_esquema(esquema)
+        self.esquema = esquema
+        self.digitos = digitos
+        self.minimo = minimo
+        self.maximo = maximo if maximo is not None else 10 ** digitos - 1
+        self.reutilizar_liberados = reutilizar_liberados
+        self._anios = {}
+
+    def _anio(self, anio):
+        estado = self._anios.get(anio)
+        if estado is None:
+            estado = self._anios[anio] = _CarnesDelAnio(self.minimo, self.maximo)
+        return estado
+
+    def formatear(self, anio, correlativo):
+        return f"{PREFIJO_CARNE}-{anio:02d}-{correlativo:0{self.digitos}d}"
+
+    def _descomponer(self, carne):
+        """(año, correlativo) de un carné de este formato, o None."""
+        partes = carne.split("-")
+        if (len(partes) != 3 or partes[0] != PREFIJO_CARNE or len(partes[1]) != 2
+                or len(partes[2]) != self.digitos or not (partes[1] + partes[2]).isdigit()):
+            return None
+        correlativo = int(partes[2])
+        if not self.minimo <= correlativo <= self.maximo:
+            return None
+        return int(partes[1]), correlativo
+
+    # --- Consultas ---
+
+    def disponibles(self, anio):
+        """Cantidad de carnés que aún se pueden asignar para el año."""
+        estado = self._anios.get(anio)
+        total = self.maximo - self.minimo + 1
+        return total if estado is None else total - estado.cantidad_ocupados
+
+    # --- Asignación ---
+
+    def _tomar(self, estado):
+        if self.reutilizar_liberados:
+            while estado.liberados:
+                correlativo = heapq.heappop(estado.liberados)
+                if not estado.ocupados[correlativo]:  # Pudo ocuparse a mano después de liberarse
+                    return correlativo
+        ocupados = estado.ocupados
+        correlativo = estado.siguiente
+        while correlativo <= self.maximo and ocupados[correlativo]:
+            correlativo += 1
+        if correlativo > self.maximo:
+            return None
+        estado.siguiente = correlativo + 1
+        return correlativo
+
+    def asignar(self, anio):
+        """Reserva y devuelve un carné nuevo para el año. Lanza CarnesAgotadosError si no hay."""
+        return self.asignar_bloque(anio, 1)[0]
+
+    def asignar_bloque(self, anio, cantidad):
+        """Reserva y devuelve `cantidad` carnés del año en una sola llamada.
+
+        Si no alcanzan, lanza CarnesAgotadosError sin reservar ninguno.
+        """
+        if not 0 <= anio <= 99:
+            raise ValueError("El año debe tener dos dígitos (0-99).")
+        if cantidad > self.disponibles(anio):
+            raise CarnesAgotadosError(
+                f"No hay suficientes carnés para el año {anio:02d}: "
+                f"se pidieron {cantidad} y quedan {self.disponibles(anio)}.")
+        estado = self._anio(anio)
+        prefijo = f"{PREFIJO_CARNE}-{anio:02d}-"
+        digitos = self.digitos
+        carnes = []
+        for _ in range(cantidad):
+            correlativo = self._tomar(estado)
+            if correlativo is None:  # No debería ocurrir: disponibles() ya se verificó
+                raise CarnesAgotadosError(f"No quedan carnés para el año {anio:02d}.")
+            estado.ocupados[correlativo] = 1
+            carnes.append(prefijo + str(correlativo).zfill(digitos))
+        estado.cantidad_ocupados += cantidad
+        return carnes
+
+    def marcar(self, carne):
+        """Marca un carné como ocupado (por ejemplo, ingresado a mano)."""
+        partes = self._descomponer(carne)
+        if partes is None:
+            return
+        estado = self._anio(partes[0])
+        if not estado.ocupados[partes[1]]:
+            estado.ocupados[partes[1]] = 1
+            estado.cantidad_ocupados += 1
+
+    def liberar(self, carne):
+        """Devuelve un carné al conjunto disponible (sin reutilización, el carné queda retirado)."""
+        partes = self._descomponer(carne)
+        if partes is None or not self.reutilizar_liberados:
+            return
+        estado = self._anios.get(partes[0])
+        if estado is None or not estado.ocupados[partes[1]]:
+            return
+        estado.ocupados[partes[1]] = 0
+        estado.cantidad_ocupados -= 1
+        heapq.heappush(estado.liberados, partes[1])
+
+    # --- Interfaz de índice del almacén ---
+
+    def indexar(self, estudiante):
+        self.marcar(estudiante[self.esquema.carne])
+
+    def desindexar(self, estudiante):
+        self.liberar(estudiante[self.esquema.carne])
+
+    def limpiar(self):
+        self._anios.clear()
@@ -0,0 +1,261 @@
+"""
+Formato binario columnar para instantáneas de estudiantes, legible con mmap sin copias.
+
+Una instantánea de pickle obliga a reconstruir cada diccionario con su lista de tuplas antes de
+poder consultar nada. En este formato cada dato es una columna contigua dentro del archivo, de
+modo que al abrirlo solo se mapea en memoria y se leen las columnas como memoryview:
+
+    cabecera (ver _CABECERA)
+    carnés                  n * ancho bytes, rellenados con NUL
+    promedios               n float64
+    nombres_desplazamientos (n + 1) uint64 sobre nombres_blob
+    nombres_blob            nombres en UTF-8 concatenados
+    materias_desplazamientos(n + 1) uint64 sobre las inscripciones
+    inscripciones_materia   m uint32, índice en el catálogo de materias
+    inscripciones_creditos  m int32, -1 si la materia no tiene créditos (formato propuestaRony)
+    catalogo_desplazamientos(c + 1) uint64 sobre catalogo_blob
+    catalogo_blob           nombres de materia distintos en UTF-8
+
+Los nombres de materia se guardan una sola vez en el catálogo porque se repiten en casi todos
+los estudiantes. Todas las secciones empiezan en posiciones múltiplo de 8 y los números están
+en little-endian.
+
+Persistencia no usa este formato: su instantánea sigue siendo pickle. Cargar el almacén en
+memoria al arrancar obliga a crear cada registro e indexarlo, y eso cuesta lo mismo venga de
+donde venga la fila. El formato columnar sirve para exportar (exportacion.py) y para consultar
+sin cargar el almacén (InstantaneaColumnar, paralelo.py).
+"""
+
+import math
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from .esquema import ESQUEMA_CLI
+
+MAGIA = b"ESTCOL01"
+VERSION = 1
+
+# magia, versión, ancho del carné, n estudiantes, m inscripciones, c materias en catálogo,
+# y la posición de inicio de cada una de las 9 secciones
+_CABECERA = struct.Struct("<8sIIQQQ9Q")
+
+_ALINEACION = 8
+
+
+def _relleno(posicion):
+    return (-posicion) % _ALINEACION
+
+
+def escribir_instantanea_columnar(ruta, estudiantes, esquema=ESQUEMA_CLI):
+    """Escribe los estudiantes (cualquier iterable) en formato columnar de forma atómica.
+
+    Devuelve el número de estudiantes escritos.
+    """
+    if sys.byteorder != "little":
+        raise OSError("El formato columnar solo está soportado en equipos little-endian.")
+
+    carnes = []
+    promedios = array("d")
+    nombres_desplazamientos = array("Q", [0])
+    nombres_blob = bytearray()
+    materias_desplazamientos = array("Q", [0])
+    inscripciones_materia = array("I")
+    inscripciones_creditos = array("i")
+    catalogo = {}  # nombre de materia -> índice
+
+    for estudiante in estudiantes:
+        carnes.append(estudiante[esquema.carne].encode("utf-8"))
+        promedios.append(float(estudiante[esquema.promedio]))
+        nombres_blob += estudiante[esquema.nombre].encode("utf-8")
+        nombres_desplazamientos.append(len(nombres_blob))
+        for materia in estudiante[esquema.materias]:
+            if isinstance(materia, str):
+                nombre_materia, creditos = materia, -1
+            else:
+                nombre_materia, creditos = materia
+            inscripciones_materia.append(catalogo.setdefault(nombre_materia, len(catalogo)))
+            inscripciones_creditos.append(creditos)
+        materias_desplazamientos.append(len(inscripciones_materia))
+
+    ancho = max(map(len, carnes), default=0)
+    catalogo_desplazamientos = array("Q", [0])
+    catalogo_blob = bytearray()
+    for nombre_materia in catalogo:  # Los dict conservan el orden de inserción = índice
+        catalogo_blob += nombre_materia.encode("utf-8")
+        catalogo_desplazamientos.append(len(catalogo_blob))
+
+    secciones = [
+        b"".join(carne.ljust(ancho, b"\0") for carne in carnes),
+        promedios,
+        nombres_desplazamientos,
+        nombres_blob,
+        materias_desplazamientos,
+        inscripciones_materia,
+        inscripciones_creditos,
+        catalogo_desplazamientos,
+        catalogo_blob,
+    ]
+
+    temporal = ruta + ".tmp"
+    with open(temporal, "wb") as archivo:
+        posicion = _CABECERA.size
+        inicios = []
+        for seccion in secciones:
+            posicion += _relleno(posicion)
+            inicios.append(posicion)
+            posicion += len(memoryview(seccion).cast("B"))
+        archivo.write(_CABECERA.pack(MAGIA, VERSION, ancho, len(carnes), len(inscripciones_materia),
+                                     len(catalogo), *inicios))
+        for inicio, seccion in zip(inicios, secciones):
+            archivo.write(b"\0" * (inicio - archivo.tell()))
+            archivo.write(seccion)
+        archivo.flush()
+        os.fsync(archivo.fileno())
+    os.replace(temporal, ruta)
+    return len(carnes)
+
+
+class InstantaneaColumnar:
+    """Instantánea columnar abierta con mmap: abrirla no depende del tamaño del archivo.
+
+    Las columnas numéricas se exponen como memoryview sobre el archivo mapeado (sin copias):
+    `promedios` es un memoryview de float64. Los registros completos solo se construyen cuando
+    se piden con registro(i) o al iterar.
+    """
+
+    def __init__(self, ruta):
+        if sys.byteorder != "little":
+            raise OSError("El formato columnar solo está soportado en equipos little-endian.")
+        self.ruta = ruta
+        self._archivo = open(ruta, "rb")
+        try:
+            self._mapa = mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Archivo vacío
+            self._archivo.close()
+            raise ValueError(f"{ruta} no es una instantánea columnar.")
+        if len(self._mapa) < _CABECERA.size:
+            self.cerrar()
+            raise ValueError(f"{ruta} no es una instantánea columnar.")
+
+        magia, version, ancho, n, m, c, *inicios = _CABECERA.unpack_from(self._mapa, 0)
+        if magia != MAGIA or version != VERSION:
+            self.cerrar()
+            raise ValueError(f"{ruta} no es una instantánea columnar compatible.")
+        self.ancho_carne = ancho
+        self._n = n
+        self._vistas = []
+
+        (i_carnes, i_promedios, i_nom_desp, i_nom_blob, i_mat_desp,
+         i_insc_mat, i_insc_cred, i_cat_desp, i_cat_blob) = inicios
+        self._nombres_desplazamientos = self._columna(i_nom_desp, n + 1, "Q")
+        self._materias_desplazamientos = self._columna(i_mat_desp, n + 1, "Q")
+        self._catalogo_desplazamientos = self._columna(i_cat_desp, c + 1, "Q")
+        self._inicio_carnes = i_carnes
+        self._carnes = self._columna(i_carnes, n * ancho, "B")
+        self.promedios = self._columna(i_promedios, n, "d")
+        self._nombres_blob = self._columna(i_nom_blob, self._nombres_desplazamientos[n], "B")
+        self._inscripciones_materia = self._columna(i_insc_mat, m, "I")
+        self._inscripciones_creditos = self._columna(i_insc_cred, m, "i")
+        self._catalogo_blob = self._columna(i_cat_blob, self._catalogo_desplazamientos[c], "B")
+
+    def _columna(self, inicio, cantidad, tipo):
+        tamanio = struct.calcsize(tipo)
+        vista = memoryview(self._mapa)[inicio:inicio + cantidad * tamanio]
+        if tipo != "B":
+            vista = vista.cast(tipo)
+        self._vistas.append(vista)
+        return vista
+
+    def __len__(self):
+        return self._n
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def cerrar(self):
+        """Libera las vistas y el mapeo. Las columnas dejan de ser válidas."""
+        for vista in getattr(self, "_vistas", ()):
+            vista.release()
+        self._vistas = []
+        if getattr(self, "_mapa", None) is not None:
+            self._mapa.close()
+            self._mapa = None
+        self._archivo.close()
+
+    # --- Acceso por posición ---
+
+    def carne(self, i):
+        inicio = i * self.ancho_carne
+        return bytes(self._carnes[inicio:inicio + self.ancho_carne]).rstrip(b"\0").decode("utf-8")
+
+    def nombre(self, i):
+        inicio, fin = self._nombres_desplazamientos[i], self._nombres_desplazamientos[i + 1]
+        return bytes(self._nombres_blob[inicio:fin]).decode("utf-8")
+
+    def _nombre_materia(self, indice):
+        inicio, fin = self._catalogo_desplazamientos[indice], self._catalogo_desplazamientos[indice + 1]
+        return bytes(self._catalogo_blob[inicio:fin]).decode("utf-8")
+
+    def materias(self, i):
+        """Materias del estudiante i: tuplas (nombre, créditos) o strings si no tienen créditos."""
+        materias = []
+        for j in range(self._materias_desplazamientos[i], self._materias_desplazamientos[i + 1]):
+            nombre_materia = self._nombre_materia(self._inscripciones_materia[j])
+            creditos = self._inscripciones_creditos[j]
+            materias.append(nombre_materia if creditos < 0 else (nombre_materia, creditos))
+        return materias
+
+    def registro(self, i, esquema=ESQUEMA_CLI):
+        """Reconstruye el diccionario del estudiante i con las claves del esquema."""
+        return {
+            esquema.nombre: self.nombre(i),
+            esquema.carne: self.carne(i),
+            esquema.materias: self.materias(i),
+            esquema.promedio: self.promedios[i],
+        }
+
+    def registros(self, esquema=ESQUEMA_CLI):
+        """Genera todos los estudiantes en el orden en que se escribieron."""
+        for i in range(self._n):
+            yield self.registro(i, esquema)
+
+    def __iter__(self):
+        return self.registros()
+
+    # --- Consultas directas sobre las columnas mapeadas ---
+
+    def posicion_de(self, carne):
+        """Posición del estudiante con ese carné o None. La búsqueda la hace mmap.find en C."""
+        aguja = carne.encode("utf-8")
+        if len(aguja) > self.ancho_carne:
+            return None
+        aguja = aguja.ljust(self.ancho_carne, b"\0")
+        inicio = self._inicio_carnes
+        fin = inicio + self._n * self.ancho_carne
+        posicion = self._mapa.find(aguja, inicio, fin)
+        while posicion != -1:
+            desplazamiento = posicion - inicio
+            if desplazamiento % self.ancho_carne == 0:
+                return desplazamiento // self.ancho_carne
+            posicion = self._mapa.find(aguja, posicion + 1, fin)
+        return None
+
+    def promedio_general(self):
+        """Promedio de la columna de promedios o None si no hay estudiantes."""
+        if not self._n:
+            return None
+        return math.fsum(self.promedios) / self._n
+
+    def posiciones_superiores_a(self, umbral):
+        """Posiciones de los estudiantes con promedio > umbral."""
+        return [i for i, promedio in enumerate(self.promedios) if promedio > umbral]
+
+    def superiores_a(self, umbral, esquema=ESQUEMA_CLI):
+        """Estudiantes con promedio > umbral, en el orden de la instantánea."""
+        return [self.registro(i, esquema) for i in self.posiciones_superiores_a(umbral)]
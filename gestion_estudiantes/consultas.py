@@ -0,0 +1,327 @@
+"""
+Consultas componibles y perezosas sobre el almacén de estudiantes.
+
+    consulta = (Consulta(almacen)
+                .donde(promedio__gt=8).donde(cohorte=23).donde(materia="Cálculo I")
+                .ordenar_por("-promedio").limitar(50))
+    for estudiante in consulta:  # Se planifica y se ejecuta recién al recorrerla
+        ...
+
+donde, ordenar_por y limitar devuelven una consulta nueva, así una consulta base se puede
+reutilizar; where, order_by y limit son los mismos métodos con nombre en inglés.
+
+Campos (con el mismo nombre en cualquier esquema): carne, nombre, promedio, materia y cohorte
+(año YY del carné). Operadores, como campo__operador: igualdad (sin operador), gt, gte, lt,
+lte, in y contains (nombre, sin distinguir mayúsculas, como la búsqueda). Las condiciones se
+combinan con Y: donde(materia=...) repetido pide estar inscrito en todas esas materias.
+Un valor que no es del tipo del campo (texto; número en promedio; entero en cohorte) da ValueError.
+
+El planificador estima cuántos estudiantes entrega cada índice que sirve para las condiciones
+y recorre el más selectivo; las condiciones que ese índice no garantiza se verifican sobre
+cada candidato:
+- carné: índice hash del almacén (0 o 1 estudiante, o uno por carné con `in`).
+- promedio: IndicePromedio, el tramo entre los límites de todas las condiciones de promedio.
+  Ya viene ordenado por promedio, así que ordenar_por("promedio") o ("-promedio") no ordena
+  y limitar() corta el recorrido.
+- materia: IndiceMaterias (inscritos en la materia, o en alguna de las de `in`).
+- nombre: candidatos del índice de trigramas (términos de 3 letras o más).
+  Los caminos por carné, materia y nombre entregan los candidatos ordenados por carné.
+- cohorte: en un AlmacenParticionado solo se recorren las particiones de esas cohortes.
+Si ningún índice sirve se recorre el almacén completo. A igual estimación se prefiere el
+camino que ya entrega el orden pedido. explicar() describe el plan elegido.
+
+Sin ordenar_por los resultados salen en orden de inserción (en un AlmacenParticionado, por
+cohorte). La consulta no toma candados ni copia el almacén: no se debe modificar el almacén
+mientras se recorre; GestorEstudiantes arma las listas con su candado tomado.
+"""
+
+import heapq
+import itertools
+import numbers
+import operator
+from collections import namedtuple
+
+from .analitica import cohorte_de
+from .indices import normalizar
+from .particiones import AlmacenParticionado
+
+CAMPOS_ORDEN = ("carne", "nombre", "promedio", "cohorte")
+
+_OPERADORES_POR_CAMPO = {
+    "carne": {"eq", "in"},
+    "nombre": {"eq", "contains"},
+    "promedio": {"eq", "gt", "gte", "lt", "lte"},
+    "materia": {"eq", "in"},
+    "cohorte": {"eq", "gt", "gte", "lt", "lte", "in"},
+}
+
+# Tipo que debe tener el valor de cada campo (en `in`, cada elemento); bool no cuenta como número
+_TIPOS_POR_CAMPO = {
+    "carne": (str, "un texto"),
+    "nombre": (str, "un texto"),
+    "promedio": (numbers.Real, "un número"),
+    "materia": (str, "un texto"),
+    "cohorte": (int, "un entero"),
+}
+
+_SIMBOLOS = {"eq": "=", "gt": ">", "gte": ">=", "lt": "<", "lte": "<=", "in": "en", "contains": "contiene"}
+
+_COMPARAR = {
+    "eq": operator.eq,
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "lt": operator.lt,
+    "lte": operator.le,
+    "in": lambda valor, valores: valor in valores,
+}
+
+Condicion = namedtuple("Condicion", ["campo", "operador", "valor"])
+
+# Orden en que un camino entrega a los estudiantes
+ORDEN_INSERCION = "insercion"
+ORDEN_PROMEDIO = "promedio"
+ORDEN_CARNE = "carne"
+
+# producir(descendente) genera los candidatos en su orden, de menor a mayor o al revés;
+# cubre son las condiciones que el camino ya garantiza y no hace falta volver a verificar
+_Camino = namedtuple("_Camino", ["descripcion", "estimacion", "orden", "producir", "cubre"])
+
+
+def _leer_condicion(clave, valor):
+    campo, _, operador = clave.partition("__")
+    operador = operador or "eq"
+    operadores = _OPERADORES_POR_CAMPO.get(campo)
+    if operadores is None:
+        raise ValueError(f"Campo desconocido: {campo!r}")
+    if operador not in operadores:
+        raise ValueError(f"El campo {campo!r} no admite el operador {operador!r}")
+    tipo, descripcion = _TIPOS_POR_CAMPO[campo]
+    if operador == "in":
+        if isinstance(valor, (str, bytes)) or not hasattr(valor, "__iter__"):
+            raise ValueError(f"{clave} espera una lista de valores")
+        valor = tuple(valor)
+    for elemento in valor if operador == "in" else (valor,):
+        if not isinstance(elemento, tipo) or isinstance(elemento, bool):
+            raise ValueError(f"{clave} espera {descripcion}, no {elemento!r}")
+    return Condicion(campo, operador, valor)
+
+
+def _texto(condicion):
+    return f"{condicion.campo} {_SIMBOLOS[condicion.operador]} {condicion.valor!r}"
+
+
+class Consulta:
+    """Consulta sobre un AlmacenEstudiantes o un AlmacenParticionado; se ejecuta al recorrerla."""
+
+    def __init__(self, almacen):
+        self.almacen = almacen
+        self._condiciones = ()
+        self._orden = None  # (campo, descendente)
+        self._limite = None
+
+    def __repr__(self):
+        return f"Consulta({self.explicar()})"
+
+    def _copia(self, **cambios):
+        nueva = Consulta(self.almacen)
+        nueva.__dict__.update(self.__dict__, **cambios)
+        return nueva
+
+    # --- Construcción ---
+
+    def donde(self, **condiciones):
+        """Agrega condiciones campo__operador=valor (ver el docstring del módulo)."""
+        nuevas = tuple(_leer_condicion(clave, valor) for clave, valor in condiciones.items())
+        return self._copia(_condiciones=self._condiciones + nuevas)
+
+    def ordenar_por(self, campo):
+        """Ordena por carne, nombre, promedio o cohorte; con "-" delante, de mayor a menor."""
+        descendente = campo.startswith("-")
+        campo = campo.lstrip("-")
+        if campo not in CAMPOS_ORDEN:
+            raise ValueError(f"No se puede ordenar por {campo!r}")
+        return self._copia(_orden=(campo, descendente))
+
+    def limitar(self, cantidad):
+        """Entrega a lo sumo `cantidad` estudiantes."""
+        if cantidad < 0:
+            raise ValueError("El límite no puede ser negativo.")
+        return self._copia(_limite=int(cantidad))
+
+    where = donde
+    order_by = ordenar_por
+    limit = limitar
+
+    # --- Planificación ---
+
+    def _almacenes(self):
+        """Particiones que hay que recorrer: las de las cohortes pedidas, o el almacén completo."""
+        if not isinstance(self.almacen, AlmacenParticionado):
+            return [(None, self.almacen)]
+        condiciones = [c for c in self._condiciones if c.campo == "cohorte"]
+        return [(anio, self.almacen.particion(anio)) for anio in self.almacen.cohortes()
+                if all(_COMPARAR[c.operador](anio, c.valor) for c in condiciones)]
+
+    def _limites_promedio(self):
+        """(mínimo, máximo, incluir_mínimo, incluir_máximo) de las condiciones de promedio, o None."""
+        minimo = maximo = None
+        incluir_minimo = incluir_maximo = True
+        encontradas = False
+        for campo, operador, valor in self._condiciones:
+            if campo != "promedio":
+                continue
+            encontradas = True
+            if operador in ("eq", "gt", "gte") and (minimo is None or valor > minimo
+                                                    or (valor == minimo and operador == "gt")):
+                minimo, incluir_minimo = valor, operador != "gt"
+            if operador in ("eq", "lt", "lte") and (maximo is None or valor < maximo
+                                                    or (valor == maximo and operador == "lt")):
+                maximo, incluir_maximo = valor, operador != "lt"
+        return (minimo, maximo, incluir_minimo, incluir_maximo) if encontradas else None
+
+    def _caminos(self, almacen):
+        """Caminos de acceso posibles para las condiciones sobre un almacén."""
+        caminos = [_Camino("recorrido completo", len(almacen), ORDEN_INSERCION,
+                           lambda descendente: iter(almacen), ())]
+
+        limites = self._limites_promedio()
+        if limites is None and self._orden is not None and self._orden[0] == "promedio":
+            limites = (None, None, True, True)  # Recorrer el índice completo ya da el orden pedido
+        if limites is not None:
+            caminos.append(_Camino(
+                "índice de promedios", almacen.promedios.contar(*limites), ORDEN_PROMEDIO,
+                lambda descendente: almacen.promedios.recorrer(*limites, descendente=descendente),
+                tuple(c for c in self._condiciones if c.campo == "promedio")))
+
+        for condicion in self._condiciones:
+            campo, operador, valor = condicion
+            if campo == "carne":
+                carnes = [carne for carne in dict.fromkeys(valor if operador == "in" else (valor,)) if carne in almacen]
+            elif campo == "materia":
+                carnes = (almacen.materias.inscritos(valor) if operador == "eq"
+                          else almacen.materias.en_alguna(valor))
+            elif campo == "nombre":
+                carnes = almacen.nombres.candidatos(valor)
+                if carnes is None:
+                    continue  # Término muy corto para el índice de trigramas
+            else:
+                continue
+            # Los candidatos por trigramas hay que verificarlos; carné y materia son exactos
+            cubre = () if campo == "nombre" else (condicion,)
+            caminos.append(_Camino(
+                f"índice de {campo} ({_texto(condicion)})", len(carnes), ORDEN_CARNE,
+                lambda descendente, carnes=carnes: map(almacen.obtener, sorted(carnes, reverse=descendente)),
+                cubre))
+        return caminos
+
+    def _elegir(self, almacen):
+        """El camino con menor estimación; a igual estimación, el que ya entrega el orden pedido."""
+        orden_pedido = ORDEN_INSERCION if self._orden is None else self._orden[0]
+        return min(self._caminos(almacen), key=lambda camino: (camino.estimacion, camino.orden != orden_pedido))
+
+    def _filtro(self, almacen, cubiertas):
+        """Función que dice si un estudiante cumple las condiciones no cubiertas, o None si no hay."""
+        esquema = almacen.esquema
+        clave_carne = esquema.carne
+        predicados = []
+        for campo, operador, valor in self._condiciones:
+            if (campo, operador, valor) in cubiertas:
+                continue
+            if campo == "materia":
+                contiene = almacen.materias.contiene
+                if operador == "eq":
+                    predicados.append(lambda est, m=valor: contiene(m, est[clave_carne]))
+                else:
+                    predicados.append(lambda est, ms=valor: any(contiene(m, est[clave_carne]) for m in ms))
+            elif campo == "nombre" and operador == "contains":
+                predicados.append(lambda est, t=valor.lower(), c=esquema.nombre: t in est[c].lower())
+            elif campo == "cohorte":
+                comparar = _COMPARAR[operador]
+                predicados.append(lambda est, f=comparar, v=valor: f(cohorte_de(est[clave_carne]), v))
+            else:
+                clave = getattr(esquema, campo)
+                comparar = _COMPARAR[operador]
+                predicados.append(lambda est, f=comparar, v=valor, c=clave: f(est[c], v))
+        if not predicados:
+            return None
+        if len(predicados) == 1:
+            return predicados[0]
+        return lambda est: all(predicado(est) for predicado in predicados)
+
+    def _clave_orden(self, esquema):
+        campo = self._orden[0]
+        if campo == "cohorte":
+            return lambda est: cohorte_de(est[esquema.carne])
+        if campo == "nombre":
+            return lambda est: normalizar(est[esquema.nombre])
+        return operator.itemgetter(getattr(esquema, campo))
+
+    # --- Ejecución ---
+
+    def _recorrer(self, almacen):
+        """Estudiantes de un almacén que cumplen las condiciones, en el orden pedido."""
+        camino = self._elegir(almacen)
+        descendente = bool(self._orden and self._orden[1])
+        estudiantes = camino.producir(descendente)
+        filtro = self._filtro(almacen, camino.cubre)
+        if filtro is not None:
+            estudiantes = filter(filtro, estudiantes)
+
+        if self._orden is None:
+            if camino.orden == ORDEN_INSERCION:
+                return estudiantes
+            clave_carne = almacen.esquema.carne
+            return sorted(estudiantes, key=lambda est: almacen.posicion(est[clave_carne]))
+        if self._orden[0] == camino.orden:
+            return estudiantes
+        # Los empates quedan en orden de inserción (al revés si es descendente, como en el índice
+        # de promedios); los candidatos por carné no traen ese orden y se desempatan por posición
+        clave = self._clave_orden(almacen.esquema)
+        if camino.orden != ORDEN_INSERCION:
+            clave_carne = almacen.esquema.carne
+            clave = lambda est, clave=clave: (clave(est), almacen.posicion(est[clave_carne]))
+        ordenados = sorted(estudiantes, key=clave)
+        if descendente:
+            ordenados.reverse()
+        return ordenados
+
+    def __iter__(self):
+        resultados = [self._recorrer(almacen) for _, almacen in self._almacenes()]
+        if len(resultados) == 1:
+            estudiantes = iter(resultados[0])
+        elif self._orden is None:
+            estudiantes = itertools.chain.from_iterable(resultados)
+        else:
+            estudiantes = heapq.merge(*resultados, key=self._clave_orden(self.almacen.esquema),
+                                      reverse=self._orden[1])
+        if self._limite is not None:
+            estudiantes = itertools.islice(estudiantes, self._limite)
+        yield from estudiantes
+
+    def lista(self):
+        return list(self)
+
+    def primero(self):
+        """El primer estudiante del resultado, o None."""
+        return next(iter(self.limitar(1)), None)
+
+    def contar(self):
+        return sum(1 for _ in self)
+
+    def explicar(self):
+        """Descripción del plan: camino elegido por almacén, filtros, orden y límite."""
+        partes = []
+        for anio, almacen in self._almacenes():
+            camino = self._elegir(almacen)
+            texto = f"{camino.descripcion}: ~{camino.estimacion} candidatos"
+            partes.append(texto if anio is None else f"cohorte {anio:02d}: {texto}")
+        if not partes:
+            partes.append("ninguna cohorte")
+        plan = "; ".join(partes)
+        if self._condiciones:
+            plan += " | filtro " + " y ".join(_texto(c) for c in self._condiciones)
+        if self._orden is not None:
+            plan += f" | orden {'-' if self._orden[1] else ''}{self._orden[0]}"
+        if self._limite is not None:
+            plan += f" | límite {self._limite}"
+        return plan
@@ -0,0 +1,47 @@
+"""
+Esquemas de registro de estudiantes.
+
+El repositorio maneja dos formas de representar a un estudiante:
+- student_management.py usa claves en minúscula ('carne', 'nombre', ...).
+- propuestaRony usa claves capitalizadas ("Carné", "Nombre", ...).
+
+Un Esquema indica al motor qué clave del diccionario contiene cada dato, de modo que
+el mismo almacén e índices sirven para ambos formatos sin copiar los registros.
+"""
+
+import re
+from collections import namedtuple
+
+
+class Esquema(namedtuple("Esquema", ["carne", "nombre", "materias", "promedio",
+                                     "patron_carne", "materias_con_creditos"],
+                         defaults=(r"0905-[0-9]{2}-[0-9]{4}", True))):
+    """Nombres de las claves usadas por un formato de registro de estudiante.
+
+    patron_carne es la expresión regular (completa) que debe cumplir un carné y
+    materias_con_creditos indica si cada materia es una tupla (nombre, créditos) o solo el nombre.
+    """
+
+    __slots__ = ()
+
+    def validar_carne(self, carne):
+        """True si el carné tiene el formato de este esquema."""
+        return _patron_compilado(self.patron_carne).fullmatch(carne) is not None
+
+
+_PATRONES = {}
+
+
+def _patron_compilado(patron):
+    compilado = _PATRONES.get(patron)
+    if compilado is None:
+        compilado = _PATRONES[patron] = re.compile(patron)
+    return compilado
+
+
+# Formato de student_management.py: carné 0905-YY-xxxx, materias como tuplas (nombre, créditos)
+ESQUEMA_CLI = Esquema(carne="carne", nombre="nombre", materias="materias", promedio="promedio")
+
+# Formato de propuestaRony: carné 0905-YY-XXXXX, materias como lista de strings
+ESQUEMA_RONY = Esquema(carne="Carné", nombre="Nombre", materias="Materias", promedio="Promedio",
+                       patron_carne=r"0905-[0-9]{2}-[0-9]{5}", materias_con_creditos=False)
@@ -0,0 +1,173 @@
+"""
+Exportación en flujo del almacén a CSV, JSONL (opcionalmente .gz) o instantánea columnar.
+
+Los estudiantes se recorren con generadores y se escriben con un búfer grande, sin construir
+el archivo completo en memoria. Los filtros usan los índices del almacén cuando es posible:
+con promedio_minimo se recorre solo el tramo correspondiente del índice de promedios (de mayor
+a menor promedio); sin él se conserva el orden de inserción.
+
+El CSV y el JSONL usan el mismo formato que acepta importacion.py, así que un archivo
+exportado se puede volver a importar.
+"""
+
+import csv
+import io
+import json
+from itertools import islice
+
+from .analitica import cohorte_de
+from .columnar import escribir_instantanea_columnar
+from .importacion import abrir_texto
+
+TAMANIO_BUFER = 1 << 20
+
+# Estudiantes copiados cada vez que se toma el candado al exportar
+TAMANIO_TRAMO = 10000
+
+ENCABEZADO = ["nombre", "carne", "materias", "promedio"]
+
+
+def seleccionar(almacen, promedio_minimo=None, cohorte=None, candado=None):
+    """Genera los estudiantes que cumplen los filtros.
+
+    promedio_minimo: solo promedios estrictamente mayores (como "promedio superior a").
+    cohorte: año YY de inscripción tomado del carné.
+    candado: si se da, el almacén se lee por tramos de TAMANIO_TRAMO con el candado tomado
+    solo mientras se copia cada tramo.
+    """
+    if candado is not None:
+        estudiantes = _por_tramos(almacen, promedio_minimo, candado)
+    elif promedio_minimo is not None:
+        estudiantes = almacen.promedios.recorrer(promedio_minimo, None, incluir_minimo=False, descendente=True)
+    else:
+        estudiantes = almacen
+    if cohorte is None:
+        yield from estudiantes
+        return
+    clave_carne = almacen.esquema.carne
+    for estudiante in estudiantes:
+        if cohorte_de(estudiante[clave_carne]) == cohorte:
+            yield estudiante
+
+
+def _por_tramos(almacen, promedio_minimo, candado):
+    """Recorre la selección copiando un tramo a la vez con el candado tomado.
+
+    Entre tramos otros hilos pueden modificar el almacén: cada estudiante presente durante toda
+    la exportación se escribe una sola vez; los que se agregan o eliminan mientras tanto pueden
+    aparecer o no.
+    """
+    if promedio_minimo is not None:
+        promedios = almacen.promedios
+        clave_carne = almacen.esquema.carne
+        ultima = None
+        while True:
+            with candado:
+                tramo = list(islice(promedios.recorrer(promedio_minimo, None, incluir_minimo=False,
+                                                       descendente=True, despues_de=ultima), TAMANIO_TRAMO))
+                if not tramo:
+                    return
+                ultima = promedios.clave(tramo[-1][clave_carne])
+            yield from tramo
+
+    with candado:
+        almacen.fijar_posiciones()  # Sin compactar, la posición guardada sigue siendo válida
+    try:
+        posicion = 0
+        while True:
+            with candado:
+                tramo, siguiente = almacen.tramo(posicion, TAMANIO_TRAMO)
+            if siguiente == posicion:
+                return
+            posicion = siguiente
+            yield from tramo
+    finally:
+        with candado:
+            almacen.soltar_posiciones()
+
+
+def _abrir_escritura(ruta):
+    if ruta.endswith(".gz"):
+        return abrir_texto(ruta, "w")
+    return open(ruta, "w", encoding="utf-8", newline="", buffering=TAMANIO_BUFER)
+
+
+def _materias_a_texto(materias):
+    return ";".join(materia if isinstance(materia, str) else f"{materia[0]}:{materia[1]}"
+                    for materia in materias)
+
+
+def exportar_csv(estudiantes, ruta, esquema):
+    """Escribe los estudiantes como CSV. Devuelve cuántos se escribieron."""
+    cantidad = 0
+
+    def filas():
+        nonlocal cantidad
+        for estudiante in estudiantes:
+            cantidad += 1
+            yield (estudiante[esquema.nombre], estudiante[esquema.carne],
+                   _materias_a_texto(estudiante[esquema.materias]), estudiante[esquema.promedio])
+
+    with _abrir_escritura(ruta) as archivo:
+        escritor = csv.writer(archivo)
+        escritor.writerow(ENCABEZADO)
+        escritor.writerows(filas())
+    return cantidad
+
+
+def exportar_jsonl(estudiantes, ruta, esquema):
+    """Escribe un objeto JSON por estudiante. Devuelve cuántos se escribieron."""
+    cantidad = 0
+    codificar = json.JSONEncoder(ensure_ascii=False).encode
+    with _abrir_escritura(ruta) as archivo:
+        # Se agrupan las líneas en bloques para reducir las llamadas a write
+        bloque = io.StringIO()
+        for estudiante in estudiantes:
+            bloque.write(codificar({
+                "nombre": estudiante[esquema.nombre],
+                "carne": estudiante[esquema.carne],
+                "materias": estudiante[esquema.materias],
+                "promedio": estudiante[esquema.promedio],
+            }))
+            bloque.write("\n")
+            cantidad += 1
+            if bloque.tell() >= TAMANIO_BUFER:
+                archivo.write(bloque.getvalue())
+                bloque = io.StringIO()
+        archivo.write(bloque.getvalue())
+    return cantidad
+
+
+def exportar_columnar(estudiantes, ruta, esquema):
+    """Escribe una instantánea columnar (ver columnar.py). Devuelve cuántos se escribieron."""
+    if ruta.endswith(".gz"):
+        raise ValueError("La instantánea columnar se lee con mmap y no puede ir comprimida.")
+    return escribir_instantanea_columnar(ruta, estudiantes, esquema)
+
+
+_EXPORTADORES = {"csv": exportar_csv, "jsonl": exportar_jsonl, "columnar": exportar_columnar}
+
+
+def detectar_formato_exportacion(ruta):
+    base = ruta[:-3] if ruta.endswith(".gz") else ruta
+    if base.endswith(".csv"):
+        return "csv"
+    if base.endswith((".jsonl", ".json", ".ndjson")):
+        return "jsonl"
+    if base.endswith(".col"):
+        return "columnar"
+    raise ValueError(f"No se reconoce el formato de {ruta}; use .csv, .jsonl o .col")
+
+
+def exportar(almacen, ruta, formato=None, promedio_minimo=None, cohorte=None, candado=None):
+    """Exporta el almacén (con filtros opcionales) a ruta. Devuelve cuántos estudiantes se escribieron.
+
+    Con `candado`, la selección se lee por tramos y el candado se toma solo mientras se copia
+    cada tramo, así otros hilos pueden usar el almacén mientras se escribe el archivo.
+    """
+    formato = formato or detectar_formato_exportacion(ruta)
+    exportador = _EXPORTADORES.get(formato)
+    if exportador is None:
+        raise ValueError(f"Formato no soportado: {formato}")
+    estudiantes = seleccionar(almacen, promedio_minimo, cohorte, candado)
+    return exportador(estudiantes, ruta, almacen.esquema)
@@ -0,0 +1,191 @@
+"""
+Generador de estudiantes sintéticos para pruebas de carga.
+
+Genera por lotes en lugar de uno a uno: en cada lote se eligen de una sola vez (random.choices)
+los nombres, años, promedios y materias, y los carnés se piden por bloques al AsignadorCarnes.
+Con la misma semilla se obtienen exactamente los mismos estudiantes.
+
+Las materias de cada estudiante son una de `variedad_materias` combinaciones preparadas al
+inicio con random.sample sobre el catálogo (materias distintas, sin reintentos). Elegir entre
+combinaciones ya armadas evita un random.sample por estudiante; las combinaciones son listas
+compartidas entre estudiantes y no deben modificarse.
+
+Cada año YY admite a lo sumo 10**digitos - 1 carnés; para generar millones de estudiantes con
+el formato de 4 dígitos hay que repartirlos entre más años (por ejemplo anios=range(100)).
+Cuando un año se llena, los estudiantes restantes del lote pasan a los demás años.
+"""
+
+import csv
+import json
+import random
+from collections import Counter
+
+from .carnes import AsignadorCarnes, CarnesAgotadosError
+from .columnar import escribir_instantanea_columnar
+from .esquema import ESQUEMA_CLI
+from .exportacion import TAMANIO_BUFER
+
+TAMANIO_LOTE = 10000
+
+NOMBRES_BASE = ["Ana", "Juan", "María", "Carlos", "Laura", "Luis", "Sofía", "David", "Elena", "Miguel",
+                "Valentina", "Diego", "Camila", "Andrés", "Isabella"]
+APELLIDOS = ["Pérez", "López", "García", "Sánchez", "Fernández", "Rodríguez", "Martínez", "Gómez",
+             "Jiménez", "Hernández", "Díaz", "Ruiz", "Álvarez", "Moreno", "Romero"]
+MATERIAS_BASE = ["Programación", "Cálculo", "Física", "Química", "Historia", "Literatura",
+                 "Álgebra Lineal", "Estadística Aplicada", "Bases de Datos", "Redes de Computadoras",
+                 "Inglés Técnico", "Metodología de Investigación"]
+SUFIJOS_MATERIAS = ["I", "II", "Avanzada", "Fundamental"]
+
+CATALOGO_EJEMPLO = [f"{materia} {sufijo}" for materia in MATERIAS_BASE for sufijo in SUFIJOS_MATERIAS]
+
+# Promedios con un decimal entre 5.0 y 10.0
+PROMEDIOS_POSIBLES = [valor / 10 for valor in range(50, 101)]
+PROMEDIOS_TEXTO = [repr(promedio) for promedio in PROMEDIOS_POSIBLES]
+
+
+def nombres_completos(nombres=NOMBRES_BASE, apellidos=APELLIDOS):
+    """Todas las combinaciones 'Nombre Apellido Apellido' (se eligen con random.choices)."""
+    return [f"{nombre} {a1} {a2}" for nombre in nombres for a1 in apellidos for a2 in apellidos]
+
+
+class GeneradorEstudiantes:
+    """Generador reproducible de lotes de estudiantes.
+
+    asignador: AsignadorCarnes a usar (por omisión uno nuevo de 4 dígitos para el esquema).
+    anios: años YY entre los que se reparten los carnés.
+    catalogo: nombres de materia posibles; cada estudiante recibe entre 2 y 5 distintas.
+    nombres: nombres completos posibles.
+    """
+
+    def __init__(self, semilla=None, esquema=ESQUEMA_CLI, asignador=None, anios=range(18, 26),
+                 catalogo=CATALOGO_EJEMPLO, nombres=None, materias_por_estudiante=(2, 5),
+                 creditos=(2, 5), variedad_materias=4096):
+        self.aleatorio = random.Random(semilla)
+        self.esquema = esquema
+        self.asignador = asignador if asignador is not None else AsignadorCarnes(esquema)
+        self.anios = list(anios)
+        self.catalogo = list(catalogo)
+        self.nombres = list(nombres) if nombres is not None else nombres_completos()
+        self.materias_por_estudiante = materias_por_estudiante
+        self.creditos = list(range(creditos[0], creditos[1] + 1))
+        self.combinaciones = [self._combinacion() for _ in range(variedad_materias)]
+        self.combinaciones_texto = [_materias_texto(materias) for materias in self.combinaciones]
+        self._indices_combinaciones = range(len(self.combinaciones))
+
+    def _combinacion(self):
+        """Materias distintas para un estudiante (con créditos si el esquema los usa)."""
+        aleatorio = self.aleatorio
+        minimo, maximo = self.materias_por_estudiante
+        materias = aleatorio.sample(self.catalogo, aleatorio.randint(minimo, maximo))
+        if self.esquema.materias_con_creditos:
+            return [(materia, aleatorio.choice(self.creditos)) for materia in materias]
+        return materias
+
+    def _carnes(self, cantidad):
+        """Pide `cantidad` carnés por bloques, repartidos al azar entre los años con cupo."""
+        asignador = self.asignador
+        con_cupo = [anio for anio in self.anios if asignador.disponibles(anio)]
+        if sum(asignador.disponibles(anio) for anio in con_cupo) < cantidad:
+            raise CarnesAgotadosError(
+                f"No hay {cantidad} carnés libres entre los años {self.anios[0]:02d}-{self.anios[-1]:02d}.")
+        pedidos = Counter(self.aleatorio.choices(con_cupo, k=cantidad))
+        carnes = []
+        faltantes = 0
+        for anio in con_cupo:
+            tomar = min(pedidos[anio], asignador.disponibles(anio))
+            faltantes += pedidos[anio] - tomar
+            carnes.extend(asignador.asignar_bloque(anio, tomar))
+        for anio in con_cupo:  # Lo que no cupo en su año va a los años que aún tienen lugar
+            if not faltantes:
+                break
+            tomar = min(faltantes, asignador.disponibles(anio))
+            carnes.extend(asignador.asignar_bloque(anio, tomar))
+            faltantes -= tomar
+        self.aleatorio.shuffle(carnes)
+        return carnes
+
+    def filas(self, cantidad, como_texto=False):
+        """Lista de tuplas (nombre, carné, materias, promedio) para un lote.
+
+        Con como_texto=True las materias y el promedio vienen ya como texto en el formato CSV
+        ("Materia:3;...", "7.5"), listos para csv.writer.
+        """
+        aleatorio = self.aleatorio
+        combinaciones = self.combinaciones_texto if como_texto else self.combinaciones
+        promedios = PROMEDIOS_TEXTO if como_texto else PROMEDIOS_POSIBLES
+        indices = aleatorio.choices(self._indices_combinaciones, k=cantidad)
+        return list(zip(aleatorio.choices(self.nombres, k=cantidad), self._carnes(cantidad),
+                        [combinaciones[i] for i in indices],
+                        aleatorio.choices(promedios, k=cantidad)))
+
+    def lotes_filas(self, cantidad, tamanio_lote=TAMANIO_LOTE, como_texto=False):
+        """Genera listas de filas hasta completar `cantidad` estudiantes."""
+        while cantidad > 0:
+            lote = min(cantidad, tamanio_lote)
+            yield self.filas(lote, como_texto)
+            cantidad -= lote
+
+    def estudiantes(self, cantidad, tamanio_lote=TAMANIO_LOTE):
+        """Genera uno a uno los estudiantes como diccionarios del esquema."""
+        esquema = self.esquema
+        for lote in self.lotes_filas(cantidad, tamanio_lote):
+            for nombre, carne, materias, promedio in lote:
+                yield {esquema.nombre: nombre, esquema.carne: carne,
+                       esquema.materias: materias, esquema.promedio: promedio}
+
+
+def poblar_almacen(almacen, cantidad, semilla=None, asignador=None, **opciones):
+    """Agrega `cantidad` estudiantes sintéticos al almacén. Devuelve cuántos se agregaron.
+
+    Si no se pasa un asignador, se crea uno que ya conoce los carnés del almacén.
+    """
+    if asignador is None:
+        asignador = AsignadorCarnes(almacen.esquema)
+        for carne in almacen.set_carnes:
+            asignador.marcar(carne)
+    generador = GeneradorEstudiantes(semilla, almacen.esquema, asignador, **opciones)
+    agregados = 0
+    for estudiante in generador.estudiantes(cantidad):
+        almacen.agregar(estudiante)
+        agregados += 1
+    return agregados
+
+
+def _materias_texto(materias):
+    return ";".join(materia if isinstance(materia, str) else f"{materia[0]}:{materia[1]}"
+                    for materia in materias)
+
+
+def generar_archivo(ruta, cantidad, semilla=None, formato=None, **opciones):
+    """Escribe `cantidad` estudiantes sintéticos en CSV, JSONL o columnar sin pasar por el almacén.
+
+    Los archivos CSV y JSONL se pueden cargar con importacion.importar_archivo.
+    """
+    from .exportacion import detectar_formato_exportacion
+    from .importacion import abrir_texto
+
+    formato = formato or detectar_formato_exportacion(ruta)
+    generador = GeneradorEstudiantes(semilla, **opciones)
+    if formato == "columnar":
+        return escribir_instantanea_columnar(ruta, generador.estudiantes(cantidad), generador.esquema)
+
+    if ruta.endswith(".gz"):
+        archivo = abrir_texto(ruta, "w")
+    else:
+        archivo = open(ruta, "w", encoding="utf-8", newline="", buffering=TAMANIO_BUFER)
+    with archivo:
+        if formato == "csv":
+            escritor = csv.writer(archivo)
+            escritor.writerow(["nombre", "carne", "materias", "promedio"])
+            for lote in generador.lotes_filas(cantidad, como_texto=True):
+                escritor.writerows(lote)
+        elif formato == "jsonl":
+            codificar = json.JSONEncoder(ensure_ascii=False).encode
+            for lote in generador.lotes_filas(cantidad):
+                archivo.write("".join(
+                    codificar({"nombre": nombre, "carne": carne, "materias": materias,
+                               "promedio": promedio}) + "\n"
+                    for nombre, carne, materias, promedio in lote))
+        else:
+            raise ValueError(f"Formato no soportado: {formato}")
+    return cantidad
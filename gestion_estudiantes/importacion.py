@@ -0,0 +1,268 @@
+"""
+Importación masiva de estudiantes desde archivos CSV o JSONL (opcionalmente .gz).
+
+El archivo se procesa en flujo: los lectores son generadores que producen una fila a la vez,
+cada fila se valida con el formato del esquema (patrón de carné precompilado) y las filas
+válidas se acumulan en lotes de tamaño fijo. Cada lote se contrasta de una sola vez contra los
+carnés ya registrados (intersección de conjuntos) y se agrega al almacén. La memoria usada por
+la importación depende del tamaño del lote, no del tamaño del archivo.
+
+Formatos aceptados:
+- CSV con encabezado nombre,carne,materias,promedio (se aceptan también las claves del
+  esquema, como "Carné"). Las materias van separadas por ';' y los créditos tras ':',
+  por ejemplo "Cálculo I:4;Física General:3".
+- JSONL: un objeto por línea con esas mismas claves; las materias como lista de
+  [nombre, créditos] o de strings.
+
+Las filas rechazadas se escriben, si se indica ruta_rechazos, como JSONL con el número de
+línea, el motivo y la fila original.
+"""
+
+import csv
+import gzip
+import json
+from collections import namedtuple
+
+from .indices import normalizar
+from .registro import SIN_CREDITOS
+
+ResultadoImportacion = namedtuple("ResultadoImportacion", ["aceptados", "rechazados"])
+
+TAMANIO_LOTE = 10000
+
+# Nivel de gzip al escribir: el 9 que usa gzip.open por omisión es varias veces más lento
+NIVEL_COMPRESION = 6
+
+# Nombres de columna aceptados (normalizados) -> campo
+_CAMPOS = {"nombre": "nombre", "carne": "carne", "materias": "materias", "promedio": "promedio"}
+
+
+def abrir_texto(ruta, modo="r"):
+    """Abre un archivo de texto UTF-8, descomprimiendo/comprimiendo si termina en .gz."""
+    if ruta.endswith(".gz"):
+        return gzip.open(ruta, modo + "t", compresslevel=NIVEL_COMPRESION, encoding="utf-8", newline="")
+    return open(ruta, modo, encoding="utf-8", newline="")
+
+
+def detectar_formato(ruta):
+    """'csv' o 'jsonl' según la extensión del archivo (ignorando .gz)."""
+    base = ruta[:-3] if ruta.endswith(".gz") else ruta
+    if base.endswith(".csv"):
+        return "csv"
+    if base.endswith((".jsonl", ".json", ".ndjson")):
+        return "jsonl"
+    raise ValueError(f"No se reconoce el formato de {ruta}; use .csv o .jsonl")
+
+
+def _campo(clave):
+    return _CAMPOS.get(normalizar(str(clave)).strip())
+
+
+def leer_csv(archivo):
+    """Genera (número de línea, fila) con las columnas ya traducidas a los campos estándar."""
+    lector = csv.reader(archivo)
+    encabezado = next(lector, None)
+    if encabezado is None:
+        return
+    campos = [_campo(columna) for columna in encabezado]
+    for fila in lector:
+        if not fila:
+            continue
+        yield lector.line_num, {campo: valor for campo, valor in zip(campos, fila) if campo}
+
+
+def leer_jsonl(archivo):
+    """Genera (número de línea, fila) por cada objeto JSON; las líneas inválidas dan fila None."""
+    for numero, linea in enumerate(archivo, 1):
+        if not linea.strip():
+            continue
+        try:
+            objeto = json.loads(linea)
+        except ValueError:
+            yield numero, None
+            continue
+        if not isinstance(objeto, dict):
+            yield numero, None
+            continue
+        yield numero, {_campo(clave): valor for clave, valor in objeto.items() if _campo(clave)}
+
+
+def _materias_desde_texto(texto):
+    materias = []
+    for parte in texto.split(";"):
+        parte = parte.strip()
+        if not parte:
+            continue
+        nombre, separador, creditos = parte.rpartition(":")
+        materias.append((nombre.strip(), creditos.strip()) if separador else parte)
+    return materias
+
+
+def _entero(valor):
+    """Créditos como int, o None si no son un número entero (se rechazan 3.9 y True)."""
+    if isinstance(valor, bool):
+        return None
+    if isinstance(valor, int):
+        return valor
+    if isinstance(valor, float):
+        return int(valor) if valor.is_integer() else None
+    if isinstance(valor, str):
+        try:
+            return int(valor)
+        except ValueError:
+            return None
+    return None
+
+
+def validar_fila(fila, esquema):
+    """Convierte una fila en un estudiante del esquema. Devuelve (estudiante, None) o (None, motivo)."""
+    if fila is None:
+        return None, "línea mal formada"
+    nombre = str(fila.get("nombre") or "").strip()
+    if not nombre:
+        return None, "nombre vacío"
+    carne = str(fila.get("carne") or "").strip()
+    if not esquema.validar_carne(carne):
+        return None, f"carné con formato inválido: {carne!r}"
+    promedio = fila.get("promedio")
+    if isinstance(promedio, bool):  # En JSON, true no es un promedio de 1.0
+        return None, "promedio no numérico"
+    try:
+        promedio = float(promedio)
+    except (TypeError, ValueError):
+        return None, "promedio no numérico"
+    if not 0.0 <= promedio <= 10.0:
+        return None, "promedio fuera de 0.0-10.0"
+
+    materias_crudas = fila.get("materias") or []
+    if isinstance(materias_crudas, str):
+        materias_crudas = _materias_desde_texto(materias_crudas)
+    elif not isinstance(materias_crudas, (list, tuple)):
+        return None, f"materias inválidas: {materias_crudas!r}"
+    materias = []
+    for materia in materias_crudas:
+        if isinstance(materia, str):
+            if esquema.materias_con_creditos:
+                return None, f"materia sin créditos: {materia!r}"
+            materias.append(materia)
+            continue
+        try:
+            nombre_materia, creditos = materia
+        except (TypeError, ValueError):
+            return None, f"materia inválida: {materia!r}"
+        creditos = _entero(creditos)
+        if creditos is None:
+            return None, f"créditos no enteros en {nombre_materia!r}"
+        if creditos <= 0:
+            return None, f"créditos no positivos en {nombre_materia!r}"
+        if creditos >= SIN_CREDITOS:
+            return None, f"créditos fuera de rango en {nombre_materia!r}"
+        materias.append((str(nombre_materia), creditos) if esquema.materias_con_creditos
+                        else str(nombre_materia))
+
+    return {esquema.nombre: nombre, esquema.carne: carne,
+            esquema.materias: materias, esquema.promedio: promedio}, None
+
+
+class _Rechazos:
+    """Escritor de filas rechazadas (o contador si no hay archivo)."""
+
+    def __init__(self, ruta):
+        self.cantidad = 0
+        self._archivo = abrir_texto(ruta, "w") if ruta else None
+
+    def anotar(self, numero, motivo, fila):
+        self.cantidad += 1
+        if self._archivo is not None:
+            self._archivo.write(json.dumps({"linea": numero, "motivo": motivo, "fila": fila},
+                                           ensure_ascii=False, default=str) + "\n")
+
+    def cerrar(self):
+        if self._archivo is not None:
+            self._archivo.close()
+
+
+def importar_filas(filas, almacen, rechazos=None, tamanio_lote=TAMANIO_LOTE, contexto_lote=None):
+    """Valida e inserta un flujo de (número, fila) en el almacén por lotes.
+
+    `rechazos` es cualquier objeto con anotar(numero, motivo, fila). Si se pasa contexto_lote
+    (p. ej. GestorEstudiantes.lote), cada lote se agrega dentro de `with contexto_lote():`; la
+    lectura y la validación quedan fuera. Devuelve ResultadoImportacion.
+    """
+    esquema = almacen.esquema
+    aceptados = 0
+    rechazados = 0
+    lote = {}  # carné -> (número, estudiante, fila)
+
+    def volcar():
+        if not lote:
+            return
+        if contexto_lote is None:
+            agregar_lote()
+            return
+        with contexto_lote():
+            agregar_lote()
+
+    def agregar_lote():
+        nonlocal aceptados, rechazados
+        existentes = lote.keys() & almacen.set_carnes
+        for carne, (numero, estudiante, fila) in lote.items():
+            if carne in existentes:
+                rechazados += 1
+                if rechazos is not None:
+                    rechazos.anotar(numero, "carné ya registrado", fila)
+                continue
+            try:
+                almacen.agregar(estudiante)
+            except ValueError as error:  # Lo que el almacén rechaza no detiene la importación
+                rechazados += 1
+                if rechazos is not None:
+                    rechazos.anotar(numero, str(error), fila)
+                continue
+            aceptados += 1
+        lote.clear()
+
+    for numero, fila in filas:
+        estudiante, motivo = validar_fila(fila, esquema)
+        if estudiante is not None and estudiante[esquema.carne] in lote:
+            motivo = "carné repetido en el archivo"
+        if motivo is not None:
+            rechazados += 1
+            if rechazos is not None:
+                rechazos.anotar(numero, motivo, fila)
+            continue
+        lote[estudiante[esquema.carne]] = (numero, estudiante, fila)
+        if len(lote) >= tamanio_lote:
+            volcar()
+    volcar()
+    return ResultadoImportacion(aceptados, rechazados)
+
+
+def _hasta_detener(filas, detener):
+    for fila in filas:
+        if detener.is_set():
+            return
+        yield fila
+
+
+def importar_archivo(ruta, almacen, ruta_rechazos=None, formato=None, tamanio_lote=TAMANIO_LOTE,
+                     detener=None, contexto_lote=None):
+    """Importa un archivo CSV o JSONL (opcionalmente .gz) al almacén.
+
+    `detener` es opcional (p. ej. un threading.Event): si se activa, la lectura termina en la
+    fila siguiente y se agrega lo ya validado. contexto_lote: ver importar_filas.
+    Devuelve ResultadoImportacion(aceptados, rechazados).
+    """
+    formato = formato or detectar_formato(ruta)
+    lector = {"csv": leer_csv, "jsonl": leer_jsonl}.get(formato)
+    if lector is None:
+        raise ValueError(f"Formato no soportado: {formato}")
+    rechazos = _Rechazos(ruta_rechazos)
+    try:
+        with abrir_texto(ruta) as archivo:
+            filas = lector(archivo)
+            if detener is not None:
+                filas = _hasta_detener(filas, detener)
+            return importar_filas(filas, almacen, rechazos, tamanio_lote, contexto_lote)
+    finally:
+        rechazos.cerrar()
@@ -0,0 +1,368 @@
+"""
+Índices secundarios del almacén de estudiantes.
+
+Cada índice implementa la misma interfaz mínima, que el almacén invoca en cada cambio:
+- indexar(estudiante): registrar un estudiante recién agregado.
+- desindexar(estudiante): olvidar un estudiante eliminado.
+- limpiar(): vaciar el índice.
+"""
+
+import itertools
+import unicodedata
+from bisect import bisect_left, bisect_right
+
+# Longitud de los n-gramas del índice de nombres
+N_GRAMA = 3
+
+
+def normalizar(texto):
+    """Convierte a minúsculas y quita los acentos ('María' -> 'maria')."""
+    if texto.isascii():
+        return texto.lower()
+    descompuesto = unicodedata.normalize("NFD", texto.lower())
+    return "".join(c for c in descompuesto if not unicodedata.combining(c))
+
+
+def trigramas(texto):
+    """Conjunto de trigramas de un texto ya normalizado."""
+    return {texto[i:i + N_GRAMA] for i in range(len(texto) - N_GRAMA + 1)}
+
+
+class IndicePromedio:
+    """Estudiantes ordenados por promedio, mantenidos con bisect.
+
+    Las claves son tuplas (promedio, secuencia): la secuencia desempata promedios iguales
+    por orden de inserción y hace que cada clave sea única, así eliminar localiza la
+    posición exacta con una búsqueda binaria.
+
+    Una sola lista ordenada obligaría a desplazar la mitad de los elementos en cada inserción
+    (O(n) por alta). Por eso las claves se reparten en bloques ordenados de a lo sumo
+    2 * TAMANIO_BLOQUE elementos: se busca el bloque con bisect sobre el máximo de cada bloque
+    y solo se desplaza dentro de él.
+
+    Las consultas por umbral, rango, mejores N y peores N cuestan O(log n + k).
+    """
+
+    TAMANIO_BLOQUE = 512
+
+    def __init__(self, esquema):
+        self.esquema = esquema
+        self._secuencia = itertools.count()
+        self.limpiar()
+
+    def __len__(self):
+        return self._cantidad
+
+    def limpiar(self):
+        self._claves = []       # Bloques de claves (promedio, secuencia) en orden ascendente
+        self._estudiantes = []  # Bloques paralelos: estudiante en la misma posición que su clave
+        self._maximos = []      # Última clave de cada bloque
+        self._clave_por_carne = {}
+        self._cantidad = 0
+
+    def indexar(self, estudiante):
+        clave = (estudiante[self.esquema.promedio], next(self._secuencia))
+        self._clave_por_carne[estudiante[self.esquema.carne]] = clave
+        self._cantidad += 1
+        if not self._claves:
+            self._claves.append([clave])
+            self._estudiantes.append([estudiante])
+            self._maximos.append(clave)
+            return
+        bloque = min(bisect_left(self._maximos, clave), len(self._maximos) - 1)
+        claves = self._claves[bloque]
+        posicion = bisect_right(claves, clave)
+        claves.insert(posicion, clave)
+        self._estudiantes[bloque].insert(posicion, estudiante)
+        self._maximos[bloque] = claves[-1]
+        if len(claves) > 2 * self.TAMANIO_BLOQUE:
+            self._dividir(bloque)
+
+    def _dividir(self, bloque):
+        claves = self._claves[bloque]
+        estudiantes = self._estudiantes[bloque]
+        mitad = len(claves) // 2
+        self._claves[bloque + 1:bloque + 1] = [claves[mitad:]]
+        self._estudiantes[bloque + 1:bloque + 1] = [estudiantes[mitad:]]
+        del claves[mitad:]
+        del estudiantes[mitad:]
+        self._maximos[bloque:bloque + 1] = [claves[-1], self._claves[bloque + 1][-1]]
+
+    def desindexar(self, estudiante):
+        clave = self._clave_por_carne.pop(estudiante[self.esquema.carne])
+        bloque = bisect_left(self._maximos, clave)
+        claves = self._claves[bloque]
+        posicion = bisect_left(claves, clave)
+        del claves[posicion]
+        del self._estudiantes[bloque][posicion]
+        self._cantidad -= 1
+        if claves:
+            self._maximos[bloque] = claves[-1]
+        else:
+            del self._claves[bloque]
+            del self._estudiantes[bloque]
+            del self._maximos[bloque]
+
+    def _ubicar(self, clave, buscar):
+        """(bloque, posición) de la primera clave según buscar (bisect_left o bisect_right)."""
+        bloque = buscar(self._maximos, clave)
+        if bloque == len(self._maximos):
+            return bloque, 0
+        return bloque, buscar(self._claves[bloque], clave)
+
+    def _tramo(self, desde, hasta):
+        """Estudiantes entre dos ubicaciones (bloque, posición), en orden ascendente."""
+        (bloque_inicio, posicion_inicio), (bloque_fin, posicion_fin) = desde, hasta
+        if bloque_inicio == bloque_fin:
+            if bloque_inicio == len(self._estudiantes):
+                return []
+            return self._estudiantes[bloque_inicio][posicion_inicio:posicion_fin]
+        resultado = self._estudiantes[bloque_inicio][posicion_inicio:]
+        for bloque in range(bloque_inicio + 1, bloque_fin):
+            resultado.extend(self._estudiantes[bloque])
+        if bloque_fin < len(self._estudiantes):
+            resultado.extend(self._estudiantes[bloque_fin][:posicion_fin])
+        return resultado
+
+    def superiores_a(self, umbral):
+        """Estudiantes con promedio > umbral, de mayor a menor promedio."""
+        desde = self._ubicar((umbral, float("inf")), bisect_right)
+        return self._tramo(desde, (len(self._estudiantes), 0))[::-1]
+
+    def en_rango(self, minimo, maximo):
+        """Estudiantes con minimo <= promedio < maximo, de menor a mayor promedio."""
+        if minimo >= maximo:
+            return []
+        return self._tramo(self._ubicar((minimo, -1), bisect_left),
+                           self._ubicar((maximo, -1), bisect_left))
+
+    def _limites(self, minimo, maximo, incluir_minimo, incluir_maximo):
+        """Ubicaciones (desde, hasta) del tramo entre los límites (None = sin límite)."""
+        if minimo is None:
+            desde = (0, 0)
+        elif incluir_minimo:
+            desde = self._ubicar((minimo, -1), bisect_left)
+        else:
+            desde = self._ubicar((minimo, float("inf")), bisect_right)
+        if maximo is None:
+            hasta = (len(self._claves), 0)
+        elif incluir_maximo:
+            hasta = self._ubicar((maximo, float("inf")), bisect_right)
+        else:
+            hasta = self._ubicar((maximo, -1), bisect_left)
+        return desde, max(desde, hasta)  # Límites contradictorios dan un tramo vacío
+
+    def contar(self, minimo=None, maximo=None, incluir_minimo=True, incluir_maximo=True):
+        """Cantidad de estudiantes con promedio entre los límites. O(log n + bloques del tramo)."""
+        (bloque_inicio, posicion_inicio), (bloque_fin, posicion_fin) = self._limites(
+            minimo, maximo, incluir_minimo, incluir_maximo)
+        if bloque_inicio == bloque_fin:
+            return posicion_fin - posicion_inicio
+        cantidad = len(self._claves[bloque_inicio]) - posicion_inicio + posicion_fin
+        for bloque in range(bloque_inicio + 1, bloque_fin):
+            cantidad += len(self._claves[bloque])
+        return cantidad
+
+    def clave(self, carne):
+        """Clave (promedio, secuencia) del estudiante en el índice; sirve como despues_de de recorrer."""
+        return self._clave_por_carne[carne]
+
+    def recorrer(self, minimo=None, maximo=None, incluir_minimo=True, incluir_maximo=True, descendente=False,
+                 despues_de=None):
+        """Genera los estudiantes con promedio entre los límites, ordenados por promedio.
+
+        Copia un bloque a la vez, así quien deja de pedir estudiantes no paga el tramo completo.
+        Con despues_de (una clave obtenida de clave()) el recorrido continúa justo después de esa
+        clave en el sentido del recorrido, aunque el estudiante ya no esté en el índice.
+        """
+        desde, hasta = self._limites(minimo, maximo, incluir_minimo, incluir_maximo)
+        if despues_de is not None:
+            if descendente:
+                hasta = max(desde, min(hasta, self._ubicar(despues_de, bisect_left)))
+            else:
+                desde = min(hasta, max(desde, self._ubicar(despues_de, bisect_right)))
+        (bloque_inicio, posicion_inicio), (bloque_fin, posicion_fin) = desde, hasta
+        bloques = range(bloque_inicio, min(bloque_fin + 1, len(self._estudiantes)))
+        if descendente:
+            bloques = reversed(bloques)
+        for bloque in bloques:
+            inicio = posicion_inicio if bloque == bloque_inicio else 0
+            fin = posicion_fin if bloque == bloque_fin else len(self._estudiantes[bloque])
+            tramo = self._estudiantes[bloque][inicio:fin]
+            yield from reversed(tramo) if descendente else tramo
+
+    def mejores(self, n):
+        """Los n estudiantes con mayor promedio, de mayor a menor."""
+        resultado = []
+        for estudiantes in reversed(self._estudiantes):
+            if len(resultado) >= n:
+                break
+            resultado.extend(reversed(estudiantes))
+        return resultado[:max(n, 0)]
+
+    def peores(self, n):
+        """Los n estudiantes con menor promedio, de menor a mayor."""
+        resultado = []
+        for estudiantes in self._estudiantes:
+            if len(resultado) >= n:
+                break
+            resultado.extend(estudiantes)
+        return resultado[:max(n, 0)]
+
+
+class IndiceNombres:
+    """Índice invertido trigrama -> carnés sobre los nombres normalizados.
+
+    Para un término de búsqueda se intersectan los conjuntos de sus trigramas, empezando por el
+    más pequeño. El resultado es un conjunto de candidatos: como normalizar() quita acentos,
+    puede incluir nombres que no contienen el término literal, por lo que quien consulta debe
+    verificar cada candidato con la comparación original (término en minúsculas dentro del nombre).
+    """
+
+    def __init__(self, esquema):
+        self.esquema = esquema
+        self._carnes_por_trigrama = {}
+
+    def __len__(self):
+        return len(self._carnes_por_trigrama)
+
+    def indexar(self, estudiante):
+        carne = estudiante[self.esquema.carne]
+        for trigrama in trigramas(normalizar(estudiante[self.esquema.nombre])):
+            self._carnes_por_trigrama.setdefault(trigrama, set()).add(carne)
+
+    def desindexar(self, estudiante):
+        carne = estudiante[self.esquema.carne]
+        for trigrama in trigramas(normalizar(estudiante[self.esquema.nombre])):
+            carnes = self._carnes_por_trigrama.get(trigrama)
+            if carnes is not None:
+                carnes.discard(carne)
+                if not carnes:
+                    del self._carnes_por_trigrama[trigrama]
+
+    def limpiar(self):
+        self._carnes_por_trigrama.clear()
+
+    def candidatos(self, termino):
+        """Carnés cuyo nombre podría contener el término, o None si es muy corto para el índice.
+
+        Con menos de N_GRAMA caracteres no hay trigramas que consultar; en ese caso la
+        mayoría del grupo suele coincidir y recorrer la lista es igual de eficiente.
+        """
+        claves = trigramas(normalizar(termino))
+        if not claves:
+            return None
+        conjuntos = []
+        for trigrama in claves:
+            carnes = self._carnes_por_trigrama.get(trigrama)
+            if not carnes:
+                return set()
+            conjuntos.append(carnes)
+        conjuntos.sort(key=len)
+        return conjuntos[0].intersection(*conjuntos[1:])
+
+
+def nombre_materia(materia):
+    """Nombre de una materia guardada como tupla (nombre, créditos) o como string."""
+    return materia if isinstance(materia, str) else materia[0]
+
+
+class IndiceMaterias:
+    """Índice invertido materia -> carnés de los estudiantes inscritos.
+
+    Las materias se identifican por su nombre normalizado (sin acentos ni mayúsculas), así que
+    "Bases de Datos I" y "bases de datos i" son la misma. Con un catálogo como el de
+    materias_disponibles_opciones ([(nombre, código), ...]) también se aceptan los códigos y
+    conteos() incluye las materias del catálogo que aún no tienen inscritos.
+
+    inscritos y cantidad cuestan O(k) y O(1); las intersecciones empiezan por el conjunto
+    más pequeño.
+    """
+
+    def __init__(self, esquema, catalogo=None):
+        self.esquema = esquema
+        self._carnes_por_materia = {}  # clave normalizada -> carnés
+        self._nombres = {}             # clave normalizada -> nombre tal como se muestra
+        self._codigos = {}             # código del catálogo -> clave normalizada
+        self._clave_por_nombre = {}    # nombre como viene en el registro -> clave (evita normalizar cada vez)
+        if catalogo is not None:
+            self.usar_catalogo(catalogo)
+
+    def __len__(self):
+        return len(self._carnes_por_materia)
+
+    def usar_catalogo(self, catalogo):
+        """Registra los nombres (y códigos) de un catálogo de materias: strings o tuplas (nombre, código)."""
+        for entrada in catalogo:
+            nombre, codigo = (entrada, None) if isinstance(entrada, str) else entrada[:2]
+            clave = normalizar(nombre.strip())
+            self._nombres.setdefault(clave, nombre)
+            if codigo is not None:
+                self._codigos[normalizar(str(codigo))] = clave
+
+    def _clave(self, materia):
+        clave = normalizar(materia.strip())
+        return self._codigos.get(clave, clave)
+
+    def _claves_de(self, estudiante):
+        claves = set()
+        for materia in estudiante[self.esquema.materias]:
+            nombre = nombre_materia(materia)
+            clave = self._clave_por_nombre.get(nombre)
+            if clave is None:
+                clave = self._clave_por_nombre[nombre] = normalizar(nombre.strip())
+                self._nombres.setdefault(clave, nombre.strip())
+            claves.add(clave)
+        return claves
+
+    def indexar(self, estudiante):
+        carne = estudiante[self.esquema.carne]
+        for clave in self._claves_de(estudiante):
+            carnes = self._carnes_por_materia.get(clave)
+            if carnes is None:
+                carnes = self._carnes_por_materia[clave] = set()
+            carnes.add(carne)
+
+    def desindexar(self, estudiante):
+        carne = estudiante[self.esquema.carne]
+        for clave in self._claves_de(estudiante):
+            carnes = self._carnes_por_materia.get(clave)
+            if carnes is not None:
+                carnes.discard(carne)
+                if not carnes:
+                    del self._carnes_por_materia[clave]
+
+    def limpiar(self):
+        self._carnes_por_materia.clear()
+
+    # --- Consultas ---
+
+    def inscritos(self, materia):
+        """Carnés inscritos en la materia (nombre o código), como conjunto nuevo."""
+        return set(self._carnes_por_materia.get(self._clave(materia), ()))
+
+    def cantidad(self, materia):
+        """Cantidad de inscritos en la materia. O(1)."""
+        return len(self._carnes_por_materia.get(self._clave(materia), ()))
+
+    def contiene(self, materia, carne):
+        """True si el carné está inscrito en la materia. O(1)."""
+        return carne in self._carnes_por_materia.get(self._clave(materia), ())
+
+    def conteos(self):
+        """Diccionario nombre de materia -> inscritos, de mayor a menor (con el catálogo, también los ceros)."""
+        conteos = {self._nombres[clave]: 0 for clave in self._codigos.values()}
+        conteos.update((self._nombres[clave], len(carnes)) for clave, carnes in self._carnes_por_materia.items())
+        return dict(sorted(conteos.items(), key=lambda par: -par[1]))
+
+    def en_todas(self, materias):
+        """Carnés inscritos en todas las materias dadas."""
+        conjuntos = [self._carnes_por_materia.get(self._clave(materia), set()) for materia in materias]
+        if not conjuntos:
+            return set()
+        conjuntos.sort(key=len)
+        return conjuntos[0].intersection(*conjuntos[1:])
+
+    def en_alguna(self, materias):
+        """Carnés inscritos en al menos una de las materias dadas."""
+        return set().union(*(self._carnes_por_materia.get(self._clave(materia), ()) for materia in materias))
@@ -0,0 +1,206 @@
+"""
+Modo por lotes: ejecuta operaciones descritas en JSON sin pasar por los menús interactivos.
+
+Cada operación es un objeto con la clave "op" y sus parámetros; en archivo o en la entrada
+estándar va un objeto por línea (JSONL):
+
+    {"op": "agregar", "nombre": "Ana Pérez", "carne": "0905-24-0001", "materias": [["Cálculo I", 4]], "promedio": 8.5}
+    {"op": "inscribir", "nombre": "Luis Gómez", "anio": 24, "materias": ["Cálculo I"], "promedio": 7.0}
+    {"op": "eliminar", "carne": "0905-24-0001"}
+    {"op": "obtener", "carne": "0905-24-0002"}
+    {"op": "buscar", "termino": "pérez", "limite": 10}
+    {"op": "superiores", "umbral": 8.0, "limite": 10}
+    {"op": "promedio"}
+    {"op": "inscritos", "materia": "Cálculo I"}
+    {"op": "inscritos", "materias": ["Cálculo I", "Física General"], "modo": "todas"}
+    {"op": "materias"}
+    {"op": "consulta", "donde": {"promedio__gt": 8, "cohorte": 23}, "orden": "-promedio", "limite": 50}
+
+"agregar" acepta los mismos campos y formatos que la importación (importacion.validar_fila);
+"inscribir" genera el carné del año YY; "inscritos" con varias materias usa "modo" "todas"
+(intersección, por omisión) o "alguna" (unión), y "materias" da los inscritos por materia.
+"consulta" ejecuta una consultas.Consulta con las condiciones de "donde" (campo__operador).
+Por cada operación se produce un resultado {"linea", "op", "ok", "resultado"} o
+{"linea", "op", "ok": false, "error"}; un error no detiene el resto del lote.
+
+Las operaciones se ejecutan en lotes de tamanio_lote dentro de GestorEstudiantes.lote(): la
+bitácora se sincroniza con el disco una vez por lote, y los resultados de un lote se entregan
+después de esa sincronización, así un alta informada como correcta ya está guardada.
+"""
+
+import json
+from collections import namedtuple
+
+from .importacion import validar_fila
+
+TAMANIO_LOTE = 1000
+
+ResumenLote = namedtuple("ResumenLote", ["operaciones", "fallidas"])
+
+
+def _como_dict(estudiante, esquema):
+    """Estudiante con las claves genéricas de la exportación JSONL."""
+    return {
+        "nombre": estudiante[esquema.nombre],
+        "carne": estudiante[esquema.carne],
+        "materias": estudiante[esquema.materias],
+        "promedio": estudiante[esquema.promedio],
+    }
+
+
+def _limitar(estudiantes, operacion):
+    limite = operacion.get("limite")
+    return estudiantes if limite is None else estudiantes[:int(limite)]
+
+
+def _validar(gestor, fila):
+    estudiante, motivo = validar_fila(fila, gestor.esquema)
+    if motivo is not None:
+        raise ValueError(motivo)
+    return estudiante
+
+
+def _agregar(gestor, operacion):
+    estudiante = _validar(gestor, operacion)
+    return _como_dict(gestor.agregar(estudiante), gestor.esquema)
+
+
+def _inscribir(gestor, operacion):
+    carne = gestor.generar_carne(int(operacion["anio"]))
+    try:
+        estudiante = _validar(gestor, dict(operacion, carne=carne))
+        return _como_dict(gestor.agregar(estudiante), gestor.esquema)
+    except Exception:
+        gestor.asignador.liberar(carne)  # El carné reservado no llegó al almacén
+        raise
+
+
+def _eliminar(gestor, operacion):
+    estudiante = gestor.eliminar(operacion["carne"])
+    if estudiante is None:
+        raise ValueError(f"Estudiante con carné {operacion['carne']} no encontrado.")
+    return _como_dict(estudiante, gestor.esquema)
+
+
+def _obtener(gestor, operacion):
+    estudiante = gestor.obtener(operacion["carne"])
+    if estudiante is None:
+        raise ValueError(f"Estudiante con carné {operacion['carne']} no encontrado.")
+    return _como_dict(estudiante, gestor.esquema)
+
+
+def _buscar(gestor, operacion):
+    estudiantes = gestor.buscar(str(operacion["termino"]), incluir_carne=True)
+    return [_como_dict(est, gestor.esquema) for est in _limitar(estudiantes, operacion)]
+
+
+def _superiores(gestor, operacion):
+    consulta = gestor.consulta().donde(promedio__gt=float(operacion["umbral"])).ordenar_por("-promedio")
+    if operacion.get("limite") is not None:
+        consulta = consulta.limitar(int(operacion["limite"]))  # Corta el recorrido del índice
+    return [_como_dict(est, gestor.esquema) for est in gestor.consultar(consulta)]
+
+
+def _promedio(gestor, operacion):
+    return {"promedio": gestor.promedio_general(), "estudiantes": len(gestor)}
+
+
+def _inscritos(gestor, operacion):
+    if "materias" not in operacion:
+        estudiantes = gestor.inscritos(str(operacion["materia"]))
+    elif operacion.get("modo", "todas") == "todas":
+        estudiantes = gestor.inscritos_en_todas(operacion["materias"])
+    elif operacion["modo"] == "alguna":
+        estudiantes = gestor.inscritos_en_alguna(operacion["materias"])
+    else:
+        raise ValueError(f"modo desconocido: {operacion['modo']!r}")
+    return [_como_dict(est, gestor.esquema) for est in _limitar(estudiantes, operacion)]
+
+
+def _materias(gestor, operacion):
+    return gestor.cantidad_por_materia()
+
+
+def _consulta(gestor, operacion):
+    consulta = gestor.consulta().donde(**operacion.get("donde", {}))
+    if "orden" in operacion:
+        consulta = consulta.ordenar_por(str(operacion["orden"]))
+    if operacion.get("limite") is not None:
+        consulta = consulta.limitar(int(operacion["limite"]))
+    return [_como_dict(est, gestor.esquema) for est in gestor.consultar(consulta)]
+
+
+OPERACIONES = {
+    "agregar": _agregar,
+    "inscribir": _inscribir,
+    "eliminar": _eliminar,
+    "obtener": _obtener,
+    "buscar": _buscar,
+    "superiores": _superiores,
+    "promedio": _promedio,
+    "inscritos": _inscritos,
+    "materias": _materias,
+    "consulta": _consulta,
+}
+
+
+def leer_operaciones(archivo):
+    """Genera (número de línea, operación) de un flujo JSONL; una línea ilegible da operación None."""
+    for numero, linea in enumerate(archivo, start=1):
+        linea = linea.strip()
+        if not linea:
+            continue
+        try:
+            objeto = json.loads(linea)
+        except ValueError:
+            objeto = None
+        yield numero, objeto if isinstance(objeto, dict) else None
+
+
+def _ejecutar(gestor, numero, operacion):
+    if operacion is None:
+        return {"linea": numero, "op": None, "ok": False, "error": "línea mal formada"}
+    nombre = operacion.get("op")
+    funcion = OPERACIONES.get(nombre)
+    if funcion is None:
+        return {"linea": numero, "op": nombre, "ok": False, "error": f"operación desconocida: {nombre!r}"}
+    try:
+        return {"linea": numero, "op": nombre, "ok": True, "resultado": funcion(gestor, operacion)}
+    except KeyError as error:
+        return {"linea": numero, "op": nombre, "ok": False, "error": f"falta el campo {error}"}
+    except (ValueError, TypeError, OverflowError) as error:  # int(1e400) y CarnesAgotadosError
+        return {"linea": numero, "op": nombre, "ok": False, "error": str(error)}
+
+
+def ejecutar_operaciones(gestor, operaciones, tamanio_lote=TAMANIO_LOTE):
+    """Ejecuta un flujo de (número, operación) y genera un resultado por operación, en orden."""
+    lote = []
+    for elemento in operaciones:
+        lote.append(elemento)
+        if len(lote) >= tamanio_lote:
+            yield from _ejecutar_lote(gestor, lote)
+            lote = []
+    if lote:
+        yield from _ejecutar_lote(gestor, lote)
+
+
+def _ejecutar_lote(gestor, lote):
+    with gestor.lote():
+        resultados = [_ejecutar(gestor, numero, operacion) for numero, operacion in lote]
+    return resultados  # Se entregan ya sincronizados con el disco
+
+
+def ejecutar_archivo(gestor, entrada, salida, tamanio_lote=TAMANIO_LOTE):
+    """Lee operaciones JSONL de `entrada` y escribe un resultado JSONL por línea en `salida`.
+
+    Devuelve ResumenLote(operaciones, fallidas).
+    """
+    codificar = json.JSONEncoder(ensure_ascii=False).encode
+    operaciones = fallidas = 0
+    for resultado in ejecutar_operaciones(gestor, leer_operaciones(entrada), tamanio_lote):
+        operaciones += 1
+        fallidas += not resultado["ok"]
+        salida.write(codificar(resultado))
+        salida.write("\n")
+    salida.flush()
+    return ResumenLote(operaciones, fallidas)
@@ -0,0 +1,173 @@
+"""
+Consultas en paralelo con varios procesos sobre una instantánea columnar.
+
+Los índices del almacén resuelven las consultas interactivas sin recorrer el grupo; este módulo
+es para los recorridos completos sobre grupos muy grandes (millones de estudiantes), que en un
+solo proceso usan un solo núcleo: promedio superior a un umbral, búsqueda por nombre y agregados.
+
+El grupo se escribe una vez como instantánea columnar (columnar.py). Cada proceso del pool la
+abre con mmap al iniciar, de modo que todos leen las mismas páginas de memoria compartida (la
+caché de archivos del sistema) y a cada consulta solo viajan los límites de cada fragmento y el
+parámetro, nunca los datos. Cada proceso recorre su fragmento y devuelve posiciones o sumas
+parciales; el proceso principal combina los resultados y arma los registros pedidos.
+
+La instantánea es una foto del grupo: los cambios posteriores del almacén no se ven hasta
+llamar a refrescar(almacen).
+"""
+
+import bisect
+import math
+import multiprocessing
+import os
+
+from .columnar import InstantaneaColumnar, escribir_instantanea_columnar
+from .esquema import ESQUEMA_CLI
+
+# Fragmentos por proceso: más de uno reparte mejor la carga si algún fragmento es más lento
+FRAGMENTOS_POR_PROCESO = 4
+
+# Instantánea abierta en cada proceso del pool (la asigna _iniciar_proceso)
+_instantanea = None
+
+
+def _iniciar_proceso(ruta):
+    global _instantanea
+    _instantanea = InstantaneaColumnar(ruta)
+
+
+def _superiores_fragmento(inicio, fin, umbral):
+    """(promedio, posición) de los estudiantes del fragmento con promedio > umbral."""
+    promedios = _instantanea.promedios
+    return [(promedios[i], i) for i in range(inicio, fin) if promedios[i] > umbral]
+
+
+def _buscar_fragmento(inicio, fin, termino_lower):
+    """Posiciones del fragmento cuyo nombre contiene el término (sin distinguir mayúsculas)."""
+    desplazamientos = _instantanea._nombres_desplazamientos
+    base = desplazamientos[inicio]
+    # Se copia el tramo de nombres del fragmento una vez y se decodifica cada nombre desde ahí
+    nombres = bytes(_instantanea._nombres_blob[base:desplazamientos[fin]])
+    posiciones = []
+    anterior = 0
+    for i in range(inicio, fin):
+        siguiente = desplazamientos[i + 1] - base
+        if termino_lower in nombres[anterior:siguiente].decode("utf-8").lower():
+            posiciones.append(i)
+        anterior = siguiente
+    return posiciones
+
+
+def _agregados_fragmento(inicio, fin):
+    """(cantidad, suma, mínimo, máximo) de los promedios del fragmento."""
+    promedios = _instantanea.promedios[inicio:fin]
+    if not len(promedios):
+        return 0, 0.0, None, None
+    return len(promedios), math.fsum(promedios), min(promedios), max(promedios)
+
+
+class ConsultasParalelas:
+    """Pool de procesos que consulta en paralelo una instantánea columnar.
+
+        with ConsultasParalelas.desde_almacen(almacen, "grupo.col", procesos=8) as consultas:
+            consultas.superiores_a(9.5)
+
+    procesos: cantidad de procesos (por omisión, os.cpu_count()).
+    """
+
+    def __init__(self, ruta, esquema=ESQUEMA_CLI, procesos=None):
+        self.ruta = ruta
+        self.esquema = esquema
+        self.procesos = procesos or os.cpu_count() or 1
+        self._instantanea = None
+        self._pool = None
+        self._abrir()
+
+    @classmethod
+    def desde_almacen(cls, almacen, ruta, procesos=None):
+        """Escribe el almacén como instantánea columnar en `ruta` y abre el pool sobre ella."""
+        escribir_instantanea_columnar(ruta, almacen, almacen.esquema)
+        return cls(ruta, almacen.esquema, procesos)
+
+    def _abrir(self):
+        self._instantanea = InstantaneaColumnar(self.ruta)
+        self._pool = multiprocessing.Pool(self.procesos, initializer=_iniciar_proceso, initargs=(self.ruta,))
+        cantidad = len(self._instantanea)
+        partes = max(1, min(cantidad, self.procesos * FRAGMENTOS_POR_PROCESO))
+        limites = [cantidad * i // partes for i in range(partes + 1)]
+        self._fragmentos = list(zip(limites, limites[1:]))
+
+    def refrescar(self, almacen):
+        """Vuelve a escribir la instantánea con el estado actual del almacén y reinicia el pool."""
+        self.cerrar()
+        escribir_instantanea_columnar(self.ruta, almacen, self.esquema)
+        self._abrir()
+
+    def cerrar(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+        if self._instantanea is not None:
+            self._instantanea.cerrar()
+            self._instantanea = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def __len__(self):
+        return len(self._instantanea)
+
+    def _repartir(self, funcion, *argumentos):
+        """Ejecuta funcion(inicio, fin, *argumentos) en cada fragmento; resultados en orden de fragmento."""
+        return self._pool.starmap(funcion, [(inicio, fin, *argumentos) for inicio, fin in self._fragmentos])
+
+    # --- Consultas ---
+
+    def posiciones_superiores_a(self, umbral):
+        """Posiciones con promedio > umbral, de mayor a menor promedio.
+
+        Los empates quedan de la última posición a la primera, como en IndicePromedio.superiores_a.
+        """
+        pares = []
+        for parcial in self._repartir(_superiores_fragmento, umbral):
+            pares.extend(parcial)
+        pares.sort(reverse=True)
+        return [posicion for _, posicion in pares]
+
+    def superiores_a(self, umbral):
+        """Estudiantes con promedio > umbral, de mayor a menor, como en IndicePromedio.superiores_a."""
+        registro = self._instantanea.registro
+        return [registro(i, self.esquema) for i in self.posiciones_superiores_a(umbral)]
+
+    def buscar_por_nombre(self, termino, incluir_carne=False):
+        """Estudiantes cuyo nombre contiene el término, en el orden de la instantánea.
+
+        Con incluir_carne=True también se incluye al estudiante cuyo carné sea exactamente el término.
+        """
+        posiciones = []
+        for parcial in self._repartir(_buscar_fragmento, termino.lower()):
+            posiciones.extend(parcial)
+        if incluir_carne:
+            posicion = self._instantanea.posicion_de(termino)
+            if posicion is not None:
+                # posiciones ya está ordenada: se busca e inserta por bisección, sin recorrerla
+                indice = bisect.bisect_left(posiciones, posicion)
+                if indice == len(posiciones) or posiciones[indice] != posicion:
+                    posiciones.insert(indice, posicion)
+        registro = self._instantanea.registro
+        return [registro(i, self.esquema) for i in posiciones]
+
+    def estadisticas(self):
+        """(cantidad, promedio, mínimo, máximo) de los promedios; promedio y extremos None si no hay estudiantes."""
+        parciales = [parcial for parcial in self._repartir(_agregados_fragmento) if parcial[0]]
+        cantidad = sum(parcial[0] for parcial in parciales)
+        if not cantidad:
+            return 0, None, None, None
+        return (cantidad, math.fsum(parcial[1] for parcial in parciales) / cantidad,
+                min(parcial[2] for parcial in parciales), max(parcial[3] for parcial in parciales))
+
+    def promedio_general(self):
+        return self.estadisticas()[1]
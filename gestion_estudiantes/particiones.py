@@ -0,0 +1,220 @@
+"""
+Almacén particionado por cohorte (año YY del carné 0905-YY-...).
+
+Cada cohorte es un AlmacenEstudiantes propio, con sus índices (promedios, nombres, materias)
+y sus estadísticas. El carné dice a qué partición pertenece un estudiante, así que agregar,
+eliminar y obtener tocan una sola partición, y las consultas con `cohorte=` también. Las
+consultas de todo el grupo recorren las particiones y combinan los resultados.
+
+Con un directorio de datos, cada cohorte tiene su propia Persistencia (bitácora e instantánea)
+en directorio/cohorte_YY/. Al abrir solo se listan las cohortes guardadas; cada una se carga
+del disco la primera vez que se usa. descargar(anio) la guarda y la saca de memoria (se vuelve
+a cargar sola si se consulta), y eliminar_cohorte(anio) la descarta completa sin tocar a sus
+estudiantes uno por uno ni a las demás cohortes.
+
+No hay un orden de inserción global: la iteración va por cohorte y, dentro de cada una, en
+orden de inserción.
+"""
+
+import heapq
+import os
+import shutil
+
+from .almacen import AlmacenEstudiantes
+from .analitica import cohorte_de
+from .esquema import ESQUEMA_CLI
+from .persistencia import Persistencia
+
+PREFIJO_DIRECTORIO = "cohorte_"
+
+
+class AlmacenParticionado:
+    """Estudiantes repartidos en un AlmacenEstudiantes por año de cohorte.
+
+    directorio: carpeta de datos (None = solo en memoria). Con directorio hay que llamar a
+    abrir() antes de usarlo y a cerrar() al terminar.
+    """
+
+    def __init__(self, esquema=ESQUEMA_CLI, directorio=None, compacto=True):
+        self.esquema = esquema
+        self.directorio = directorio
+        self.compacto = compacto
+        self._particiones = {}    # año -> AlmacenEstudiantes cargado en memoria
+        self._persistencias = {}  # año -> Persistencia abierta de esa partición
+        self._en_disco = set()    # Años guardados que todavía no se cargaron
+
+    def __repr__(self):
+        return f"AlmacenParticionado({len(self._particiones)} cohortes cargadas, {len(self._en_disco)} en disco)"
+
+    # --- Ciclo de vida ---
+
+    def _ruta(self, anio):
+        return os.path.join(self.directorio, f"{PREFIJO_DIRECTORIO}{anio:02d}")
+
+    def abrir(self):
+        """Registra las cohortes guardadas sin cargarlas. Devuelve cuántas hay."""
+        if self.directorio is None:
+            return 0
+        os.makedirs(self.directorio, exist_ok=True)
+        for nombre in os.listdir(self.directorio):
+            sufijo = nombre[len(PREFIJO_DIRECTORIO):]
+            if nombre.startswith(PREFIJO_DIRECTORIO) and sufijo.isdigit():
+                anio = int(sufijo)
+                if anio not in self._particiones:
+                    self._en_disco.add(anio)
+        return len(self._en_disco) + len(self._particiones)
+
+    def cerrar(self):
+        """Cierra la persistencia de todas las cohortes cargadas (quedan en disco para la próxima vez)."""
+        if self.directorio is None:
+            return
+        for persistencia in self._persistencias.values():
+            persistencia.cerrar()
+        self._persistencias.clear()
+        self._en_disco.update(self._particiones)
+        self._particiones.clear()
+
+    # --- Particiones ---
+
+    def cohortes(self):
+        """Años de cohorte con datos (cargados o en disco), en orden."""
+        return sorted(self._particiones.keys() | self._en_disco)
+
+    def cargadas(self):
+        """Años de cohorte que están en memoria."""
+        return sorted(self._particiones)
+
+    def particion(self, anio, crear=False):
+        """AlmacenEstudiantes de la cohorte, cargándolo del disco si hace falta.
+
+        Devuelve None si la cohorte no existe y crear es False.
+        """
+        almacen = self._particiones.get(anio)
+        if almacen is not None:
+            return almacen
+        if anio not in self._en_disco and not crear:
+            return None
+        almacen = AlmacenEstudiantes(self.esquema, compacto=self.compacto)
+        if self.directorio is not None:
+            persistencia = Persistencia(self._ruta(anio))
+            persistencia.abrir(almacen)
+            self._persistencias[anio] = persistencia
+        self._en_disco.discard(anio)
+        self._particiones[anio] = almacen
+        return almacen
+
+    def _particion_de(self, carne, crear=False):
+        anio = cohorte_de(carne)
+        if anio < 0:
+            if crear:
+                raise ValueError(f"El carné {carne} no indica el año de cohorte.")
+            return None
+        return self.particion(anio, crear)
+
+    def _seleccion(self, cohorte):
+        """Particiones que toca una consulta: solo la de `cohorte`, o todas (cargando las del disco)."""
+        if cohorte is not None:
+            almacen = self.particion(cohorte)
+            return [] if almacen is None else [almacen]
+        return [self.particion(anio) for anio in self.cohortes()]
+
+    def descargar(self, anio):
+        """Guarda la cohorte en disco y la saca de memoria; se recarga al volver a usarla.
+
+        Sin directorio de datos no hay dónde guardarla y se lanza RuntimeError.
+        """
+        if self.directorio is None:
+            raise RuntimeError("Sin directorio de datos no se puede descargar una cohorte.")
+        if anio not in self._particiones:
+            return
+        persistencia = self._persistencias.pop(anio)
+        persistencia.crear_instantanea()  # Al recargar se lee la instantánea, sin reaplicar la bitácora
+        persistencia.cerrar()
+        del self._particiones[anio]
+        self._en_disco.add(anio)
+
+    def eliminar_cohorte(self, anio):
+        """Descarta la cohorte completa (en memoria y en disco). Devuelve True si existía.
+
+        No recorre a los estudiantes: se suelta la partición con sus índices y se borra su carpeta.
+        """
+        existia = anio in self._particiones or anio in self._en_disco
+        self._particiones.pop(anio, None)
+        self._en_disco.discard(anio)
+        persistencia = self._persistencias.pop(anio, None)
+        if persistencia is not None:
+            persistencia.cerrar()
+        if self.directorio is not None:
+            shutil.rmtree(self._ruta(anio), ignore_errors=True)
+        return existia
+
+    # --- Altas, bajas y consultas por carné ---
+
+    def agregar(self, estudiante):
+        """Agrega al estudiante en la partición de su cohorte y devuelve el registro guardado.
+
+        Lanza ValueError si el carné ya existe o no indica el año de cohorte.
+        """
+        return self._particion_de(estudiante[self.esquema.carne], crear=True).agregar(estudiante)
+
+    def eliminar(self, carne):
+        almacen = self._particion_de(carne)
+        return None if almacen is None else almacen.eliminar(carne)
+
+    def obtener(self, carne):
+        almacen = self._particion_de(carne)
+        return None if almacen is None else almacen.obtener(carne)
+
+    def __contains__(self, carne):
+        almacen = self._particion_de(carne)
+        return almacen is not None and carne in almacen
+
+    def __len__(self):
+        return sum(len(almacen) for almacen in self._seleccion(None))
+
+    def __iter__(self):
+        for almacen in self._seleccion(None):
+            yield from almacen
+
+    def cantidad(self, cohorte=None):
+        return sum(len(almacen) for almacen in self._seleccion(cohorte))
+
+    def limpiar(self):
+        """Elimina todas las cohortes."""
+        for anio in self.cohortes():
+            self.eliminar_cohorte(anio)
+
+    # --- Consultas (de una cohorte o de todo el grupo) ---
+
+    def buscar_por_nombre(self, termino, incluir_carne=False, cohorte=None):
+        resultados = []
+        for almacen in self._seleccion(cohorte):
+            resultados.extend(almacen.buscar_por_nombre(termino, incluir_carne))
+        return resultados
+
+    def superiores_a(self, umbral, cohorte=None):
+        """Estudiantes con promedio > umbral, de mayor a menor (mezcla ordenada de las particiones)."""
+        listas = [almacen.promedios.superiores_a(umbral) for almacen in self._seleccion(cohorte)]
+        if len(listas) == 1:
+            return listas[0]
+        clave_promedio = self.esquema.promedio
+        return list(heapq.merge(*listas, key=lambda est: est[clave_promedio], reverse=True))
+
+    def promedio(self, cohorte=None):
+        """Promedio general (o de la cohorte) a partir de las estadísticas de cada partición, o None."""
+        cantidad = suma = 0
+        for almacen in self._seleccion(cohorte):
+            cantidad += almacen.estadisticas.cantidad
+            suma += almacen.estadisticas.suma
+        return suma / cantidad if cantidad else None
+
+    def promedios_por_cohorte(self):
+        """Diccionario año -> promedio de la cohorte."""
+        return {anio: self.particion(anio).estadisticas.promedio() for anio in self.cohortes()}
+
+    def inscritos(self, materia, cohorte=None):
+        """Carnés inscritos en la materia, en la cohorte o en todo el grupo."""
+        carnes = set()
+        for almacen in self._seleccion(cohorte):
+            carnes |= almacen.materias.inscritos(materia)
+        return carnes
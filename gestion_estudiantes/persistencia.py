@@ -0,0 +1,245 @@
+"""
+Persistencia en disco del almacén de estudiantes (solo biblioteca estándar).
+
+Se usan dos archivos dentro de un directorio de datos:
+- registro.wal: bitácora de escritura anticipada (write-ahead log) de solo anexado. Cada
+  operación (agregar, eliminar, actualizar, limpiar) se escribe como un marco
+  [longitud (4 bytes) | crc32 (4 bytes) | pickle(número de secuencia, operación, dato)]
+  y se sincroniza con os.fsync antes de devolver el control, así una escritura confirmada
+  al usuario nunca se pierde.
+- instantanea.pkl: copia compactada de todo el almacén junto con el número de secuencia de
+  la última operación incluida. Se escribe en un archivo temporal y se reemplaza de forma
+  atómica; después se vacía la bitácora. (El formato columnar de columnar.py no se usa aquí:
+  ver su docstring.)
+
+Al arrancar se carga la instantánea y se reaplican solo las operaciones de la bitácora con
+número de secuencia mayor. Un marco incompleto o corrupto al final (caída a mitad de una
+escritura) se descarta y se trunca.
+
+Dentro de `with persistencia.lote():` las operaciones se escriben en la bitácora sin sincronizar
+cada una; el os.fsync se hace una sola vez al salir del bloque (confirmación en grupo). Así una
+carga de miles de operaciones paga un fsync por lote y no uno por operación.
+"""
+
+import os
+import pickle
+import struct
+import zlib
+from contextlib import contextmanager
+
+ARCHIVO_BITACORA = "registro.wal"
+ARCHIVO_INSTANTANEA = "instantanea.pkl"
+
+VERSION_INSTANTANEA = 1
+
+# Longitud del contenido y su crc32
+_CABECERA = struct.Struct("<II")
+
+OP_AGREGAR = "agregar"
+OP_ELIMINAR = "eliminar"
+OP_LIMPIAR = "limpiar"
+OP_ACTUALIZAR = "actualizar"
+
+
+def _sincronizar_directorio(directorio):
+    """Asegura que el renombrado de archivos dentro del directorio llegue al disco."""
+    try:
+        fd = os.open(directorio, os.O_RDONLY)
+    except OSError:
+        return  # Algunos sistemas (Windows) no permiten abrir directorios
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class Persistencia:
+    """Bitácora de escritura anticipada con instantáneas periódicas para un AlmacenEstudiantes.
+
+    Uso:
+        persistencia = Persistencia("datos")
+        hay_datos = persistencia.abrir(almacen)  # Carga lo guardado y empieza a registrar cambios
+
+    Una vez abierta, se registra como índice del almacén: cada agregar/eliminar/limpiar del
+    almacén queda escrito en la bitácora sin cambiar el código que lo invoca.
+    """
+
+    def __init__(self, directorio, operaciones_por_instantanea=10000, sincronizar=True):
+        self.directorio = directorio
+        self.operaciones_por_instantanea = operaciones_por_instantanea
+        self.sincronizar = sincronizar
+        self.almacen = None
+        self._bitacora = None
+        self._secuencia = 0          # Número de secuencia de la última operación escrita
+        self._operaciones_pendientes = 0  # Operaciones en la bitácora desde la última instantánea
+        self._lotes_abiertos = 0     # Mientras sea > 0 no se sincroniza cada operación
+
+    @property
+    def ruta_bitacora(self):
+        return os.path.join(self.directorio, ARCHIVO_BITACORA)
+
+    @property
+    def ruta_instantanea(self):
+        return os.path.join(self.directorio, ARCHIVO_INSTANTANEA)
+
+    # --- Arranque y recuperación ---
+
+    def abrir(self, almacen):
+        """Carga instantánea + bitácora en el almacén y empieza a registrar sus cambios.
+
+        Devuelve True si había datos guardados (aunque el almacén haya quedado vacío).
+        """
+        if self.almacen is not None:
+            raise RuntimeError("La persistencia ya está abierta.")
+        os.makedirs(self.directorio, exist_ok=True)
+        hay_datos = self._cargar_instantanea(almacen)
+        hay_datos = self._reaplicar_bitacora(almacen) or hay_datos
+
+        self._bitacora = open(self.ruta_bitacora, "ab")
+        self.almacen = almacen
+        almacen.registrar_indice(self, indexar_existentes=False)
+        return hay_datos
+
+    def _cargar_instantanea(self, almacen):
+        try:
+            with open(self.ruta_instantanea, "rb") as archivo:
+                datos = pickle.load(archivo)
+        except FileNotFoundError:
+            return False
+        if datos.get("version") != VERSION_INSTANTANEA:
+            raise ValueError(f"Versión de instantánea no soportada: {datos.get('version')}")
+        almacen.limpiar()
+        for estudiante in datos["estudiantes"]:
+            almacen.agregar(estudiante)
+        self._secuencia = datos["secuencia"]
+        return True
+
+    def _reaplicar_bitacora(self, almacen):
+        """Reaplica las operaciones posteriores a la instantánea y trunca una cola dañada."""
+        try:
+            archivo = open(self.ruta_bitacora, "r+b")
+        except FileNotFoundError:
+            return False
+        aplicadas = 0
+        with archivo:
+            valido_hasta = 0
+            for fin, (secuencia, operacion, dato) in self._leer_marcos(archivo):
+                valido_hasta = fin
+                if secuencia <= self._secuencia:
+                    continue  # Ya incluida en la instantánea
+                self._aplicar(almacen, operacion, dato)
+                self._secuencia = secuencia
+                aplicadas += 1
+            archivo.seek(0, os.SEEK_END)
+            if archivo.tell() != valido_hasta:
+                archivo.truncate(valido_hasta)
+                archivo.flush()
+                os.fsync(archivo.fileno())
+        self._operaciones_pendientes = aplicadas
+        return valido_hasta > 0
+
+    @staticmethod
+    def _leer_marcos(archivo):
+        """Genera (posición final, registro) por cada marco íntegro de la bitácora."""
+        while True:
+            cabecera = archivo.read(_CABECERA.size)
+            if len(cabecera) < _CABECERA.size:
+                return
+            longitud, crc = _CABECERA.unpack(cabecera)
+            contenido = archivo.read(longitud)
+            if len(contenido) < longitud or zlib.crc32(contenido) != crc:
+                return
+            yield archivo.tell(), pickle.loads(contenido)
+
+    @staticmethod
+    def _aplicar(almacen, operacion, dato):
+        if operacion == OP_AGREGAR:
+            almacen.agregar(dato)
+        elif operacion == OP_ELIMINAR:
+            almacen.eliminar(dato)
+        elif operacion == OP_ACTUALIZAR:
+            almacen.actualizar(dato)
+        elif operacion == OP_LIMPIAR:
+            almacen.limpiar()
+        else:
+            raise ValueError(f"Operación desconocida en la bitácora: {operacion}")
+
+    # --- Registro de cambios (interfaz de índice del almacén) ---
+
+    def indexar(self, estudiante):
+        self._escribir(OP_AGREGAR, estudiante)
+
+    def desindexar(self, estudiante):
+        self._escribir(OP_ELIMINAR, estudiante[self.almacen.esquema.carne])
+
+    def reindexar(self, anterior, nuevo):
+        self._escribir(OP_ACTUALIZAR, nuevo)
+
+    def limpiar(self):
+        self._escribir(OP_LIMPIAR, None)
+
+    def _escribir(self, operacion, dato):
+        self._secuencia += 1
+        contenido = pickle.dumps((self._secuencia, operacion, dato), protocol=pickle.HIGHEST_PROTOCOL)
+        self._bitacora.write(_CABECERA.pack(len(contenido), zlib.crc32(contenido)))
+        self._bitacora.write(contenido)
+        if not self._lotes_abiertos:
+            self._sincronizar_bitacora()
+        self._operaciones_pendientes += 1
+        if self._operaciones_pendientes >= self.operaciones_por_instantanea:
+            self.crear_instantanea()
+
+    def _sincronizar_bitacora(self):
+        self._bitacora.flush()
+        if self.sincronizar:
+            os.fsync(self._bitacora.fileno())
+
+    @contextmanager
+    def lote(self):
+        """Agrupa las operaciones del bloque en una sola sincronización con el disco al salir.
+
+        Los lotes se pueden anidar; solo el más externo sincroniza. Si el proceso se cae dentro
+        del bloque, se pueden perder las operaciones del lote aún no sincronizadas.
+        """
+        self._lotes_abiertos += 1
+        try:
+            yield self
+        finally:
+            self._lotes_abiertos -= 1
+            if not self._lotes_abiertos and self._bitacora is not None:
+                self._sincronizar_bitacora()
+
+    # --- Compactación ---
+
+    def crear_instantanea(self):
+        """Guarda el estado completo del almacén y vacía la bitácora."""
+        datos = {
+            "version": VERSION_INSTANTANEA,
+            "secuencia": self._secuencia,
+            "estudiantes": list(self.almacen),
+        }
+        temporal = self.ruta_instantanea + ".tmp"
+        with open(temporal, "wb") as archivo:
+            pickle.dump(datos, archivo, protocol=pickle.HIGHEST_PROTOCOL)
+            archivo.flush()
+            os.fsync(archivo.fileno())
+        os.replace(temporal, self.ruta_instantanea)
+        _sincronizar_directorio(self.directorio)
+
+        # Las operaciones ya están en la instantánea; si se cae antes de truncar,
+        # la recuperación las ignora por su número de secuencia.
+        self._bitacora.truncate(0)
+        self._bitacora.flush()
+        os.fsync(self._bitacora.fileno())
+        self._operaciones_pendientes = 0
+
+    def cerrar(self):
+        """Deja de registrar cambios y cierra la bitácora."""
+        if self._bitacora is not None:
+            self._bitacora.flush()
+            os.fsync(self._bitacora.fileno())
+            self._bitacora.close()
+            self._bitacora = None
+        if self.almacen is not None:
+            self.almacen.quitar_indice(self)
+            self.almacen = None
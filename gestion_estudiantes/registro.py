@@ -0,0 +1,147 @@
+"""
+Representación compacta de un estudiante.
+
+Un diccionario por estudiante con una lista de tuplas (materia, créditos) ocupa cientos de bytes.
+RegistroEstudiante guarda los mismos datos con __slots__ y empaqueta las materias en un objeto
+bytes de pares (índice en el catálogo, créditos) como enteros de 16 bits. Los nombres de materia
+se guardan una sola vez en el catálogo compartido CATALOGO_MATERIAS.
+
+El registro se comporta como un diccionario de solo lectura (Mapping) con las claves de su
+esquema, así que el código existente (est['promedio'], est["Materias"], ...) sigue funcionando.
+"""
+
+from array import array
+from collections.abc import Mapping
+
+from .esquema import ESQUEMA_CLI, ESQUEMA_RONY
+
+# Créditos guardados para materias sin créditos (las de propuestaRony son solo el nombre);
+# también es el tope exclusivo de créditos de una materia
+SIN_CREDITOS = 0xFFFF
+
+
+class CatalogoMaterias:
+    """Catálogo compartido nombre de materia <-> índice."""
+
+    def __init__(self):
+        self._indices = {}
+        self._nombres = []
+
+    def __len__(self):
+        return len(self._nombres)
+
+    def indice(self, nombre):
+        """Índice de la materia, registrándola si es nueva."""
+        indice = self._indices.get(nombre)
+        if indice is None:
+            if len(self._nombres) >= SIN_CREDITOS:
+                raise OverflowError("El catálogo de materias está lleno.")
+            indice = self._indices[nombre] = len(self._nombres)
+            self._nombres.append(nombre)
+        return indice
+
+    def nombre(self, indice):
+        return self._nombres[indice]
+
+
+CATALOGO_MATERIAS = CatalogoMaterias()
+
+
+def empaquetar_materias(materias, catalogo=CATALOGO_MATERIAS):
+    """Convierte una lista de tuplas (nombre, créditos) o strings en bytes compactos."""
+    valores = array("H")
+    for materia in materias:
+        if isinstance(materia, str):
+            valores.append(catalogo.indice(materia))
+            valores.append(SIN_CREDITOS)
+        else:
+            nombre, creditos = materia
+            if not 0 <= creditos < SIN_CREDITOS:
+                raise ValueError(f"Créditos fuera de rango: {creditos}")
+            valores.append(catalogo.indice(nombre))
+            valores.append(creditos)
+    return valores.tobytes()
+
+
+def desempaquetar_materias(datos, catalogo=CATALOGO_MATERIAS):
+    """Inverso de empaquetar_materias: lista de tuplas (nombre, créditos) o strings."""
+    valores = memoryview(datos).cast("H")
+    nombres = catalogo._nombres
+    return [nombres[indice] if creditos == SIN_CREDITOS else (nombres[indice], creditos)
+            for indice, creditos in zip(valores[::2], valores[1::2])]
+
+
+class RegistroEstudiante(Mapping):
+    """Estudiante compacto con vista de diccionario de solo lectura (claves de ESQUEMA_CLI)."""
+
+    __slots__ = ("nombre", "carne", "_materias", "promedio")
+
+    esquema = ESQUEMA_CLI
+
+    def __init__(self, nombre, carne, materias, promedio):
+        self.nombre = nombre
+        self.carne = carne
+        self._materias = empaquetar_materias(materias)
+        self.promedio = float(promedio)
+
+    @classmethod
+    def desde(cls, estudiante):
+        """Crea un registro compacto a partir de un diccionario (o registro) del esquema de la clase."""
+        if type(estudiante) is cls:
+            return estudiante
+        esquema = cls.esquema
+        return cls(estudiante[esquema.nombre], estudiante[esquema.carne],
+                   estudiante[esquema.materias], estudiante[esquema.promedio])
+
+    @property
+    def materias(self):
+        return desempaquetar_materias(self._materias)
+
+    # --- Vista de diccionario ---
+
+    def __getitem__(self, clave):
+        esquema = self.esquema
+        if clave == esquema.carne:
+            return self.carne
+        if clave == esquema.nombre:
+            return self.nombre
+        if clave == esquema.promedio:
+            return self.promedio
+        if clave == esquema.materias:
+            return self.materias
+        raise KeyError(clave)
+
+    def __iter__(self):
+        esquema = self.esquema
+        return iter((esquema.nombre, esquema.carne, esquema.materias, esquema.promedio))
+
+    def __len__(self):
+        return 4
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self)!r})"
+
+    def __reduce__(self):
+        # Se serializa con los nombres de materia, no con los índices del catálogo de este proceso
+        return (type(self), (self.nombre, self.carne, self.materias, self.promedio))
+
+
+class RegistroEstudianteRony(RegistroEstudiante):
+    """Registro compacto con las claves del formato de propuestaRony ("Carné", "Nombre", ...)."""
+
+    __slots__ = ()
+
+    esquema = ESQUEMA_RONY
+
+
+_TIPOS_REGISTRO = {ESQUEMA_CLI: RegistroEstudiante, ESQUEMA_RONY: RegistroEstudianteRony}
+
+
+def tipo_registro(esquema):
+    """Clase de registro compacto para un esquema."""
+    tipo = _TIPOS_REGISTRO.get(esquema)
+    if tipo is None:
+        tipo = type(f"RegistroEstudiante_{esquema.carne}", (RegistroEstudiante,),
+                    {"__slots__": (), "esquema": esquema})
+        _TIPOS_REGISTRO[esquema] = tipo
+    return tipo
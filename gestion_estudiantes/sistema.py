@@ -0,0 +1,220 @@
+"""
+Motor único del Sistema de Gestión de Estudiantes.
+
+GestorEstudiantes reúne lo que cada interfaz (student_management.py y las dos versiones de
+propuestaRony) armaba por su cuenta: el almacén indexado con sus índices y estadísticas, el
+asignador de carnés, la búsqueda incremental, la persistencia en disco y el candado para
+usarlo desde varios hilos. Las interfaces solo piden datos al usuario y muestran resultados;
+las reglas (formato del carné, años de inscripción válidos, unicidad) viven aquí una sola vez.
+
+El formato de los registros lo decide el esquema (ESQUEMA_CLI o ESQUEMA_RONY); para pasar un
+registro de un formato al otro está adaptadores.adaptar_estudiante.
+"""
+
+import threading
+from contextlib import contextmanager
+
+from .almacen import AlmacenEstudiantes
+from .busqueda import BuscadorIncremental
+from .carnes import AsignadorCarnes
+from .consultas import Consulta
+from .esquema import ESQUEMA_CLI
+from .exportacion import exportar
+from .generador import poblar_almacen
+from .importacion import importar_archivo
+from .persistencia import Persistencia
+
+
+class GestorEstudiantes:
+    """Almacén, índices, carnés y persistencia de un grupo de estudiantes detrás de una sola interfaz.
+
+    directorio_datos: carpeta de la bitácora y las instantáneas (None = solo en memoria).
+    anios_validos: años YY aceptados al inscribir (None = cualquiera).
+    minimo_correlativo, maximo_correlativo: rango de correlativos que entrega el asignador de carnés
+    (por omisión, hasta el mayor que permite el patrón del esquema).
+    catalogo_materias: materias conocidas, strings o tuplas (nombre, código), para el índice de materias.
+    Todas las operaciones toman `candado`, así que se pueden llamar desde varios hilos.
+    """
+
+    def __init__(self, esquema=ESQUEMA_CLI, directorio_datos=None, set_carnes=None, anios_validos=None,
+                 minimo_correlativo=1, maximo_correlativo=None, compacto=True, catalogo_materias=None):
+        self.esquema = esquema
+        self.anios_validos = anios_validos
+        self.candado = threading.RLock()
+        self.almacen = AlmacenEstudiantes(esquema, set_carnes, compacto=compacto)
+        self.set_carnes = self.almacen.set_carnes
+        if catalogo_materias is not None:
+            self.almacen.materias.usar_catalogo(catalogo_materias)
+        # Los dígitos del correlativo se toman del patrón de carné del esquema
+        self.asignador = self.almacen.registrar_indice(AsignadorCarnes(esquema, minimo=minimo_correlativo,
+                                                                            maximo=maximo_correlativo))
+        self.persistencia = Persistencia(directorio_datos) if directorio_datos is not None else None
+        self._buscador = None
+
+    def __len__(self):
+        return len(self.almacen)
+
+    def __contains__(self, carne):
+        return carne in self.almacen
+
+    @property
+    def buscador(self):
+        """BuscadorIncremental del almacén; se crea la primera vez que se usa."""
+        if self._buscador is None:
+            with self.candado:
+                if self._buscador is None:
+                    self._buscador = BuscadorIncremental(self.almacen, incluir_carne=True)
+        return self._buscador
+
+    # --- Ciclo de vida ---
+
+    def abrir(self):
+        """Carga los datos guardados y empieza a registrar cambios. True si había datos."""
+        if self.persistencia is None:
+            return False
+        with self.candado:
+            return self.persistencia.abrir(self.almacen)
+
+    def cerrar(self):
+        if self.persistencia is not None:
+            with self.candado:
+                self.persistencia.cerrar()
+
+    @contextmanager
+    def lote(self):
+        """Ejecuta un grupo de operaciones con el candado tomado y un solo fsync de la bitácora al final."""
+        with self.candado:
+            if self.persistencia is None or self.persistencia.almacen is None:
+                yield self  # Sin persistencia abierta no hay nada que agrupar
+                return
+            with self.persistencia.lote():
+                yield self
+
+    # --- Altas, bajas y consultas ---
+
+    def generar_carne(self, anio):
+        """Siguiente carné libre del año YY. Lanza ValueError si el año no es válido y
+        CarnesAgotadosError (OverflowError) si el año ya no tiene carnés."""
+        if self.anios_validos is not None and anio not in self.anios_validos:
+            raise ValueError(f"El año de inscripción debe estar entre {min(self.anios_validos)} "
+                             f"y {max(self.anios_validos)}.")
+        with self.candado:
+            return self.asignador.asignar(anio)
+
+    def inscribir(self, nombre, anio, materias, promedio):
+        """Agrega un estudiante con un carné nuevo del año YY y devuelve el registro guardado."""
+        esquema = self.esquema
+        with self.candado:
+            carne = self.generar_carne(anio)
+            try:
+                return self.almacen.agregar({esquema.nombre: nombre, esquema.carne: carne,
+                                             esquema.materias: materias, esquema.promedio: promedio})
+            except Exception:
+                self.asignador.liberar(carne)  # El carné reservado no llegó al almacén
+                raise
+
+    def agregar(self, estudiante):
+        """Agrega un estudiante con carné propio y devuelve el registro guardado.
+
+        Lanza ValueError si el carné no tiene el formato del esquema o ya existe.
+        """
+        carne = estudiante[self.esquema.carne]
+        if not self.esquema.validar_carne(carne):
+            raise ValueError(f"Formato de carné incorrecto: {carne}")
+        with self.candado:
+            return self.almacen.agregar(estudiante)
+
+    def eliminar(self, carne):
+        """Elimina al estudiante y lo devuelve, o None si no existe."""
+        with self.candado:
+            return self.almacen.eliminar(carne)
+
+    def obtener(self, carne):
+        with self.candado:
+            return self.almacen.obtener(carne)
+
+    def estudiantes(self):
+        """Lista de todos los estudiantes en orden de inserción."""
+        with self.candado:
+            return list(self.almacen)
+
+    def buscar(self, termino, incluir_carne=False):
+        """Estudiantes cuyo nombre contiene el término (y, con incluir_carne, el del carné exacto)."""
+        with self.candado:
+            return self.almacen.buscar_por_nombre(termino, incluir_carne)
+
+    def buscar_en_vivo(self, termino):
+        """(versión, estudiantes) de la búsqueda incremental; la versión cambia con cada cambio del almacén."""
+        buscador = self.buscador
+        with self.candado:
+            return buscador.version, buscador.buscar(termino)
+
+    def consulta(self):
+        """Consulta componible sobre el almacén (ver consultas.Consulta); recorrerla no toma el candado."""
+        return Consulta(self.almacen)
+
+    def consultar(self, consulta):
+        """Ejecuta la consulta con el candado tomado y devuelve la lista de estudiantes."""
+        with self.candado:
+            return list(consulta)
+
+    def superiores_a(self, umbral):
+        """Estudiantes con promedio mayor que el umbral, de mayor a menor."""
+        return self.consultar(self.consulta().donde(promedio__gt=umbral).ordenar_por("-promedio"))
+
+    def promedio_general(self):
+        """Promedio del grupo, o None si no hay estudiantes."""
+        with self.candado:
+            return self.almacen.estadisticas.promedio()
+
+    def inscritos(self, materia):
+        """Estudiantes inscritos en la materia (nombre o código del catálogo), ordenados por carné."""
+        return self.consultar(self.consulta().donde(materia=materia).ordenar_por("carne"))
+
+    def inscritos_en_todas(self, materias):
+        """Estudiantes inscritos en todas las materias dadas."""
+        if not materias:
+            return []
+        consulta = self.consulta().ordenar_por("carne")
+        for materia in materias:
+            consulta = consulta.donde(materia=materia)
+        return self.consultar(consulta)
+
+    def inscritos_en_alguna(self, materias):
+        """Estudiantes inscritos en al menos una de las materias dadas."""
+        return self.consultar(self.consulta().donde(materia__in=materias).ordenar_por("carne"))
+
+    def cantidad_por_materia(self):
+        """Diccionario materia -> cantidad de inscritos, de mayor a menor."""
+        with self.candado:
+            return self.almacen.materias.conteos()
+
+    def suscribir(self, funcion):
+        return self.almacen.suscribir(funcion)
+
+    def desuscribir(self, funcion):
+        self.almacen.desuscribir(funcion)
+
+    # --- Operaciones masivas ---
+
+    def poblar(self, cantidad, semilla=None, **opciones):
+        """Agrega estudiantes sintéticos (ver generador.GeneradorEstudiantes). Devuelve cuántos."""
+        if self.anios_validos is not None:
+            opciones.setdefault("anios", self.anios_validos)
+        with self.lote():
+            return poblar_almacen(self.almacen, cantidad, semilla=semilla, asignador=self.asignador, **opciones)
+
+    def importar(self, ruta, detener=None, **opciones):
+        """Importa un CSV o JSONL (ver importacion.importar_archivo).
+
+        El candado se toma por lote (un fsync por lote), no durante toda la importación: entre
+        lotes otros hilos pueden consultar el almacén.
+        """
+        return importar_archivo(ruta, self.almacen, detener=detener, contexto_lote=self.lote, **opciones)
+
+    def exportar(self, ruta, **opciones):
+        """Exporta a CSV, JSONL o columnar (ver exportacion.exportar).
+
+        El candado se toma por tramos de la selección, no durante toda la escritura del archivo.
+        """
+        return exportar(self.almacen, ruta, candado=self.candado, **opciones)
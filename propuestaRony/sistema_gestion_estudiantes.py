@@ -1,12 +1,16 @@
 """
 Explicación del Uso de Estructuras de Datos:
 
-1. Listas (estudiantes):
+1. Almacén indexado (estudiantes):
    - Propósito: Almacenar la colección principal de todos los estudiantes.
-   - Razón: Las listas en Python son ordenadas y mutables, lo que permite agregar, eliminar y modificar
-     estudiantes fácilmente. Son ideales para mantener una secuencia de elementos (en este caso, diccionarios
-     de estudiantes) a los que se puede acceder por índice si fuera necesario, aunque la búsqueda principal
-     se realiza por carné o nombre.
+   - Razón: AlmacenEstudiantes (paquete gestion_estudiantes) combina una lista en orden de inserción con un
+     diccionario carné -> posición. Se recorre igual que una lista, pero buscar o eliminar por carné es O(1)
+     en lugar de recorrer toda la colección, lo que importa cuando hay cientos de miles de estudiantes.
+     El almacén, el asignador de carnés y la persistencia los arma GestorEstudiantes, el mismo motor
+     que usan la GUI y student_management.py.
+     El almacén mantiene además un índice ordenado por promedio: "promedio superior a" lista a los
+     estudiantes de mayor a menor promedio (a igual promedio, el inscrito más reciente primero), y no
+     en orden de inserción como la versión original.
 
 2. Diccionarios (para cada estudiante):
    - Propósito: Representar la información detallada de cada estudiante de forma estructurada.
@@ -33,17 +37,24 @@ Explicación del Uso de Estructuras de Datos:
      También pueden usarse para devolver múltiples valores desde una función de forma compacta.
 """
 
+import os
 import random
+import sys
 
-# Estructuras de datos principales
-estudiantes = []  # Lista principal de diccionarios de estudiantes
-carnes_unicos = set()  # Set para garantizar carnés únicos
+# El motor compartido (gestion_estudiantes) está en la raíz del repositorio
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gestion_estudiantes import ESQUEMA_RONY, GestorEstudiantes, ejecutar_archivo
 
-# Contador para el número correlativo del carné (XXXXX)
-# Se inicializa para cada año, pero necesitamos un contador global para el XXXXX parte
-# Para simplificar, usaremos un único contador global para XXXXX que se reinicia conceptualmente
-# o se gestiona por año. Aquí, para el auto-incremental XXXXX, lo haremos global.
-siguiente_numero_correlativo = 1000
+# Bitácora en disco con instantáneas: los datos sobreviven entre ejecuciones
+DIRECTORIO_DATOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "datos_cli")
+
+# Motor compartido: carnés 0905-YY-XXXXX de los años 20 a 25. El correlativo de cada año se
+# asigna desde 01000 (o se reutiliza el de un estudiante eliminado) sin reintentos, y se lanza
+# CarnesAgotadosError cuando el año ya no tiene números disponibles.
+carnes_unicos = set()  # Set para garantizar carnés únicos (lo mantiene el almacén)
+sistema = GestorEstudiantes(ESQUEMA_RONY, DIRECTORIO_DATOS, carnes_unicos, anios_validos=range(20, 26),
+                            minimo_correlativo=1000)
+estudiantes = sistema.almacen  # Indexados por carné, registros compactos
 
 # Opciones para la población inicial (uso de tuplas)
 # Cada tupla es (NombreMateria, CodigoMateria) - aunque solo usaremos NombreMateria para el estudiante
@@ -62,95 +73,47 @@ materias_disponibles_opciones = [
     ("Desarrollo Web", "WEB401")
 ]
 
+# Índice de materias (inscritos por materia): acepta también los códigos del catálogo ("BD1201")
+# y cuenta con cero inscritos a las materias del catálogo que nadie lleva
+estudiantes.materias.usar_catalogo(materias_disponibles_opciones)
+
 nombres_ejemplo = [
     "Ana Pérez", "Luis García", "Sofía Rodríguez", "Carlos Martínez", "Laura Gómez",
     "Juan Hernández", "María López", "José Torres", "Patricia Sánchez", "David Ramírez",
     "Elena Flores", "Miguel Romero", "Carmen Ruiz", "Javier Vargas", "Isabel Castro"
 ]
 
-def generar_carne(anio_inscripcion):
-    """Genera un carné único para un estudiante."""
-    global siguiente_numero_correlativo
-    
-    if not (20 <= anio_inscripcion <= 25):
-        raise ValueError("El año de inscripción debe estar entre 20 y 25.")
-
-    yy = str(anio_inscripcion).zfill(2)
-    
-    # Intentar generar un carné hasta encontrar uno único para el XXXXX correlativo
-    # Esta implementación asume que el XXXXX es global y no se reinicia por año.
-    # Si se quisiera reiniciar por año, la lógica de `siguiente_numero_correlativo` necesitaría ser más compleja (ej. un dict por año)
-    while True:
-        xxxxx = str(siguiente_numero_correlativo).zfill(5)
-        carne = f"0905-{yy}-{xxxxx}"
-        if carne not in carnes_unicos:
-            siguiente_numero_correlativo += 1
-            return carne
-        # Si el carné ya existe (improbable con XXXXX incremental global, pero seguro tenerlo)
-        # se incrementa el correlativo y se reintenta.
-        siguiente_numero_correlativo += 1
-        if siguiente_numero_correlativo > 99999: # Límite teórico para XXXXX
-            # En un caso real, aquí se manejaría el agotamiento de números para un año
-            # o se pasaría a una estrategia diferente.
-            # Para este ejercicio, si se agotan los XXXXX para un año, se podría lanzar un error
-            # o reiniciar el contador si la lógica de unicidad se maneja por año.
-            # Como es global, este límite es muy alto.
-            print("ADVERTENCIA: Se ha alcanzado el límite del número correlativo XXXXX.")
-            # Podríamos optar por reiniciar si la lógica de unicidad por año fuera más estricta
-            # siguiente_numero_correlativo = 1000 # Ejemplo si se quisiera reiniciar
-            # O simplemente dejar que falle si no hay más carnés disponibles bajo el esquema actual.
-            # Para este ejercicio, asumimos que no se agotará.
-            pass # Continuar para ver si el siguiente intento funciona (poco probable que se alcance)
-
 def agregar_estudiante(nombre, anio_inscripcion, materias, promedio):
     """Agrega un nuevo estudiante al sistema."""
     try:
-        carne = generar_carne(anio_inscripcion)
-        estudiante = {
-            "Nombre": nombre,
-            "Carné": carne,
-            "Materias": materias,
-            "Promedio": promedio
-        }
-        estudiantes.append(estudiante)
-        carnes_unicos.add(carne)
-        print(f"Estudiante {nombre} con carné {carne} agregado exitosamente.")
+        # Valida el año, genera el carné y registra al estudiante (también en carnes_unicos)
+        estudiante = sistema.inscribir(nombre, anio_inscripcion, materias, promedio)
+        print(f"Estudiante {nombre} con carné {estudiante['Carné']} agregado exitosamente.")
         return True
     except ValueError as e:
         print(f"Error al agregar estudiante: {e}")
         return False
+    except OverflowError as e:
+        print(f"Error al generar carné: {e}")
+        return False
     except Exception as e:
         print(f"Error inesperado al generar carné o agregar estudiante: {e}")
         return False
 
 def eliminar_estudiante(carne_a_eliminar):
     """Elimina un estudiante del sistema por su carné."""
-    global estudiantes
-    estudiante_encontrado = None
-    for est in estudiantes:
-        if est["Carné"] == carne_a_eliminar:
-            estudiante_encontrado = est
-            break
+    # El almacén localiza el registro por carné en O(1) y lo quita también de carnes_unicos
+    estudiante_encontrado = sistema.eliminar(carne_a_eliminar)
     
     if estudiante_encontrado:
-        estudiantes.remove(estudiante_encontrado)
-        carnes_unicos.remove(carne_a_eliminar)
         print(f"Estudiante con carné {carne_a_eliminar} eliminado exitosamente.")
     else:
         print(f"Estudiante con carné {carne_a_eliminar} no encontrado.")
 
 def buscar_estudiante(termino_busqueda):
     """Busca estudiantes por nombre (parcial/completo) o carné (exacto)."""
-    resultados = []
-    termino_busqueda_lower = termino_busqueda.lower()
-    for est in estudiantes:
-        # Búsqueda por carné (exacta)
-        if est["Carné"] == termino_busqueda:
-            resultados.append(est)
-            continue # Si coincide por carné, es único, no seguir buscando en este estudiante
-        # Búsqueda por nombre (parcial, insensible a mayúsculas)
-        if termino_busqueda_lower in est["Nombre"].lower():
-            resultados.append(est)
+    # Nombre parcial insensible a mayúsculas (índice de trigramas) más coincidencia exacta de carné
+    resultados = sistema.buscar(termino_busqueda, incluir_carne=True)
             
     if resultados:
         print(f"\n--- Resultados de la búsqueda para '{termino_busqueda}' ---")
@@ -165,14 +128,11 @@ def buscar_estudiante(termino_busqueda):
         print(f"No se encontraron estudiantes que coincidan con '{termino_busqueda}'.")
 
 def mostrar_promedio_superior(umbral):
-    """Muestra estudiantes con promedio superior a un umbral dado."""
-    resultados = []
-    for est in estudiantes:
-        if est["Promedio"] > umbral:
-            resultados.append(est)
+    """Muestra estudiantes con promedio superior a un umbral dado (de mayor a menor promedio)."""
+    resultados = sistema.superiores_a(umbral)  # Índice ordenado: O(log n + k)
             
     if resultados:
-        print(f"\n--- Estudiantes con promedio superior a {umbral:.2f} ---")
+        print(f"\n--- Estudiantes con promedio superior a {umbral:.2f} (de mayor a menor) ---")
         for est in resultados:
             print(f"  Nombre: {est['Nombre']}, Carné: {est['Carné']}, Promedio: {est['Promedio']:.2f}")
         print("-" * 20)
@@ -181,11 +141,7 @@ def mostrar_promedio_superior(umbral):
 
 def mostrar_materias_estudiante(carne_busqueda):
     """Muestra las materias de un estudiante específico por su carné."""
-    estudiante_encontrado = None
-    for est in estudiantes:
-        if est["Carné"] == carne_busqueda:
-            estudiante_encontrado = est
-            break
+    estudiante_encontrado = sistema.obtener(carne_busqueda)
             
     if estudiante_encontrado:
         print(f"\n--- Materias de {estudiante_encontrado['Nombre']} (Carné: {carne_busqueda}) ---")
@@ -204,11 +160,8 @@ def calcular_promedio_general():
         print("No hay estudiantes registrados para calcular el promedio general.")
         return
         
-    suma_promedios = 0
-    for est in estudiantes:
-        suma_promedios += est["Promedio"]
-        
-    promedio_general = suma_promedios / len(estudiantes)
+    # Suma compensada mantenida en cada alta/baja: O(1), sin recorrer la lista
+    promedio_general = sistema.promedio_general()
     print(f"\nEl promedio general de calificaciones de los {len(estudiantes)} estudiantes es: {promedio_general:.2f}")
 
 def poblar_datos_iniciales():
@@ -320,13 +273,37 @@ def mostrar_menu():
         else:
             print("Opción no válida. Por favor, intente de nuevo.")
 
+def ejecutar_lote(ruta):
+    """Ejecuta operaciones JSONL sin menú (ver gestion_estudiantes/lotes.py); '-' = entrada estándar."""
+    sistema.abrir()
+    try:
+        if ruta == "-":
+            resumen = ejecutar_archivo(sistema, sys.stdin, sys.stdout)
+        else:
+            with open(ruta, encoding="utf-8") as entrada:
+                resumen = ejecutar_archivo(sistema, entrada, sys.stdout)
+    finally:
+        sistema.cerrar()
+    print(f"{resumen.operaciones} operaciones, {resumen.fallidas} con error.", file=sys.stderr)
+    return 1 if resumen.fallidas else 0
+
 # --- Ejecución Principal ---
 if __name__ == "__main__":
-    # Poblar con datos iniciales al arrancar el programa
-    poblar_datos_iniciales()
+    # Modo por lotes: python sistema_gestion_estudiantes.py --lote operaciones.jsonl
+    if len(sys.argv) == 3 and sys.argv[1] == "--lote":
+        sys.exit(ejecutar_lote(sys.argv[2]))
+
+    # Cargar los datos guardados; solo si no hay se pueblan los datos iniciales
+    if sistema.abrir():
+        print(f"\nSe cargaron {len(estudiantes)} estudiantes guardados.")
+    else:
+        poblar_datos_iniciales()
     
     # Mostrar el menú interactivo
-    mostrar_menu()
+    try:
+        mostrar_menu()
+    finally:
+        sistema.cerrar()  # También si la entrada se corta (EOF, Ctrl+C)
 
     # Opcional: Mostrar la explicación de las estructuras de datos al final si no se hizo en la opción de salir.
     # print("\n" + """
@@ -1,12 +1,16 @@
 """
 Explicación del Uso de Estructuras de Datos:
 
-1. Listas (estudiantes):
+1. Almacén indexado (estudiantes):
    - Propósito: Almacenar la colección principal de todos los estudiantes.
-   - Razón: Las listas en Python son ordenadas y mutables, lo que permite agregar, eliminar y modificar
-     estudiantes fácilmente. Son ideales para mantener una secuencia de elementos (en este caso, diccionarios
-     de estudiantes) a los que se puede acceder por índice si fuera necesario, aunque la búsqueda principal
-     se realiza por carné o nombre.
+   - Razón: AlmacenEstudiantes (paquete gestion_estudiantes) combina una lista en orden de inserción con un
+     diccionario carné -> posición. Se recorre igual que una lista, pero buscar o eliminar por carné es O(1)
+     en lugar de recorrer toda la colección, lo que importa cuando hay cientos de miles de estudiantes.
+     El almacén, el asignador de carnés y la persistencia los arma GestorEstudiantes, el mismo motor
+     que usan la versión de consola y student_management.py.
+     El almacén mantiene además un índice ordenado por promedio: "promedio superior a" lista a los
+     estudiantes de mayor a menor promedio (a igual promedio, el inscrito más reciente primero), y no
+     en orden de inserción como la versión original.
 
 2. Diccionarios (para cada estudiante):
    - Propósito: Representar la información detallada de cada estudiante de forma estructurada.
@@ -33,16 +37,35 @@ Explicación del Uso de Estructuras de Datos:
      También pueden usarse para devolver múltiples valores desde una función de forma compacta.
 """
 
+import itertools
+import operator
+import os
+import queue
 import random
+import sys
+import threading
 import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import ttk, messagebox, simpledialog, filedialog
 
-# Estructuras de datos principales
-estudiantes = []  # Lista principal de diccionarios de estudiantes
-carnes_unicos = set()  # Set para garantizar carnés únicos
+# El motor compartido (gestion_estudiantes) está en la raíz del repositorio
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gestion_estudiantes import (EVENTO_ACTUALIZADO, EVENTO_AGREGADO, EVENTO_ELIMINADO, EVENTO_LIMPIADO,
+                                 ESQUEMA_RONY, GestorEstudiantes)
 
-# Contador para el número correlativo del carné (XXXXX)
-siguiente_numero_correlativo = 1000
+# Bitácora en disco con instantáneas: los datos sobreviven entre ejecuciones
+DIRECTORIO_DATOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "datos_gui")
+
+# Motor compartido: carnés 0905-YY-XXXXX de los años 20 a 25, correlativo por año desde 01000
+carnes_unicos = set()  # Set para garantizar carnés únicos (lo mantiene el almacén)
+sistema = GestorEstudiantes(ESQUEMA_RONY, DIRECTORIO_DATOS, carnes_unicos, anios_validos=range(20, 26),
+                            minimo_correlativo=1000)
+estudiantes = sistema.almacen  # Indexados por carné, registros compactos
+
+# Las consultas y operaciones masivas corren en hilos de trabajo (ver EjecutorTareas); todo acceso
+# al almacén pasa por el candado del motor, que también toman las operaciones de `sistema`. Importar
+# y exportar lo sueltan entre lotes, así las búsquedas avanzan mientras tanto
+candado_estudiantes = sistema.candado
 
 # Opciones para la población inicial (uso de tuplas)
 materias_disponibles_opciones = [
@@ -60,6 +83,10 @@ materias_disponibles_opciones = [
     ("Desarrollo Web", "WEB401")
 ]
 
+# Índice de materias (inscritos por materia): acepta también los códigos del catálogo ("BD1201")
+# y cuenta con cero inscritos a las materias del catálogo que nadie lleva
+estudiantes.materias.usar_catalogo(materias_disponibles_opciones)
+
 nombres_ejemplo = [
     "Ana Pérez", "Luis García", "Sofía Rodríguez", "Carlos Martínez", "Laura Gómez",
     "Juan Hernández", "María López", "José Torres", "Patricia Sánchez", "David Ramírez",
@@ -67,35 +94,11 @@ nombres_ejemplo = [
 ]
 
 # --- Lógica de Negocio (Funciones originales adaptadas ligeramente si es necesario) ---
-def generar_carne(anio_inscripcion):
-    global siguiente_numero_correlativo
-    if not (20 <= anio_inscripcion <= 25):
-        raise ValueError("El año de inscripción debe estar entre 20 y 25.")
-    yy = str(anio_inscripcion).zfill(2)
-    while True:
-        xxxxx = str(siguiente_numero_correlativo).zfill(5)
-        carne = f"0905-{yy}-{xxxxx}"
-        if carne not in carnes_unicos:
-            siguiente_numero_correlativo += 1
-            return carne
-        siguiente_numero_correlativo += 1
-        if siguiente_numero_correlativo > 99999:
-            # En un sistema real, manejar el agotamiento de carnés.
-            # Para este ejercicio, es improbable alcanzarlo con la población inicial.
-            raise OverflowError("Se ha agotado el rango de números correlativos para carnés.")
-
 def agregar_estudiante_logica(nombre, anio_inscripcion, materias, promedio):
     try:
-        carne = generar_carne(anio_inscripcion)
-        estudiante = {
-            "Nombre": nombre,
-            "Carné": carne,
-            "Materias": materias,
-            "Promedio": promedio
-        }
-        estudiantes.append(estudiante)
-        carnes_unicos.add(carne)
-        return True, f"Estudiante {nombre} con carné {carne} agregado exitosamente.", estudiante
+        # Valida el año y genera el carné (OverflowError si el año se agotó); también registra en carnes_unicos
+        estudiante = sistema.inscribir(nombre, anio_inscripcion, materias, promedio)
+        return True, f"Estudiante {nombre} con carné {estudiante['Carné']} agregado exitosamente.", estudiante
     except ValueError as e:
         return False, f"Error al agregar estudiante: {e}", None
     except OverflowError as e:
@@ -104,46 +107,37 @@ def agregar_estudiante_logica(nombre, anio_inscripcion, materias, promedio):
         return False, f"Error inesperado: {e}", None
 
 def eliminar_estudiante_logica(carne_a_eliminar):
-    estudiante_encontrado = None
-    for est in estudiantes:
-        if est["Carné"] == carne_a_eliminar:
-            estudiante_encontrado = est
-            break
+    estudiante_encontrado = sistema.eliminar(carne_a_eliminar)
     if estudiante_encontrado:
-        estudiantes.remove(estudiante_encontrado)
-        carnes_unicos.remove(carne_a_eliminar)
         return True, f"Estudiante con carné {carne_a_eliminar} eliminado exitosamente."
     else:
         return False, f"Estudiante con carné {carne_a_eliminar} no encontrado."
 
-def buscar_estudiante_logica(termino_busqueda):
-    resultados = []
-    termino_busqueda_lower = termino_busqueda.lower()
-    for est in estudiantes:
-        if est["Carné"] == termino_busqueda or termino_busqueda_lower in est["Nombre"].lower():
-            resultados.append(est)
-    return resultados
+def buscar_en_vivo_logica(termino_busqueda):
+    # Nombre parcial insensible a mayúsculas (índice de trigramas) más coincidencia exacta de carné.
+    # Refina los resultados del término anterior si el nuevo lo contiene (ver BuscadorIncremental).
+    # Devuelve también la versión del buscador para detectar cambios ocurridos mientras tanto.
+    return sistema.buscar_en_vivo(termino_busqueda)
 
 def mostrar_promedio_superior_logica(umbral):
-    return [est for est in estudiantes if est["Promedio"] > umbral]
+    return sistema.superiores_a(umbral) # Índice ordenado: O(log n + k)
 
 def mostrar_materias_estudiante_logica(carne_busqueda):
-    for est in estudiantes:
-        if est["Carné"] == carne_busqueda:
-            return est # Devuelve el diccionario del estudiante
-    return None
+    return sistema.obtener(carne_busqueda) # Devuelve el diccionario del estudiante o None
 
 def calcular_promedio_general_logica():
-    if not estudiantes:
-        return None
-    suma_promedios = sum(est["Promedio"] for est in estudiantes)
-    return suma_promedios / len(estudiantes)
+    # Mantenido de forma incremental por el almacén: O(1). Devuelve None si no hay estudiantes.
+    return sistema.promedio_general()
+
+def importar_archivo_logica(ruta, detener=None):
+    # Los estudiantes importados llegan a la tabla como eventos del almacén
+    return sistema.importar(ruta, detener=detener)
+
+def exportar_archivo_logica(ruta):
+    return sistema.exportar(ruta)
 
 def poblar_datos_iniciales():
-    global siguiente_numero_correlativo # Asegurarse de modificar el global
-    siguiente_numero_correlativo = 1000 # Reiniciar para la población
-    carnes_unicos.clear()
-    estudiantes.clear()
+    estudiantes.limpiar()  # También vacía carnes_unicos y reinicia el asignador de carnés
     
     print("Poblando datos iniciales...")
     for i in range(30):
@@ -155,15 +149,390 @@ def poblar_datos_iniciales():
         
         # Usar la lógica de agregar directamente, ya que la GUI manejará los mensajes
         try:
-            carne = generar_carne(anio_inscripcion)
-            estudiante = {"Nombre": nombre, "Carné": carne, "Materias": materias_estudiante, "Promedio": promedio}
-            estudiantes.append(estudiante)
-            carnes_unicos.add(carne)
+            sistema.inscribir(nombre, anio_inscripcion, materias_estudiante, promedio)
         except Exception as e:
             print(f"Error poblando datos: {e}") # Imprimir error si ocurre durante la población
     print(f"Datos iniciales poblados: {len(estudiantes)} estudiantes.")
 
 # --- Interfaz Gráfica (GUI) con Tkinter ---
+RETARDO_PROGRESO = 300  # Milisegundos antes de mostrar la barra de progreso de una tarea
+RETARDO_BUSQUEDA = 150  # Milisegundos sin teclear antes de lanzar la búsqueda en vivo
+class TablaVirtual:
+    """Treeview que solo materializa las filas visibles de una secuencia, más un pequeño búfer.
+
+    Con decenas de miles de estudiantes, insertar todas las filas congela la ventana; aquí se
+    dibuja únicamente la ventana que cabe a partir de `inicio` y se vuelve a dibujar al
+    desplazarse. clave_fila(est) (el carné) es el identificador del ítem, así agregar_fila,
+    quitar_fila y actualizar_fila tocan una sola fila sin recorrer la tabla. El índice
+    clave -> posición se arma la primera vez que se necesita, no al mostrar las filas.
+    """
+    ALTO_FILA = 20  # Píxeles por fila, fijado en el estilo para calcular cuántas caben
+    ALTO_ENCABEZADO = 25
+    BUFER = 5  # Filas extra por debajo de las visibles, por si la ventana crece antes de redibujar
+    MINIMO_LAPIDAS_COMPACTAR = 64
+
+    def __init__(self, padre, columnas, formatear_fila, clave_fila):
+        self.formatear_fila = formatear_fila
+        self.clave_fila = clave_fila
+        ttk.Style(padre).configure("Virtual.Treeview", rowheight=self.ALTO_FILA)
+        self.tree = ttk.Treeview(padre, columns=columnas, show='headings', selectmode="browse",
+                                 style="Virtual.Treeview")
+        # La barra no controla la vista nativa del Treeview sino el índice de la primera fila
+        self.scrollbar = ttk.Scrollbar(self.tree, orient=tk.VERTICAL, command=self._desplazar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.filas = []       # Estudiantes mostrados (None = fila quitada, igual que en el almacén)
+        self._posiciones = None  # carné -> índice en filas (None = aún no calculado)
+        self._lapidas = 0
+        self.inicio = 0
+        self.visibles = 1
+        self.seleccionado = None  # Carné seleccionado; se conserva aunque salga de la ventana
+
+        self.tree.bind("<Configure>", self._al_redimensionar)
+        self.tree.bind("<<TreeviewSelect>>", self._al_seleccionar)
+        self.tree.bind("<MouseWheel>", lambda e: self._mover(-1 if e.delta > 0 else 1, "units"))
+        self.tree.bind("<Button-4>", lambda e: self._mover(-1, "units"))  # Rueda en X11
+        self.tree.bind("<Button-5>", lambda e: self._mover(1, "units"))
+        self.tree.bind("<Up>", lambda e: self._mover_seleccion(-1))
+        self.tree.bind("<Down>", lambda e: self._mover_seleccion(1))
+        self.tree.bind("<Prior>", lambda e: self._mover_seleccion(-self.visibles))
+        self.tree.bind("<Next>", lambda e: self._mover_seleccion(self.visibles))
+        self.tree.bind("<Home>", lambda e: self._mover_seleccion(-len(self.filas)))
+        self.tree.bind("<End>", lambda e: self._mover_seleccion(len(self.filas)))
+
+    def mostrar(self, fuente, al_inicio=False):
+        """Cambia todas las filas de la tabla. Solo se guardan referencias: no se crea ningún ítem extra."""
+        self.filas = list(fuente)
+        self._posiciones = None
+        self._lapidas = 0
+        if al_inicio:
+            self.inicio = 0
+        # Los carnés pueden repetirse con otros datos (p. ej. tras repoblar): se descartan los ítems
+        self.tree.delete(*self.tree.get_children())
+        self._dibujar()
+
+    def __contains__(self, carne):
+        return carne in self._indice()
+
+    # --- Cambios de una sola fila ---
+
+    def agregar_fila(self, est):
+        """Agrega la fila al final; solo toca el Treeview si el final está a la vista."""
+        if self._posiciones is not None:
+            self._posiciones[self.clave_fila(est)] = len(self.filas)
+        self.filas.append(est)
+        self._dibujar_si_visible(len(self.filas) - 1)
+
+    def quitar_fila(self, carne):
+        """Quita la fila del carné, si se está mostrando."""
+        posicion = self._indice().pop(carne, None)
+        if posicion is None:
+            return
+        self.filas[posicion] = None
+        self._lapidas += 1
+        if self._lapidas >= self.MINIMO_LAPIDAS_COMPACTAR and self._lapidas * 2 > len(self.filas):
+            self._compactar()
+        if self.tree.exists(carne):
+            self._dibujar()  # Borra el ítem y trae la siguiente fila al final de la ventana
+        else:
+            self._actualizar_barra()
+
+    def actualizar_fila(self, est):
+        """Reemplaza los datos de una fila mostrada y actualiza solo su ítem."""
+        valores = self.formatear_fila(est)
+        posicion = self._indice().get(valores[0])
+        if posicion is None:
+            return
+        self.filas[posicion] = est
+        if self.tree.exists(valores[0]):
+            self.tree.item(valores[0], values=valores)
+
+    def mostrar_fila(self, carne):
+        """Desplaza la tabla hasta la fila del carné y la selecciona."""
+        posicion = self._indice().get(carne)
+        if posicion is None:
+            return
+        if not self.inicio <= posicion < self.inicio + self.visibles:
+            self.inicio = posicion - self.visibles // 2
+        self.seleccionado = carne
+        self._dibujar()
+
+    # --- Ventana visible ---
+
+    def _posicion(self, carne):
+        """Índice en filas del carné: primero se busca en la ventana dibujada, luego en el índice completo."""
+        if self.tree.exists(carne):
+            clave_fila = self.clave_fila
+            vistas = 0
+            posicion = self.inicio
+            while posicion < len(self.filas) and vistas < self.visibles + self.BUFER:
+                est = self.filas[posicion]
+                if est is not None:
+                    if clave_fila(est) == carne:
+                        return posicion
+                    vistas += 1
+                posicion += 1
+        return self._indice().get(carne)
+
+    def _indice(self):
+        if self._posiciones is None:
+            clave_fila = self.clave_fila
+            self._posiciones = {clave_fila(est): i for i, est in enumerate(self.filas) if est is not None}
+        return self._posiciones
+
+    def _compactar(self):
+        # La primera fila visible se desplaza tantas posiciones como lápidas tenía antes
+        self.inicio -= self.filas[:self.inicio].count(None)
+        self.filas = [est for est in self.filas if est is not None]
+        self._posiciones = None
+        self._lapidas = 0
+
+    def _ventana(self):
+        """Filas a dibujar desde `inicio`, saltando las quitadas; al final se completa hacia atrás."""
+        total = len(self.filas)
+        self.inicio = min(max(0, self.inicio), max(0, total - self.visibles))
+        filas = []
+        posicion = self.inicio
+        while posicion < total and len(filas) < self.visibles + self.BUFER:
+            if self.filas[posicion] is not None:
+                filas.append(self.filas[posicion])
+            posicion += 1
+        posicion = self.inicio - 1
+        while len(filas) < self.visibles and posicion >= 0:
+            if self.filas[posicion] is not None:
+                filas.insert(0, self.filas[posicion])
+            self.inicio = posicion
+            posicion -= 1
+        return filas
+
+    def _dibujar_si_visible(self, posicion):
+        if posicion < self.inicio + self.visibles + self.BUFER:
+            self._dibujar()
+        else:
+            self._actualizar_barra()
+
+    def _dibujar(self):
+        """Lleva el Treeview a la ventana actual tocando solo los ítems que entran, salen o se mueven."""
+        deseados = [self.formatear_fila(est) for est in self._ventana()]
+        conservar = {valores[0] for valores in deseados}
+        sobrantes = [iid for iid in self.tree.get_children() if iid not in conservar]
+        if sobrantes:
+            self.tree.delete(*sobrantes)
+        actuales = self.tree.get_children()
+        for posicion, valores in enumerate(deseados):
+            iid = valores[0]
+            if posicion < len(actuales) and actuales[posicion] == iid:
+                continue
+            if self.tree.exists(iid):
+                self.tree.move(iid, "", posicion)
+            else:
+                self.tree.insert("", posicion, iid=iid, values=valores)
+            actuales = self.tree.get_children()
+        if self.seleccionado is not None and self.tree.exists(self.seleccionado):
+            if self.tree.selection() != (self.seleccionado,):
+                self.tree.selection_set(self.seleccionado)
+        self.tree.yview_moveto(0)  # La vista nativa siempre empieza en la primera fila dibujada
+        self._actualizar_barra()
+
+    def _actualizar_barra(self):
+        total = len(self.filas)
+        if total:
+            self.scrollbar.set(self.inicio / total, min(1.0, (self.inicio + self.visibles) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    # --- Desplazamiento y selección ---
+
+    def _desplazar(self, accion, cantidad, unidad=None):
+        # Protocolo de ttk.Scrollbar: ("moveto", fracción) o ("scroll", n, "units"|"pages")
+        if accion == "moveto":
+            self.inicio = int(float(cantidad) * len(self.filas))
+            self._dibujar()
+        else:
+            self._mover(int(cantidad), unidad)
+
+    def _mover(self, cantidad, unidad):
+        paso = self.visibles if unidad == "pages" else 1
+        self.inicio += cantidad * paso
+        self._dibujar()
+        return "break"  # Evita que el Treeview desplace su vista nativa
+
+    def _mover_seleccion(self, cantidad):
+        if not self.filas or self._lapidas == len(self.filas):
+            return "break"
+        actual = None if self.seleccionado is None else self._posicion(self.seleccionado)
+        if actual is not None:
+            objetivo = actual + cantidad
+        else:
+            objetivo = self.inicio if cantidad > 0 else self.inicio + self.visibles - 1
+        objetivo = min(max(0, objetivo), len(self.filas) - 1)
+        # Saltar filas quitadas en la dirección del movimiento (o en la contraria si no quedan)
+        paso = 1 if cantidad > 0 else -1
+        posicion = objetivo
+        while 0 <= posicion < len(self.filas) and self.filas[posicion] is None:
+            posicion += paso
+        if not 0 <= posicion < len(self.filas):
+            posicion = objetivo
+            while self.filas[posicion] is None:
+                posicion -= paso
+        # Desplazar lo justo para que la fila elegida quede dentro de la ventana visible
+        if posicion < self.inicio:
+            self.inicio = posicion
+        elif posicion >= self.inicio + self.visibles:
+            self.inicio = posicion - self.visibles + 1
+        self.seleccionado = self.clave_fila(self.filas[posicion])
+        self._dibujar()
+        return "break"
+
+    def _al_seleccionar(self, _evento):
+        seleccion = self.tree.selection()
+        if not seleccion:
+            return
+        self.seleccionado = seleccion[0]
+        # Un clic en la fila parcialmente visible hace que el Treeview desplace su vista nativa
+        posicion = self.tree.index(self.seleccionado)
+        if posicion >= self.visibles:
+            self.inicio = self._posicion(self.seleccionado) - self.visibles + 1
+            self._dibujar()
+        else:
+            self.tree.yview_moveto(0)
+
+    def _al_redimensionar(self, evento):
+        visibles = max(1, (evento.height - self.ALTO_ENCABEZADO) // self.ALTO_FILA)
+        if visibles != self.visibles:
+            self.visibles = visibles
+            self._dibujar()
+
+
+class EjecutorTareas:
+    """Grupo de hilos de trabajo para las consultas y operaciones masivas de la GUI.
+
+    Tk no admite llamadas desde otros hilos: las tareas solo calculan, y su resultado vuelve al
+    hilo principal por una cola que se revisa con root.after. Cada tarea pertenece a un canal;
+    enviar otra al mismo canal cancela la anterior (si no empezó no se ejecuta y, si ya corre,
+    se activa su evento `cancelado` y su resultado se descarta).
+    """
+    INTERVALO_SONDEO = 50  # Milisegundos entre revisiones de la cola
+    LLAMADAS_POR_CICLO = 500  # Máximo de llamadas de otros hilos por revisión, para no congelar la ventana
+
+    def __init__(self, root, hilos=2, al_cambiar_ocupado=None):
+        self.root = root
+        self.al_cambiar_ocupado = al_cambiar_ocupado  # Recibe las descripciones de las tareas en curso
+        self._hilos = ThreadPoolExecutor(max_workers=hilos, thread_name_prefix="tareas_gui")
+        self._resultados = queue.SimpleQueue()
+        self._llamadas = queue.SimpleQueue()  # Llamadas que otros hilos piden hacer en el de Tk
+        self._vigentes = {}  # canal -> tarea en curso
+        self._ids = itertools.count()
+        self._descripciones = ()
+        self._sondeo = self.root.after(self.INTERVALO_SONDEO, self._sondear)
+
+    def enviar(self, canal, funcion, al_terminar, al_fallar=None, descripcion=""):
+        """Ejecuta funcion(cancelado) en un hilo de trabajo y luego al_terminar(resultado) en el de Tk.
+
+        Si la función lanza una excepción se llama al_fallar(excepción) en su lugar.
+        """
+        self.cancelar(canal)
+        tarea = _Tarea(canal, next(self._ids), al_terminar, al_fallar, descripcion)
+        tarea.futuro = self._hilos.submit(self._ejecutar, tarea, funcion)
+        self._vigentes[canal] = tarea
+        self._notificar_ocupado()
+        return tarea
+
+    def cancelar(self, canal):
+        """Cancela la tarea en curso del canal, si la hay; su resultado se descartará."""
+        tarea = self._vigentes.pop(canal, None)
+        if tarea is not None:
+            tarea.cancelado.set()
+            tarea.futuro.cancel()
+            self._notificar_ocupado()
+
+    def _ejecutar(self, tarea, funcion):
+        # Corre en el hilo de trabajo: no debe tocar ningún widget
+        if tarea.cancelado.is_set():
+            return
+        try:
+            self._resultados.put((tarea, True, funcion(tarea.cancelado)))
+        except Exception as e:
+            self._resultados.put((tarea, False, e))
+
+    def en_hilo_principal(self, funcion, *args):
+        """Pide ejecutar funcion(*args) en el hilo de Tk; se puede llamar desde cualquier hilo."""
+        self._llamadas.put((funcion, args))
+
+    def hay_llamadas(self):
+        return not self._llamadas.empty()
+
+    def procesar_llamadas(self, limite=LLAMADAS_POR_CICLO):
+        """Ejecuta, en orden, hasta `limite` llamadas pendientes de otros hilos. True si quedan más."""
+        for _ in range(limite):
+            try:
+                funcion, args = self._llamadas.get_nowait()
+            except queue.Empty:
+                return False
+            funcion(*args)
+        return self.hay_llamadas()
+
+    def procesar_pendientes(self):
+        """Procesa un tramo de llamadas y los resultados de las tareas. True si quedaron llamadas."""
+        quedan = self.procesar_llamadas()
+        while True:
+            try:
+                tarea, exito, resultado = self._resultados.get_nowait()
+            except queue.Empty:
+                break
+            if self._vigentes.get(tarea.canal) is not tarea:
+                continue  # Reemplazada por una tarea más reciente del mismo canal
+            del self._vigentes[tarea.canal]
+            self._notificar_ocupado()
+            if exito:
+                tarea.al_terminar(resultado)
+            elif tarea.al_fallar is not None:
+                tarea.al_fallar(resultado)
+            else:
+                raise resultado
+        self._notificar_ocupado()
+        return quedan
+
+    def _sondear(self):
+        # Se reprograma antes de procesar para que un error en un callback no detenga el sondeo
+        self._sondeo = self.root.after(self.INTERVALO_SONDEO, self._sondear)
+        if self.procesar_pendientes():
+            # Quedan llamadas (p. ej. una importación grande): se sigue en cuanto Tk atienda sus eventos
+            self.root.after_cancel(self._sondeo)
+            self._sondeo = self.root.after(1, self._sondear)
+
+    def _notificar_ocupado(self):
+        descripciones = tuple(tarea.descripcion for tarea in self._vigentes.values())
+        if descripciones != self._descripciones:
+            self._descripciones = descripciones
+            if self.al_cambiar_ocupado is not None:
+                self.al_cambiar_ocupado(descripciones)
+
+    def ocupado(self, canal=None):
+        return bool(self._vigentes) if canal is None else canal in self._vigentes
+
+    def cerrar(self):
+        """Cancela lo pendiente y espera a que terminen las tareas en curso."""
+        self.root.after_cancel(self._sondeo)
+        for tarea in self._vigentes.values():
+            tarea.cancelado.set()
+        self._vigentes.clear()
+        self._hilos.shutdown(wait=True, cancel_futures=True)
+
+
+class _Tarea:
+    __slots__ = ("canal", "id", "al_terminar", "al_fallar", "descripcion", "cancelado", "futuro")
+
+    def __init__(self, canal, id_tarea, al_terminar, al_fallar, descripcion):
+        self.canal = canal
+        self.id = id_tarea
+        self.al_terminar = al_terminar
+        self.al_fallar = al_fallar
+        self.descripcion = descripcion
+        self.cancelado = threading.Event()
+        self.futuro = None
+
+
 class AppGestionEstudiantes:
     def __init__(self, root_window):
         self.root = root_window
@@ -174,41 +543,109 @@ class AppGestionEstudiantes:
         self.frame_botones = ttk.Frame(self.root, padding="10")
         self.frame_botones.pack(side=tk.TOP, fill=tk.X)
 
-        # Botones
-        ttk.Button(self.frame_botones, text="Agregar Estudiante", command=self.gui_agregar_estudiante).pack(side=tk.LEFT, padx=5)
-        ttk.Button(self.frame_botones, text="Eliminar Estudiante", command=self.gui_eliminar_estudiante).pack(side=tk.LEFT, padx=5)
-        ttk.Button(self.frame_botones, text="Buscar Estudiante", command=self.gui_buscar_estudiante).pack(side=tk.LEFT, padx=5)
-        ttk.Button(self.frame_botones, text="Promedio Superior a...", command=self.gui_promedio_superior).pack(side=tk.LEFT, padx=5)
-        ttk.Button(self.frame_botones, text="Materias de Estudiante", command=self.gui_materias_estudiante).pack(side=tk.LEFT, padx=5)
-        ttk.Button(self.frame_botones, text="Promedio General", command=self.gui_promedio_general).pack(side=tk.LEFT, padx=5)
-        ttk.Button(self.frame_botones, text="Refrescar Lista", command=self.actualizar_tabla_estudiantes).pack(side=tk.LEFT, padx=5)
-
-        # Treeview para mostrar estudiantes
+        # Botones (los que modifican el almacén se desactivan durante una operación masiva)
+        self.botones_modificacion = []
+        for texto, comando, modifica in [
+            ("Agregar Estudiante", self.gui_agregar_estudiante, True),
+            ("Eliminar Estudiante", self.gui_eliminar_estudiante, True),
+            ("Promedio Superior a...", self.gui_promedio_superior, False),
+            ("Materias de Estudiante", self.gui_materias_estudiante, False),
+            ("Promedio General", self.gui_promedio_general, False),
+            ("Refrescar Lista", self.actualizar_tabla_estudiantes, True),
+            ("Importar...", self.gui_importar, True),
+            ("Exportar...", self.gui_exportar, True),
+        ]:
+            boton = ttk.Button(self.frame_botones, text=texto, command=comando)
+            boton.pack(side=tk.LEFT, padx=5)
+            if modifica:
+                self.botones_modificacion.append(boton)
+
+        # Búsqueda en vivo por nombre o carné: cada tecla solo reprograma la búsqueda
+        self.frame_busqueda = ttk.Frame(self.root, padding=(10, 0, 10, 0))
+        self.frame_busqueda.pack(side=tk.TOP, fill=tk.X)
+        ttk.Label(self.frame_busqueda, text="Buscar (nombre o carné):").pack(side=tk.LEFT)
+        self.texto_busqueda = tk.StringVar(value="")
+        self.entry_busqueda = ttk.Entry(self.frame_busqueda, textvariable=self.texto_busqueda, width=40)
+        self.entry_busqueda.pack(side=tk.LEFT, padx=5)
+        self.entry_busqueda.bind("<Escape>", lambda e: self.texto_busqueda.set(""))
+        self._busqueda_programada = None
+        self.texto_busqueda.trace_add("write", self._al_escribir_busqueda)
+
+        # Barra de estado con indicador de progreso para las tareas en segundo plano
+        self.frame_estado = ttk.Frame(self.root, padding=(10, 0, 10, 5))
+        self.frame_estado.pack(side=tk.BOTTOM, fill=tk.X)
+        self.texto_estado = tk.StringVar(value="")
+        ttk.Label(self.frame_estado, textvariable=self.texto_estado).pack(side=tk.LEFT)
+        self.progreso = ttk.Progressbar(self.frame_estado, mode="indeterminate", length=200)
+        self._aviso_progreso = None
+        self.ejecutor = EjecutorTareas(self.root, al_cambiar_ocupado=self._al_cambiar_ocupado)
+        self.root.protocol("WM_DELETE_WINDOW", self.cerrar)
+
+        # Treeview virtualizado para mostrar estudiantes (con su propia barra de desplazamiento)
         self.cols = ("Carné", "Nombre", "Materias", "Promedio")
-        self.tree = ttk.Treeview(self.root, columns=self.cols, show='headings', selectmode="browse")
+        # El almacén es compacto: el carné se lee directo del atributo del registro
+        self.tabla = TablaVirtual(self.root, self.cols, self.valores_fila, operator.attrgetter("carne"))
+        self.tree = self.tabla.tree
         for col in self.cols:
             self.tree.heading(col, text=col)
             self.tree.column(col, width=150, anchor=tk.W) # Ajustar ancho según necesidad
         self.tree.column("Materias", width=300)
         self.tree.pack(side=tk.TOP, fill=tk.BOTH, expand=True, padx=10, pady=5)
 
-        # Scrollbar para el Treeview
-        scrollbar = ttk.Scrollbar(self.tree, orient=tk.VERTICAL, command=self.tree.yview)
-        self.tree.configure(yscroll=scrollbar.set)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-
+        self.vista_filtrada = False  # True mientras la tabla muestra resultados de búsqueda o umbral
+        self._refresco = None  # Identifica el último pedido de la lista completa (None = ninguno pendiente)
         self.actualizar_tabla_estudiantes()
+        # Cada cambio del almacén llega como evento y se aplica solo a la fila afectada
+        estudiantes.suscribir(self.aplicar_cambio)
+
+    @staticmethod
+    def valores_fila(est):
+        return (est["Carné"], est["Nombre"], ", ".join(est["Materias"]), f"{est['Promedio']:.2f}")
 
     def actualizar_tabla_estudiantes(self, lista_filtrada=None):
-        # Limpiar tabla actual
-        for i in self.tree.get_children():
-            self.tree.delete(i)
-        
-        # Poblar tabla con datos (todos o filtrados)
-        fuente_datos = lista_filtrada if lista_filtrada is not None else estudiantes
-        for est in fuente_datos:
-            materias_str = ", ".join(est["Materias"])
-            self.tree.insert("", tk.END, values=(est["Carné"], est["Nombre"], materias_str, f"{est['Promedio']:.2f}"))
+        # Solo se dibujan las filas visibles: el costo no depende de cuántos estudiantes haya.
+        # Un filtro nuevo vuelve al principio; refrescar la lista completa conserva la posición.
+        self.vista_filtrada = lista_filtrada is not None
+        if lista_filtrada is not None:
+            self._refresco = None  # Una copia completa pedida antes ya no debe reemplazar al filtro
+            self.tabla.mostrar(lista_filtrada, al_inicio=True)
+            return
+        # El hilo de Tk no toma el candado (una importación lo usa por lotes): un hilo de trabajo
+        # copia el almacén con el candado tomado y deja la copia en la cola de llamadas, detrás de
+        # los cambios anteriores a la copia y delante de los posteriores
+        refresco = self._refresco = object()
+
+        def copiar(cancelado):
+            with candado_estudiantes:
+                self.ejecutor.en_hilo_principal(self._mostrar_copia, refresco, list(estudiantes))
+
+        self.ejecutor.enviar("tabla", copiar, lambda _: None, al_fallar=self._mostrar_error,
+                             descripcion="Cargando la lista...")
+
+    def _mostrar_copia(self, refresco, filas):
+        if refresco is self._refresco:
+            self._refresco = None
+            self.tabla.mostrar(filas)
+
+    def aplicar_cambio(self, evento, carne, est):
+        # Los cambios de otros hilos (p. ej. importar) se aplican en el de Tk. Uno del hilo de Tk
+        # va a la cola si todavía hay cambios anteriores pendientes, para conservar el orden
+        if threading.current_thread() is not threading.main_thread() or self.ejecutor.hay_llamadas():
+            self.ejecutor.en_hilo_principal(self._aplicar_cambio, evento, carne, est)
+            return
+        self._aplicar_cambio(evento, carne, est)
+
+    def _aplicar_cambio(self, evento, carne, est):
+        # Diferencias fila por fila: O(1) respecto al tamaño de la tabla
+        if evento == EVENTO_AGREGADO:
+            if not self.vista_filtrada:  # Un estudiante nuevo no forma parte de un filtro ya calculado
+                self.tabla.agregar_fila(est)
+        elif evento == EVENTO_ELIMINADO:
+            self.tabla.quitar_fila(carne)
+        elif evento == EVENTO_ACTUALIZADO:
+            self.tabla.actualizar_fila(est)
+        elif evento == EVENTO_LIMPIADO:
+            self.tabla.mostrar([], al_inicio=True)
 
     def gui_agregar_estudiante(self):
         # Crear una ventana Toplevel para el formulario de agregar estudiante
@@ -275,10 +712,13 @@ class AppGestionEstudiantes:
             messagebox.showerror("Error de Entrada", "El promedio debe ser un número.", parent=self.win_agregar)
             return
 
-        exito, mensaje, _ = agregar_estudiante_logica(nombre, anio, materias, promedio)
+        exito, mensaje, estudiante = agregar_estudiante_logica(nombre, anio, materias, promedio)
         if exito:
+            # La fila ya se agregó por el evento del almacén; solo falta mostrarla
+            if self.vista_filtrada:
+                self.actualizar_tabla_estudiantes()
+            self.tabla.mostrar_fila(estudiante["Carné"])
             messagebox.showinfo("Éxito", mensaje, parent=self.win_agregar)
-            self.actualizar_tabla_estudiantes()
             self.win_agregar.destroy()
         else:
             messagebox.showerror("Error", mensaje, parent=self.win_agregar)
@@ -288,59 +728,145 @@ class AppGestionEstudiantes:
         if carne:
             exito, mensaje = eliminar_estudiante_logica(carne.strip())
             if exito:
-                messagebox.showinfo("Éxito", mensaje, parent=self.root)
-                self.actualizar_tabla_estudiantes()
+                messagebox.showinfo("Éxito", mensaje, parent=self.root)  # La fila ya se quitó por el evento
             else:
                 messagebox.showerror("Error", mensaje, parent=self.root)
 
-    def gui_buscar_estudiante(self):
-        termino = simpledialog.askstring("Buscar Estudiante", "Ingrese Nombre o Carné a buscar:", parent=self.root)
-        if termino:
-            resultados = buscar_estudiante_logica(termino.strip())
-            if resultados:
-                self.actualizar_tabla_estudiantes(lista_filtrada=resultados)
-                messagebox.showinfo("Resultados de Búsqueda", f"{len(resultados)} estudiante(s) encontrado(s). Mostrando en tabla.", parent=self.root)
-            else:
-                messagebox.showinfo("Sin Resultados", f"No se encontraron estudiantes para '{termino}'.", parent=self.root)
-                self.actualizar_tabla_estudiantes() # Mostrar todos si no hay resultados
-    
+    # --- Tareas en segundo plano ---
+
+    def consultar(self, funcion, al_terminar, descripcion):
+        # Las consultas comparten canal: una nueva cancela la que siga en curso
+        self.ejecutor.enviar("consulta", lambda cancelado: funcion(), al_terminar,
+                             al_fallar=self._mostrar_error, descripcion=descripcion)
+
+    def _mostrar_error(self, error):
+        messagebox.showerror("Error", f"Error inesperado: {error}", parent=self.root)
+
+    def _al_cambiar_ocupado(self, descripciones):
+        self.texto_estado.set(" | ".join(d for d in descripciones if d))
+        hay_masiva = self.ejecutor.ocupado("masiva")
+        for boton in self.botones_modificacion:
+            boton.state(["disabled"] if hay_masiva else ["!disabled"])
+        if descripciones:
+            # Solo los trabajos largos muestran la barra: se espera un momento antes de mostrarla
+            if self._aviso_progreso is None and not self.progreso.winfo_ismapped():
+                self._aviso_progreso = self.root.after(RETARDO_PROGRESO, self._mostrar_progreso)
+        else:
+            if self._aviso_progreso is not None:
+                self.root.after_cancel(self._aviso_progreso)
+                self._aviso_progreso = None
+            self.progreso.stop()
+            self.progreso.pack_forget()
+
+    def _mostrar_progreso(self):
+        self._aviso_progreso = None
+        self.progreso.pack(side=tk.RIGHT)
+        self.progreso.start(10)
+
+    def cerrar(self):
+        self.ejecutor.cerrar()  # Una importación en curso se detiene en la fila siguiente
+        estudiantes.desuscribir(self.aplicar_cambio)
+        self.root.destroy()
+
+    # --- Acciones de los botones ---
+
+    def _al_escribir_busqueda(self, *_):
+        # Antirrebote: solo se busca cuando se deja de teclear por RETARDO_BUSQUEDA ms
+        if self._busqueda_programada is not None:
+            self.root.after_cancel(self._busqueda_programada)
+        self._busqueda_programada = self.root.after(RETARDO_BUSQUEDA, self._buscar_en_vivo)
+
+    def _buscar_en_vivo(self):
+        self._busqueda_programada = None
+        termino = self.texto_busqueda.get().strip()
+        if not termino:
+            self.ejecutor.cancelar("consulta")  # Descarta una búsqueda en curso
+            if self.vista_filtrada:
+                self.actualizar_tabla_estudiantes()
+            return
+        self.consultar(lambda: buscar_en_vivo_logica(termino),
+                       lambda resultado: self._mostrar_busqueda(termino, *resultado),
+                       f"Buscando '{termino}'...")
+
+    def _mostrar_busqueda(self, termino, version, resultados):
+        if version != sistema.buscador.version:
+            self._buscar_en_vivo()  # El almacén cambió mientras se buscaba: repetir con los datos nuevos
+            return
+        self.actualizar_tabla_estudiantes(lista_filtrada=resultados)
+        self.texto_estado.set(f"{len(resultados)} estudiante(s) para '{termino}'." if resultados
+                              else f"No se encontraron estudiantes para '{termino}'.")
+
     def gui_promedio_superior(self):
         umbral_str = simpledialog.askstring("Promedio Superior", "Ingrese el umbral de promedio (ej. 8.0):", parent=self.root)
         if umbral_str:
             try:
                 umbral = float(umbral_str)
-                resultados = mostrar_promedio_superior_logica(umbral)
-                if resultados:
-                    self.actualizar_tabla_estudiantes(lista_filtrada=resultados)
-                    messagebox.showinfo("Resultados", f"{len(resultados)} estudiante(s) con promedio superior a {umbral:.2f}.", parent=self.root)
-                else:
-                    messagebox.showinfo("Sin Resultados", f"No hay estudiantes con promedio superior a {umbral:.2f}.", parent=self.root)
-                    self.actualizar_tabla_estudiantes() # Mostrar todos si no hay resultados
             except ValueError:
                 messagebox.showerror("Error de Entrada", "El umbral debe ser un número.", parent=self.root)
+                return
+            self.consultar(lambda: mostrar_promedio_superior_logica(umbral),
+                           lambda resultados: self._mostrar_superiores(umbral, resultados),
+                           f"Buscando promedios superiores a {umbral:.2f}...")
+
+    def _mostrar_superiores(self, umbral, resultados):
+        if resultados:
+            self.actualizar_tabla_estudiantes(lista_filtrada=resultados)
+            messagebox.showinfo("Resultados", f"{len(resultados)} estudiante(s) con promedio superior a {umbral:.2f}, de mayor a menor promedio.", parent=self.root)
+        else:
+            messagebox.showinfo("Sin Resultados", f"No hay estudiantes con promedio superior a {umbral:.2f}.", parent=self.root)
+            self.actualizar_tabla_estudiantes() # Mostrar todos si no hay resultados
 
     def gui_materias_estudiante(self):
         carne = simpledialog.askstring("Materias del Estudiante", "Ingrese el Carné del estudiante:", parent=self.root)
         if carne:
-            estudiante = mostrar_materias_estudiante_logica(carne.strip())
-            if estudiante:
-                materias_str = "\n".join([f"- {m}" for m in estudiante['Materias']]) if estudiante['Materias'] else "No tiene materias inscritas."
-                messagebox.showinfo(f"Materias de {estudiante['Nombre']}", 
-                                    f"Carné: {estudiante['Carné']}\n\nMaterias:\n{materias_str}", parent=self.root)
-            else:
-                messagebox.showerror("Error", f"Estudiante con carné {carne} no encontrado.", parent=self.root)
+            carne = carne.strip()
+            self.consultar(lambda: mostrar_materias_estudiante_logica(carne),
+                           lambda estudiante: self._mostrar_materias(carne, estudiante),
+                           f"Buscando el carné {carne}...")
+
+    def _mostrar_materias(self, carne, estudiante):
+        if estudiante:
+            materias_str = "\n".join([f"- {m}" for m in estudiante['Materias']]) if estudiante['Materias'] else "No tiene materias inscritas."
+            messagebox.showinfo(f"Materias de {estudiante['Nombre']}", 
+                                f"Carné: {estudiante['Carné']}\n\nMaterias:\n{materias_str}", parent=self.root)
+        else:
+            messagebox.showerror("Error", f"Estudiante con carné {carne} no encontrado.", parent=self.root)
 
     def gui_promedio_general(self):
-        promedio = calcular_promedio_general_logica()
+        self.consultar(calcular_promedio_general_logica, self._mostrar_promedio_general, "Calculando el promedio general...")
+
+    def _mostrar_promedio_general(self, promedio):
         if promedio is not None:
             messagebox.showinfo("Promedio General", f"El promedio general de todos los estudiantes es: {promedio:.2f}", parent=self.root)
         else:
             messagebox.showinfo("Promedio General", "No hay estudiantes registrados para calcular el promedio.", parent=self.root)
 
+    def gui_importar(self):
+        ruta = filedialog.askopenfilename(parent=self.root, title="Importar estudiantes",
+                                          filetypes=[("CSV o JSONL", "*.csv *.jsonl *.csv.gz *.jsonl.gz"), ("Todos", "*")])
+        if ruta:
+            self.ejecutor.enviar("masiva", lambda cancelado: importar_archivo_logica(ruta, detener=cancelado),
+                                 self._mostrar_importacion, al_fallar=self._mostrar_error,
+                                 descripcion=f"Importando {os.path.basename(ruta)}...")
+
+    def _mostrar_importacion(self, resultado):
+        messagebox.showinfo("Importación", f"Importados: {resultado.aceptados}. Rechazados: {resultado.rechazados}.", parent=self.root)
+
+    def gui_exportar(self):
+        ruta = filedialog.asksaveasfilename(parent=self.root, title="Exportar estudiantes", defaultextension=".csv",
+                                            filetypes=[("CSV", "*.csv"), ("JSONL", "*.jsonl"), ("Columnar", "*.col")])
+        if ruta:
+            self.ejecutor.enviar("masiva", lambda cancelado: exportar_archivo_logica(ruta),
+                                 lambda cantidad: messagebox.showinfo("Exportación", f"Se exportaron {cantidad} estudiantes.", parent=self.root),
+                                 al_fallar=self._mostrar_error, descripcion=f"Exportando a {os.path.basename(ruta)}...")
+
 # --- Ejecución Principal ---
 if __name__ == "__main__":
-    poblar_datos_iniciales() # Poblar datos antes de iniciar la GUI
+    # Cargar los datos guardados; si no hay, poblar antes de iniciar la GUI
+    if not sistema.abrir():
+        poblar_datos_iniciales()
     
     main_window = tk.Tk()
     app = AppGestionEstudiantes(main_window)
-    main_window.mainloop()
\ No newline at end of file
+    main_window.mainloop()
+    sistema.cerrar()
\ No newline at end of file
@@ -2,9 +2,13 @@
 # Este programa permite gestionar la información de estudiantes utilizando diversas estructuras de datos de Python.
 
 # --- Documentación de Estructuras de Datos Utilizadas ---
-# - lista_estudiantes (list): Se utiliza una lista para almacenar a todos los estudiantes.
-#   Las listas son colecciones ordenadas y mutables, lo que permite agregar, eliminar y acceder
-#   a los estudiantes por su índice si fuera necesario, y mantener un orden de inserción.
+# - lista_estudiantes (AlmacenEstudiantes): Almacena a todos los estudiantes en orden de inserción.
+#   Internamente combina una lista con un diccionario carné -> posición, de modo que buscar o
+#   eliminar un estudiante por carné es O(1) en lugar de recorrer toda la lista.
+#   Se puede recorrer y consultar con len() igual que una lista.
+#   También mantiene un índice ordenado por promedio: la opción 4 (promedio superior a) lista a los
+#   estudiantes de mayor a menor promedio (a igual promedio, el inscrito más reciente primero), y no
+#   en orden de inserción como la versión original.
 #
 # - set_carnes (set): Se utiliza un set para almacenar todos los carnés de los estudiantes existentes.
 #   Los sets son colecciones desordenadas de elementos únicos. Esto es ideal para:
@@ -16,6 +20,8 @@
 #   Esto facilita el acceso a los atributos específicos de un estudiante (nombre, carné, etc.)
 #   de manera legible y directa.
 #   Ejemplo: {'nombre': 'Ana', 'carne': '0905-23-1234', ...}
+#   El almacén guarda cada diccionario como un RegistroEstudiante compacto (__slots__ y materias
+#   empaquetadas), que se sigue leyendo con las mismas claves pero ocupa mucha menos memoria.
 #
 # - Materias inscritas (list de tuplas): Dentro del diccionario de cada estudiante, la clave 'materias'
 #   almacena una lista de tuplas. Cada tupla representa una materia.
@@ -23,24 +29,48 @@
 #   Se usan tuplas para cada materia ('nombre_materia', creditos_materia) porque las tuplas son inmutables.
 #   Esto significa que una vez que se define el nombre y los créditos de una materia inscrita,
 #   estos no deberían cambiar accidentalmente para esa inscripción específica.
+#
+# - Persistencia: cada alta y baja se escribe en una bitácora en disco (datos_estudiantes/) antes de
+#   confirmarla, con instantáneas periódicas. Al reiniciar se recuperan los datos guardados en lugar
+#   de generar estudiantes nuevos.
+#
+# Importar este módulo no lee el disco, no genera estudiantes ni abre el menú: solo define el
+# sistema y las funciones, para poder reutilizarlas desde otros scripts. El programa interactivo
+# se inicia con main() (python student_management.py [--ejemplos N]).
+#
+# Modo por lotes, sin menú: python student_management.py --lote operaciones.jsonl (o '-' para la
+# entrada estándar) ejecuta un objeto JSON de operación por línea y escribe un resultado JSON por
+# línea; la bitácora se sincroniza una vez por lote (ver gestion_estudiantes/lotes.py).
+
+import os
+import sys
 
-import random
+from gestion_estudiantes import ESQUEMA_CLI, GestorEstudiantes, ejecutar_archivo
+from gestion_estudiantes.registro import SIN_CREDITOS
 
-# Lista principal para almacenar estudiantes
-lista_estudiantes = []
+# Directorio donde se guardan la bitácora y las instantáneas
+DIRECTORIO_DATOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "datos_estudiantes")
 
 # Set para almacenar carnés únicos
 set_carnes = set()
 
+# Motor compartido con las versiones de propuestaRony: almacén, carnés y persistencia
+sistema = GestorEstudiantes(ESQUEMA_CLI, DIRECTORIO_DATOS, set_carnes)
+
+# Almacén principal de estudiantes (mantiene set_carnes sincronizado)
+lista_estudiantes = sistema.almacen
+
+# Asignador de carnés por año (0905-YY-xxxx): se entera de cada alta y baja del almacén
+asignador_carnes = sistema.asignador
+
 # Función para agregar un estudiante
 # Solicita al usuario los datos del nuevo estudiante y verifica que el carné no exista previamente.
 def agregar_estudiante(lista_estudiantes_local, set_carnes_local):
     nombre = input("Ingrese el nombre del estudiante: ")
     while True:
         carne = input("Ingrese el carné del estudiante (formato '0905-YY-xxxx', ej: 0905-24-1234): ")
-        # Validación básica del formato (se podría mejorar con regex)
-        parts = carne.split('-')
-        if len(parts) == 3 and parts[0] == "0905" and len(parts[1]) == 2 and parts[1].isdigit() and len(parts[2]) == 4 and parts[2].isdigit():
+        # Validación del formato con el patrón precompilado del esquema (el mismo que usa la importación masiva)
+        if ESQUEMA_CLI.validar_carne(carne):
             break
         else:
             print("Formato de carné incorrecto. Debe ser '0905-YY-xxxx'. Intente de nuevo.")
@@ -61,10 +91,10 @@ def agregar_estudiante(lista_estudiantes_local, set_carnes_local):
             while True:
                 try:
                     creditos_materia = int(input(f"Ingrese los créditos de la materia {i+1} (ej: 3): "))
-                    if creditos_materia > 0:
+                    if 0 < creditos_materia < SIN_CREDITOS: # El registro compacto guarda los créditos en 16 bits
                         break
                     else:
-                        print("Los créditos deben ser un número positivo.")
+                        print(f"Los créditos deben ser un número entre 1 y {SIN_CREDITOS - 1}.")
                 except ValueError:
                     print("Entrada inválida para créditos. Por favor ingrese un número.")
             materias.append((nombre_materia, creditos_materia))
@@ -84,21 +114,19 @@ def agregar_estudiante(lista_estudiantes_local, set_carnes_local):
 
 
     estudiante = {'nombre': nombre, 'carne': carne, 'materias': materias, 'promedio': promedio}
-    lista_estudiantes_local.append(estudiante)
-    set_carnes_local.add(carne)
+    try:
+        lista_estudiantes_local.agregar(estudiante) # También registra el carné en el set
+    except ValueError as error:
+        print(f"Error: {error}")
+        return
     print("Estudiante agregado exitosamente.")
 
 # Función para eliminar un estudiante
+# El almacén localiza y elimina el registro por carné en O(1); también lo quita del set.
 def eliminar_estudiante(lista_estudiantes_local, set_carnes_local, carne_a_eliminar):
-    estudiante_encontrado = None
-    for estudiante in lista_estudiantes_local:
-        if estudiante['carne'] == carne_a_eliminar:
-            estudiante_encontrado = estudiante
-            break # Optimización: salir del bucle una vez encontrado
+    estudiante_encontrado = lista_estudiantes_local.eliminar(carne_a_eliminar)
 
     if estudiante_encontrado:
-        lista_estudiantes_local.remove(estudiante_encontrado)
-        set_carnes_local.remove(carne_a_eliminar) # Asumimos que si está en la lista, está en el set
         print("Estudiante eliminado exitosamente.")
     else:
         print("Error: Estudiante no encontrado.")
@@ -107,14 +135,15 @@ def eliminar_estudiante(lista_estudiantes_local, set_carnes_local, carne_a_elimi
 # Función para buscar un estudiante
 def buscar_estudiante(lista_estudiantes_local, criterio, valor_busqueda):
     resultados = []
-    valor_busqueda_lower = valor_busqueda.lower() # Para búsqueda insensible a mayúsculas
 
-    for estudiante in lista_estudiantes_local:
-        if criterio == 'nombre' and valor_busqueda_lower in estudiante['nombre'].lower():
-            resultados.append(estudiante)
-        elif criterio == 'carne' and estudiante['carne'] == valor_busqueda: # El carné es único, búsqueda exacta
+    if criterio == 'carne':
+        # El carné es único: búsqueda exacta directa en el índice hash
+        estudiante = lista_estudiantes_local.obtener(valor_busqueda)
+        if estudiante:
             resultados.append(estudiante)
-            break # Si se busca por carné y se encuentra, no hay necesidad de seguir buscando
+    elif criterio == 'nombre':
+        # Búsqueda parcial insensible a mayúsculas usando el índice de trigramas
+        resultados = lista_estudiantes_local.buscar_por_nombre(valor_busqueda)
 
     if resultados:
         print("\n--- Resultados de la Búsqueda ---")
@@ -128,89 +157,48 @@ def buscar_estudiante(lista_estudiantes_local, criterio, valor_busqueda):
         print("No se encontraron estudiantes que coincidan con el criterio de búsqueda.")
 
 # Función para mostrar estudiantes con promedio superior a un valor dado
+# Usa el índice ordenado por promedio: solo se recorren los k estudiantes que cumplen (de mayor a menor).
 def mostrar_estudiantes_promedio_superior(lista_estudiantes_local, promedio_minimo):
     encontrados = False
-    print(f"\n--- Estudiantes con Promedio Superior a {promedio_minimo} ---")
-    for estudiante in lista_estudiantes_local:
-        if estudiante['promedio'] > promedio_minimo:
-            print(f"Nombre: {estudiante['nombre']}, Carné: {estudiante['carne']}, Promedio: {estudiante['promedio']}")
-            encontrados = True
+    print(f"\n--- Estudiantes con Promedio Superior a {promedio_minimo} (de mayor a menor) ---")
+    for estudiante in lista_estudiantes_local.promedios.superiores_a(promedio_minimo):
+        print(f"Nombre: {estudiante['nombre']}, Carné: {estudiante['carne']}, Promedio: {estudiante['promedio']}")
+        encontrados = True
     if not encontrados:
         print(f"No hay estudiantes con promedio superior a {promedio_minimo}.")
 
 # Función para mostrar materias de un estudiante
 def mostrar_materias_estudiante(lista_estudiantes_local, carne_estudiante):
-    for estudiante in lista_estudiantes_local:
-        if estudiante['carne'] == carne_estudiante:
-            print(f"\n--- Materias de {estudiante['nombre']} (Carné: {estudiante['carne']}) ---")
-            if estudiante['materias']:
-                for materia, creditos in estudiante['materias']:
-                    print(f"- {materia} ({creditos} créditos)")
-            else:
-                print("Este estudiante no tiene materias inscritas.")
-            return
+    estudiante = lista_estudiantes_local.obtener(carne_estudiante)
+    if estudiante:
+        print(f"\n--- Materias de {estudiante['nombre']} (Carné: {estudiante['carne']}) ---")
+        if estudiante['materias']:
+            for materia, creditos in estudiante['materias']:
+                print(f"- {materia} ({creditos} créditos)")
+        else:
+            print("Este estudiante no tiene materias inscritas.")
+        return
     print("Error: Estudiante no encontrado.")
 
 # Función para calcular el promedio general del grupo
+# Las estadísticas del almacén se actualizan en cada alta/baja, así que no se recorre la lista.
 def calcular_promedio_general_grupo(lista_estudiantes_local):
     if not lista_estudiantes_local:
         print("No hay estudiantes en la lista para calcular el promedio general.")
         return
-    suma_promedios = sum(estudiante['promedio'] for estudiante in lista_estudiantes_local)
-    promedio_general = suma_promedios / len(lista_estudiantes_local)
+    promedio_general = lista_estudiantes_local.estadisticas.promedio()
     print(f"El promedio general del grupo es: {promedio_general:.2f}")
 
 
 # --- Población Inicial de Datos ---
 # Generar y agregar automáticamente 30 estudiantes de ejemplo
-def poblar_datos_iniciales(num_estudiantes=30):
+def poblar_datos_iniciales(num_estudiantes=30, semilla=None):
     print(f"Generando {num_estudiantes} estudiantes de ejemplo...")
-    nombres_base = ["Ana", "Juan", "María", "Carlos", "Laura", "Luis", "Sofía", "David", "Elena", "Miguel", "Valentina", "Diego", "Camila", "Andrés", "Isabella"]
-    apellidos = ["Pérez", "López", "García", "Sánchez", "Fernández", "Rodríguez", "Martínez", "Gómez", "Jiménez", "Hernández", "Díaz", "Ruiz", "Álvarez", "Moreno", "Romero"]
-    nombres_materias_posibles = ["Programación", "Cálculo", "Física", "Química", "Historia", "Literatura", "Álgebra Lineal", "Estadística Aplicada", "Bases de Datos", "Redes de Computadoras", "Inglés Técnico", "Metodología de Investigación"]
-    sufijos_materias = ["I", "II", "Avanzada", "Fundamental"]
-
-    for _ in range(num_estudiantes):
-        nombre_completo = f"{random.choice(nombres_base)} {random.choice(apellidos)} {random.choice(apellidos)}"
-
-        # Generar carné en formato 0905-YY-xxxx
-        yy = random.randint(18, 25) # Para años entre 2018 y 2025
-        xxxx = random.randint(1, 9999)
-        carne_generado = f"0905-{yy:02d}-{xxxx:04d}" # :02d y :04d aseguran ceros a la izquierda
-
-        while carne_generado in set_carnes: # Asegurar unicidad
-            yy = random.randint(18, 25)
-            xxxx = random.randint(1, 9999)
-            carne_generado = f"0905-{yy:02d}-{xxxx:04d}"
-
-        # Generar materias aleatorias
-        num_materias_rand = random.randint(2, 5)
-        materias_generadas = []
-        materias_usadas_temp = set() # Para evitar materias duplicadas para el mismo estudiante
-        for _ in range(num_materias_rand):
-            nombre_mat_base = random.choice(nombres_materias_posibles)
-            sufijo_mat = random.choice(sufijos_materias)
-            nombre_mat_completo = f"{nombre_mat_base} {sufijo_mat}"
-            # Asegurar que la materia no se repita para el mismo estudiante
-            while nombre_mat_completo in materias_usadas_temp:
-                 nombre_mat_base = random.choice(nombres_materias_posibles)
-                 sufijo_mat = random.choice(sufijos_materias)
-                 nombre_mat_completo = f"{nombre_mat_base} {sufijo_mat}"
-            materias_usadas_temp.add(nombre_mat_completo)
-
-            cred_mat = random.randint(2, 5)
-            materias_generadas.append((nombre_mat_completo, cred_mat))
-
-        promedio_generado = round(random.uniform(5.0, 10.0), 1) # Promedios con un decimal
-
-        estudiante = {'nombre': nombre_completo, 'carne': carne_generado, 'materias': materias_generadas, 'promedio': promedio_generado}
-        lista_estudiantes.append(estudiante)
-        set_carnes.add(carne_generado)
+    # El generador reparte carnés 0905-YY-xxxx (años 2018 a 2025) con el asignador del sistema
+    # y arma las materias a partir del catálogo de ejemplo, sin repetir materias por estudiante
+    sistema.poblar(num_estudiantes, semilla=semilla)
     print(f"Se han generado y agregado {len(lista_estudiantes)} estudiantes de ejemplo.")
 
-# Llama a la función para poblar los datos al iniciar el programa
-poblar_datos_iniciales()
-
 
 # --- Menú de Usuario ---
 def mostrar_menu():
@@ -224,59 +212,104 @@ def mostrar_menu():
     print("7. Mostrar todos los estudiantes (para depuración)")
     print("8. Salir")
 
-while True:
-    mostrar_menu()
-    opcion = input("Seleccione una opción: ")
-
-    if opcion == '1':
-        agregar_estudiante(lista_estudiantes, set_carnes)
-    elif opcion == '2':
-        if not lista_estudiantes:
-            print("No hay estudiantes para eliminar.")
-            continue
-        carne_a_eliminar = input("Ingrese el carné del estudiante a eliminar (formato '0905-YY-xxxx'): ")
-        eliminar_estudiante(lista_estudiantes, set_carnes, carne_a_eliminar)
-    elif opcion == '3':
-        if not lista_estudiantes:
-            print("No hay estudiantes para buscar.")
-            continue
-        while True:
-            criterio = input("Buscar por 'nombre' o 'carne': ").lower()
-            if criterio in ['nombre', 'carne']:
-                break
-            print("Criterio no válido. Por favor ingrese 'nombre' o 'carne'.")
-        valor_busqueda = input("Ingrese el valor de búsqueda: ")
-        buscar_estudiante(lista_estudiantes, criterio, valor_busqueda)
-    elif opcion == '4':
-        if not lista_estudiantes:
-            print("No hay estudiantes para mostrar.")
-            continue
-        while True:
-            try:
-                promedio_minimo = float(input("Ingrese el promedio mínimo para mostrar (ej: 8.0): "))
-                break
-            except ValueError:
-                print("Entrada inválida. Por favor ingrese un número.")
-        mostrar_estudiantes_promedio_superior(lista_estudiantes, promedio_minimo)
-    elif opcion == '5':
-        if not lista_estudiantes:
-            print("No hay estudiantes para mostrar sus materias.")
-            continue
-        carne_estudiante = input("Ingrese el carné del estudiante (formato '0905-YY-xxxx'): ")
-        mostrar_materias_estudiante(lista_estudiantes, carne_estudiante)
-    elif opcion == '6':
-        calcular_promedio_general_grupo(lista_estudiantes)
-    elif opcion == '7': # Opción de depuración para ver todos los estudiantes
-        if not lista_estudiantes:
-            print("No hay estudiantes registrados.")
+def ejecutar_menu():
+    """Ciclo del menú interactivo; termina con la opción 8."""
+    while True:
+        mostrar_menu()
+        opcion = input("Seleccione una opción: ")
+
+        if opcion == '1':
+            agregar_estudiante(lista_estudiantes, set_carnes)
+        elif opcion == '2':
+            if not lista_estudiantes:
+                print("No hay estudiantes para eliminar.")
+                continue
+            carne_a_eliminar = input("Ingrese el carné del estudiante a eliminar (formato '0905-YY-xxxx'): ")
+            eliminar_estudiante(lista_estudiantes, set_carnes, carne_a_eliminar)
+        elif opcion == '3':
+            if not lista_estudiantes:
+                print("No hay estudiantes para buscar.")
+                continue
+            while True:
+                criterio = input("Buscar por 'nombre' o 'carne': ").lower()
+                if criterio in ['nombre', 'carne']:
+                    break
+                print("Criterio no válido. Por favor ingrese 'nombre' o 'carne'.")
+            valor_busqueda = input("Ingrese el valor de búsqueda: ")
+            buscar_estudiante(lista_estudiantes, criterio, valor_busqueda)
+        elif opcion == '4':
+            if not lista_estudiantes:
+                print("No hay estudiantes para mostrar.")
+                continue
+            while True:
+                try:
+                    promedio_minimo = float(input("Ingrese el promedio mínimo para mostrar (ej: 8.0): "))
+                    break
+                except ValueError:
+                    print("Entrada inválida. Por favor ingrese un número.")
+            mostrar_estudiantes_promedio_superior(lista_estudiantes, promedio_minimo)
+        elif opcion == '5':
+            if not lista_estudiantes:
+                print("No hay estudiantes para mostrar sus materias.")
+                continue
+            carne_estudiante = input("Ingrese el carné del estudiante (formato '0905-YY-xxxx'): ")
+            mostrar_materias_estudiante(lista_estudiantes, carne_estudiante)
+        elif opcion == '6':
+            calcular_promedio_general_grupo(lista_estudiantes)
+        elif opcion == '7': # Opción de depuración para ver todos los estudiantes
+            if not lista_estudiantes:
+                print("No hay estudiantes registrados.")
+            else:
+                print("\n--- Lista Completa de Estudiantes ---")
+                for idx, est in enumerate(lista_estudiantes):
+                    print(f"{idx+1}. {est['nombre']} - {est['carne']} - Prom: {est['promedio']}")
+                    # print(f"   Materias: {est['materias']}") # Descomentar para ver materias
+                print(f"Total de carnés en set_carnes: {len(set_carnes)}") # Verificar consistencia
+        elif opcion == '8':
+            print("Saliendo del sistema. ¡Hasta luego!")
+            break
+        else:
+            print("Opción no válida. Intente de nuevo.")
+
+
+def ejecutar_lote(ruta):
+    """Modo por lotes: resultados JSONL en la salida estándar y un resumen en la de errores."""
+    sistema.abrir()  # Sin datos de ejemplo: el lote trabaja solo sobre lo guardado
+    try:
+        if ruta == "-":
+            resumen = ejecutar_archivo(sistema, sys.stdin, sys.stdout)
         else:
-            print("\n--- Lista Completa de Estudiantes ---")
-            for idx, est in enumerate(lista_estudiantes):
-                print(f"{idx+1}. {est['nombre']} - {est['carne']} - Prom: {est['promedio']}")
-                # print(f"   Materias: {est['materias']}") # Descomentar para ver materias
-            print(f"Total de carnés en set_carnes: {len(set_carnes)}") # Verificar consistencia
-    elif opcion == '8':
-        print("Saliendo del sistema. ¡Hasta luego!")
-        break
-    else:
-        print("Opción no válida. Intente de nuevo.")
\ No newline at end of file
+            with open(ruta, encoding="utf-8") as entrada:
+                resumen = ejecutar_archivo(sistema, entrada, sys.stdout)
+    finally:
+        sistema.cerrar()
+    print(f"{resumen.operaciones} operaciones, {resumen.fallidas} con error.", file=sys.stderr)
+    return 1 if resumen.fallidas else 0
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Sistema de Gestión de Estudiantes")
+    parser.add_argument("--ejemplos", type=int, default=30, metavar="N",
+                        help="estudiantes de ejemplo a generar si no hay datos guardados (0 = ninguno)")
+    parser.add_argument("--lote", metavar="ARCHIVO",
+                        help="ejecutar las operaciones JSONL del archivo ('-' = entrada estándar) sin abrir el menú")
+    argumentos = parser.parse_args(argv)
+
+    if argumentos.lote:
+        return ejecutar_lote(argumentos.lote)
+
+    # Carga los datos guardados; solo si no existen se pueblan los datos de ejemplo
+    if sistema.abrir():
+        print(f"Se cargaron {len(lista_estudiantes)} estudiantes guardados.")
+    elif argumentos.ejemplos > 0:
+        poblar_datos_iniciales(argumentos.ejemplos)
+    try:
+        ejecutar_menu()
+    finally:
+        sistema.cerrar()  # También si la entrada se corta (EOF, Ctrl+C)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Las pruebas importan gestion_estudiantes desde la raíz del repositorio, como los benchmarks
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
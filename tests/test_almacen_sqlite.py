@@ -0,0 +1,53 @@
+import math
+
+import pytest
+
+from gestion_estudiantes import AlmacenSQLite, GestorEstudiantes
+
+
+def _normalizar(est):
+    return est["carne"], est["nombre"], [tuple(m) for m in est["materias"]], est["promedio"]
+
+
+@pytest.fixture
+def grupo():
+    sistema = GestorEstudiantes()
+    sistema.poblar(800, semilla=5)
+    return sistema
+
+
+def test_misma_busqueda_que_el_almacen_en_memoria(tmp_path, grupo):
+    with AlmacenSQLite(str(tmp_path / "grupo.db")) as almacen:
+        almacen.agregar_varios(grupo.estudiantes())
+        carne = grupo.estudiantes()[7]["carne"]
+        for termino in ["pér", "LÓPEZ", "an", 'a"b', carne]:
+            esperados = [_normalizar(est) for est in grupo.buscar(termino, incluir_carne=True)]
+            assert [_normalizar(est) for est in almacen.buscar_por_nombre(termino, incluir_carne=True)] == esperados
+        assert ([_normalizar(est) for est in almacen.superiores_a(8.0)]
+                == [_normalizar(est) for est in grupo.superiores_a(8.0)])
+
+
+def test_la_suma_del_resumen_no_se_desvia(tmp_path):
+    promedios = [0.1, 0.2, 0.3, 9.7, 8.35, 7.15]
+    with AlmacenSQLite(str(tmp_path / "grupo.db"), sincronizar=False) as almacen:
+        almacen.agregar({"carne": "0905-24-0001", "nombre": "Fija", "materias": [], "promedio": 8.0})
+        with almacen.lote():
+            for vuelta in range(300):
+                for i, promedio in enumerate(promedios):
+                    almacen.agregar({"carne": f"0905-25-{i:04d}", "nombre": "T", "materias": [], "promedio": promedio})
+                for i in range(len(promedios)):
+                    almacen.eliminar(f"0905-25-{i:04d}")
+        assert almacen.promedio() == 8.0
+        almacen.agregar({"carne": "0905-24-0002", "nombre": "Otra", "materias": [], "promedio": 7.1})
+        assert math.isclose(almacen.promedio(), 7.55)
+
+
+def test_recibe_la_ruta_del_archivo(tmp_path):
+    with pytest.raises(ValueError):
+        AlmacenSQLite(str(tmp_path))
+    ruta = tmp_path / "datos" / "grupo"  # Sin extensión sigue siendo un archivo
+    with AlmacenSQLite(str(ruta)) as almacen:
+        almacen.agregar({"carne": "0905-24-0001", "nombre": "Ana", "materias": [("Cálculo I", 4)], "promedio": 9.0})
+    assert ruta.is_file()
+    with AlmacenSQLite(str(ruta)) as almacen:
+        assert almacen.obtener("0905-24-0001")["materias"] == [("Cálculo I", 4)]
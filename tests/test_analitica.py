@@ -0,0 +1,24 @@
+import pytest
+
+from gestion_estudiantes import HAY_NUMPY, AnaliticaGrupo, GestorEstudiantes, cohorte_de
+
+BACKENDS = [False, pytest.param(True, marks=pytest.mark.skipif(not HAY_NUMPY, reason="NumPy no está instalado"))]
+
+
+@pytest.mark.parametrize("usar_numpy", BACKENDS)
+def test_mascaras_combinadas(usar_numpy):
+    sistema = GestorEstudiantes()
+    analitica = sistema.almacen.registrar_indice(AnaliticaGrupo(sistema.esquema, usar_numpy=usar_numpy))
+    sistema.poblar(500, semilla=11)
+    estudiantes = sistema.estudiantes()
+    cohorte = cohorte_de(estudiantes[0]["carne"])
+
+    altos = analitica.mascara_superior_a(8.0)
+    de_cohorte = analitica.mascara_cohorte(cohorte)
+    combinaciones = {
+        "y": (altos & de_cohorte, lambda est: est["promedio"] > 8.0 and cohorte_de(est["carne"]) == cohorte),
+        "o": (altos | de_cohorte, lambda est: est["promedio"] > 8.0 or cohorte_de(est["carne"]) == cohorte),
+        "no": (~altos, lambda est: not est["promedio"] > 8.0),
+    }
+    for mascara, condicion in combinaciones.values():
+        assert sorted(analitica.carnes_de(mascara)) == sorted(est["carne"] for est in estudiantes if condicion(est))
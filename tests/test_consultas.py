@@ -0,0 +1,66 @@
+import pytest
+
+from gestion_estudiantes import GestorEstudiantes, cohorte_de
+
+
+@pytest.fixture(scope="module")
+def sistema():
+    sistema = GestorEstudiantes()
+    sistema.poblar(2000, semilla=7)
+    return sistema
+
+
+def _materia_comun(sistema):
+    return max(sistema.cantidad_por_materia().items(), key=lambda par: par[1])[0]
+
+
+def _claves(estudiantes):
+    return [est["carne"] for est in estudiantes]
+
+
+def test_coincide_con_recorrido_completo(sistema):
+    materia = _materia_comun(sistema)
+    consulta = sistema.consulta().donde(promedio__gte=7.5, materia=materia).ordenar_por("-promedio")
+    esperados = [est for est in sistema.estudiantes()
+                 if est["promedio"] >= 7.5 and materia in [nombre for nombre, _ in est["materias"]]]
+    esperados.sort(key=lambda est: -est["promedio"])
+    resultado = sistema.consultar(consulta)
+    assert sorted(_claves(resultado)) == sorted(_claves(esperados))
+    assert [est["promedio"] for est in resultado] == [est["promedio"] for est in esperados]
+
+
+def test_sin_orden_conserva_la_insercion(sistema):
+    anio = cohorte_de(sistema.estudiantes()[0]["carne"])
+    esperados = [est for est in sistema.estudiantes() if cohorte_de(est["carne"]) == anio and est["promedio"] > 5]
+    assert _claves(sistema.consultar(sistema.consulta().donde(cohorte=anio, promedio__gt=5))) == _claves(esperados)
+
+
+def test_elige_el_indice_mas_selectivo(sistema):
+    carne = sistema.estudiantes()[10]["carne"]
+    consulta = sistema.consulta().donde(promedio__gt=0, carne=carne)
+    assert consulta.explicar().startswith("índice de carne")
+    assert _claves(consulta) == [carne]
+    assert sistema.consulta().donde(promedio__gt=9.9).explicar().startswith("índice de promedios")
+
+
+def test_limite_con_orden_por_promedio(sistema):
+    mejores = sistema.consulta().ordenar_por("-promedio").limitar(5).lista()
+    todos = sorted((est["promedio"] for est in sistema.estudiantes()), reverse=True)
+    assert [est["promedio"] for est in mejores] == todos[:5]
+
+
+@pytest.mark.parametrize("condicion", [
+    {"nombre__contains": 12345},
+    {"carne": 905},
+    {"materia__in": ["Cálculo I", 3]},
+    {"materia__in": "Cálculo I"},
+    {"promedio__gt": "8"},
+    {"promedio__gt": True},
+    {"cohorte": True},
+    {"cohorte__in": 23},
+    {"edad": 20},
+    {"nombre__gt": "a"},
+])
+def test_condiciones_invalidas(sistema, condicion):
+    with pytest.raises(ValueError):
+        sistema.consulta().donde(**condicion)
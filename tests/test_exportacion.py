@@ -0,0 +1,83 @@
+import threading
+
+from gestion_estudiantes import AlmacenEstudiantes, ESQUEMA_CLI, exportar, importar_archivo
+from gestion_estudiantes import exportacion
+
+
+def _almacen(cantidad=300):
+    almacen = AlmacenEstudiantes(ESQUEMA_CLI, compacto=True)
+    for i in range(cantidad):
+        almacen.agregar({"nombre": f"Estudiante {i}", "carne": f"0905-{18 + i % 3}-{i:04d}",
+                         "materias": [("Cálculo I", 4), ("Física General", 3)], "promedio": (i * 7) % 101 / 10})
+    return almacen
+
+
+def test_exportacion_se_vuelve_a_importar(tmp_path):
+    almacen = _almacen()
+    for nombre in ("estudiantes.csv", "estudiantes.jsonl.gz"):
+        ruta = str(tmp_path / nombre)
+        assert exportar(almacen, ruta) == len(almacen)
+        copia = AlmacenEstudiantes(ESQUEMA_CLI)
+        assert importar_archivo(ruta, copia) == (len(almacen), 0)
+        assert [dict(est) for est in almacen] == list(copia)
+
+
+def test_filtros_de_promedio_y_cohorte(tmp_path):
+    almacen = _almacen()
+    ruta = str(tmp_path / "honor.jsonl")
+    exportar(almacen, ruta, promedio_minimo=8.0, cohorte=19)
+    copia = AlmacenEstudiantes(ESQUEMA_CLI)
+    importar_archivo(ruta, copia)
+    esperados = sorted((est for est in almacen if est["promedio"] > 8.0 and est["carne"][5:7] == "19"),
+                       key=lambda est: est["promedio"], reverse=True)
+    assert [est["promedio"] for est in copia] == [est["promedio"] for est in esperados]
+    assert {est["carne"] for est in copia} == {est["carne"] for est in esperados}
+
+
+def test_filtro_de_promedio_no_materializa_el_tramo():
+    almacen = _almacen()
+    almacen.promedios.superiores_a = None  # Debe recorrerse el índice en forma perezosa
+    primero = next(exportacion.seleccionar(almacen, promedio_minimo=5.0))
+    assert primero["promedio"] == 10.0
+
+
+class _CandadoQueModifica:
+    """Candado que, cada vez que se toma, simula a otro hilo agregando y eliminando estudiantes."""
+
+    def __init__(self, almacen):
+        self.almacen = almacen
+        self.candado = threading.RLock()
+        self.tomas = 0
+
+    def __enter__(self):
+        self.candado.acquire()
+        self.tomas += 1
+        presentes = [est["carne"] for est in self.almacen]
+        for carne in presentes[1:len(presentes):7]:
+            self.almacen.eliminar(carne)
+        self.almacen.agregar({"nombre": "Nuevo", "carne": f"0905-25-{self.tomas:04d}",
+                              "materias": [], "promedio": 9.95})
+
+    def __exit__(self, *error):
+        self.candado.release()
+
+
+def test_exportar_por_tramos_mientras_cambia_el_almacen(tmp_path, monkeypatch):
+    monkeypatch.setattr(exportacion, "TAMANIO_TRAMO", 16)
+    for promedio_minimo in (None, 3.0):
+        almacen = _almacen(2000)
+        iniciales = {est["carne"] for est in almacen if promedio_minimo is None or est["promedio"] > promedio_minimo}
+        candado = _CandadoQueModifica(almacen)
+        ruta = str(tmp_path / "estudiantes.jsonl")
+        exportar(almacen, ruta, promedio_minimo=promedio_minimo, candado=candado)
+
+        copia = AlmacenEstudiantes(ESQUEMA_CLI)
+        resultado = importar_archivo(ruta, copia)
+        assert resultado.rechazados == 0  # Ningún carné repetido
+        assert candado.tomas > 10
+        siguen = iniciales & almacen.set_carnes
+        assert siguen <= copia.set_carnes
+        if promedio_minimo is not None:
+            promedios = [est["promedio"] for est in copia]
+            assert promedios == sorted(promedios, reverse=True) or promedios[0] == 9.95
+        assert almacen._fijaciones == 0
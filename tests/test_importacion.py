@@ -0,0 +1,112 @@
+import json
+
+from gestion_estudiantes import AlmacenEstudiantes, ESQUEMA_CLI, importar_archivo, importar_filas
+from gestion_estudiantes.importacion import validar_fila
+
+
+def _fila(carne, materias="Cálculo I:4"):
+    return {"nombre": "Ana Pérez", "carne": carne, "materias": materias, "promedio": "8.5"}
+
+
+def test_creditos_fuera_de_rango_se_rechazan_al_validar():
+    estudiante, motivo = validar_fila(_fila("0905-24-0001", "Cálculo I:70000"), ESQUEMA_CLI)
+    assert estudiante is None
+    assert "fuera de rango" in motivo
+
+
+def test_fila_que_el_almacen_rechaza_va_a_rechazos(tmp_path):
+    ruta = tmp_path / "entrada.csv"
+    ruta.write_text("nombre,carne,materias,promedio\n"
+                    "Ana Pérez,0905-24-0001,Cálculo I:4,8.5\n"
+                    "Luis Gómez,0905-24-0002,Cálculo I:70000,7.0\n"
+                    "Eva Ruiz,0905-24-0003,Física:3,9.0\n", encoding="utf-8")
+    ruta_rechazos = tmp_path / "rechazos.jsonl"
+    almacen = AlmacenEstudiantes(ESQUEMA_CLI, compacto=True)
+
+    resultado = importar_archivo(str(ruta), almacen, str(ruta_rechazos))
+
+    assert resultado == (2, 1)
+    assert sorted(almacen.set_carnes) == ["0905-24-0001", "0905-24-0003"]
+    rechazo, = [json.loads(linea) for linea in ruta_rechazos.read_text(encoding="utf-8").splitlines()]
+    assert rechazo["linea"] == 3
+
+
+class _AlmacenQueRechaza(AlmacenEstudiantes):
+    def agregar(self, estudiante):
+        if estudiante["carne"].endswith("2"):
+            raise ValueError("rechazado por el almacén")
+        return super().agregar(estudiante)
+
+
+def test_error_del_almacen_no_interrumpe_el_lote():
+    almacen = _AlmacenQueRechaza(ESQUEMA_CLI)
+    anotados = []
+
+    class Rechazos:
+        def anotar(self, numero, motivo, fila):
+            anotados.append((numero, motivo))
+
+    filas = [(i, _fila(f"0905-24-000{i}")) for i in range(1, 5)]
+    resultado = importar_filas(filas, almacen, Rechazos(), tamanio_lote=2)
+
+    assert resultado == (3, 1)
+    assert anotados == [(2, "rechazado por el almacén")]
+    assert len(almacen) == 3
+
+
+def test_carnes_ya_registrados_y_repetidos():
+    almacen = AlmacenEstudiantes(ESQUEMA_CLI)
+    importar_filas([(1, _fila("0905-24-0001"))], almacen)
+    filas = [(1, _fila("0905-24-0001")), (2, _fila("0905-24-0002")), (3, _fila("0905-24-0002"))]
+    assert importar_filas(filas, almacen) == (1, 2)
+
+
+def test_contexto_por_lote():
+    from contextlib import contextmanager
+
+    almacen = AlmacenEstudiantes(ESQUEMA_CLI)
+    tamanios = []
+
+    @contextmanager
+    def contexto_lote():
+        antes = len(almacen)
+        yield
+        tamanios.append(len(almacen) - antes)
+
+    filas = [(i, _fila(f"0905-24-{i:04d}")) for i in range(1, 6)]
+    assert importar_filas(filas, almacen, tamanio_lote=2, contexto_lote=contexto_lote) == (5, 0)
+    assert tamanios == [2, 2, 1]
+
+
+def test_materias_que_no_son_lista_se_rechazan():
+    fila = dict(_fila("0905-24-0001"), materias=5)
+    estudiante, motivo = validar_fila(fila, ESQUEMA_CLI)
+    assert estudiante is None
+    assert "materias inválidas" in motivo
+
+
+def test_materias_no_lista_en_jsonl_no_detiene_la_importacion(tmp_path):
+    ruta = tmp_path / "entrada.jsonl"
+    lineas = [dict(_fila("0905-24-0001"), materias=5),
+              dict(_fila("0905-24-0002"), materias=[["Cálculo I", 4]])]
+    ruta.write_text("".join(json.dumps(linea) + "\n" for linea in lineas), encoding="utf-8")
+    almacen = AlmacenEstudiantes(ESQUEMA_CLI)
+    resultado = importar_archivo(str(ruta), almacen)
+    assert (resultado.aceptados, resultado.rechazados) == (1, 1)
+    assert "0905-24-0002" in almacen
+
+
+def test_creditos_no_enteros_se_rechazan():
+    for creditos in (3.9, "3.9", True):
+        estudiante, motivo = validar_fila(_fila("0905-24-0001", [["Cálculo I", creditos]]), ESQUEMA_CLI)
+        assert estudiante is None, creditos
+        assert "no enteros" in motivo
+    estudiante, _ = validar_fila(_fila("0905-24-0001", [["Cálculo I", 4.0]]), ESQUEMA_CLI)
+    assert estudiante["materias"] == [("Cálculo I", 4)]
+
+
+def test_promedio_booleano_se_rechaza():
+    fila = dict(_fila("0905-24-0001"), promedio=True)
+    estudiante, motivo = validar_fila(fila, ESQUEMA_CLI)
+    assert estudiante is None
+    assert motivo == "promedio no numérico"
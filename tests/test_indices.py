@@ -0,0 +1,39 @@
+import pytest
+
+from gestion_estudiantes import AlmacenEstudiantes, ESQUEMA_CLI, GestorEstudiantes
+
+
+@pytest.fixture(scope="module")
+def sistema():
+    sistema = GestorEstudiantes()
+    sistema.poblar(1500, semilla=2)
+    for carne in [est["carne"] for est in sistema.estudiantes()[::7]]:
+        sistema.eliminar(carne)
+    return sistema
+
+
+def _recorrido(sistema, termino, incluir_carne=False):
+    return [est["carne"] for est in sistema.estudiantes()
+            if termino.lower() in est["nombre"].lower() or (incluir_carne and est["carne"] == termino)]
+
+
+@pytest.mark.parametrize("termino", ["pér", "PÉREZ", "perez", "ana", "ez", "z", "", "xyzw", "maría j"])
+def test_trigramas_igual_que_recorrer(sistema, termino):
+    assert [est["carne"] for est in sistema.buscar(termino)] == _recorrido(sistema, termino)
+
+
+def test_incluye_el_carne_exacto(sistema):
+    carne = sistema.estudiantes()[3]["carne"]
+    assert [est["carne"] for est in sistema.buscar(carne, incluir_carne=True)] == _recorrido(sistema, carne, True)
+
+
+def test_candidatos_incluyen_variantes_sin_acento():
+    almacen = AlmacenEstudiantes(ESQUEMA_CLI)
+    for i, nombre in enumerate(["José Pérez", "Jose Perez", "Ana Gómez"], 1):
+        almacen.agregar({"nombre": nombre, "carne": f"0905-24-000{i}", "materias": [], "promedio": 7.0})
+    assert almacen.nombres.candidatos("pérez") == {"0905-24-0001", "0905-24-0002"}
+    assert almacen.nombres.candidatos("pe") is None  # Muy corto para el índice
+    # La verificación final es literal, como `in` sobre el nombre
+    assert [est["nombre"] for est in almacen.buscar_por_nombre("pérez")] == ["José Pérez"]
+    almacen.eliminar("0905-24-0001")
+    assert almacen.nombres.candidatos("pérez") == {"0905-24-0002"}
@@ -0,0 +1,63 @@
+import io
+import json
+
+from gestion_estudiantes import GestorEstudiantes, ejecutar_archivo
+
+
+def _ejecutar(gestor, operaciones, tamanio_lote=1000):
+    entrada = io.StringIO("".join(json.dumps(op, ensure_ascii=False) + "\n" for op in operaciones))
+    salida = io.StringIO()
+    resumen = ejecutar_archivo(gestor, entrada, salida, tamanio_lote)
+    return resumen, [json.loads(linea) for linea in salida.getvalue().splitlines()]
+
+
+def test_un_error_no_detiene_el_lote():
+    gestor = GestorEstudiantes()
+    operaciones = [
+        {"op": "agregar", "nombre": "Ana Pérez", "carne": "0905-24-0001",
+         "materias": [["Cálculo I", 4]], "promedio": 8.5},
+        {"op": "consulta", "donde": {"nombre__contains": 12345}},
+        {"op": "consulta", "donde": {"promedio__gt": "8"}},
+        {"op": "consulta", "donde": "promedio"},
+        {"op": "agregar", "nombre": "Luis Gómez", "carne": "0905-24-0002",
+         "materias": "Cálculo I:70000", "promedio": 7},
+        {"op": "desconocida"},
+        {"op": "consulta", "donde": {"nombre__contains": "pérez"}},
+    ]
+    resumen, resultados = _ejecutar(gestor, operaciones, tamanio_lote=3)
+
+    assert resumen == (7, 5)
+    assert [r["ok"] for r in resultados] == [True, False, False, False, False, False, True]
+    assert [est["carne"] for est in resultados[-1]["resultado"]] == ["0905-24-0001"]
+
+
+def test_linea_mal_formada():
+    gestor = GestorEstudiantes()
+    entrada = io.StringIO('{"op": "promedio"}\nno es json\n')
+    salida = io.StringIO()
+    assert ejecutar_archivo(gestor, entrada, salida) == (2, 1)
+
+
+def test_numeros_enormes_no_detienen_el_lote():
+    gestor = GestorEstudiantes()
+    entrada = io.StringIO('{"op": "superiores", "umbral": 5, "limite": 1e400}\n'
+                          '{"op": "inscribir", "nombre": "Ana Pérez", "anio": 1e400, "materias": [], "promedio": 8}\n'
+                          '{"op": "promedio"}\n')
+    salida = io.StringIO()
+    assert ejecutar_archivo(gestor, entrada, salida) == (3, 2)
+
+
+def test_inscribir_libera_el_carne_si_agregar_falla(monkeypatch):
+    gestor = GestorEstudiantes()
+    operacion = {"op": "inscribir", "nombre": "Ana Pérez", "anio": 24, "materias": [], "promedio": 8}
+
+    def fallar(estudiante):
+        raise ValueError("almacén lleno")
+
+    monkeypatch.setattr(gestor, "agregar", fallar)
+    _, resultados = _ejecutar(gestor, [operacion])
+    assert resultados[0]["error"] == "almacén lleno"
+    monkeypatch.undo()
+
+    _, resultados = _ejecutar(gestor, [operacion])
+    assert resultados[0]["resultado"]["carne"] == "0905-24-0001"
@@ -0,0 +1,32 @@
+import os
+import subprocess
+import sys
+
+import gestion_estudiantes
+from gestion_estudiantes import GestorEstudiantes
+
+
+def test_mismo_orden_que_el_indice_de_promedios(tmp_path):
+    sistema = GestorEstudiantes()
+    sistema.poblar(300, semilla=3)
+    for i in range(1, 6):  # Empates exactos
+        sistema.agregar({"nombre": f"Empate {i}", "carne": f"0905-99-000{i}", "materias": [], "promedio": 9.0})
+    almacen = sistema.almacen
+    esperados = [est["carne"] for est in almacen.promedios.superiores_a(6.0)]
+    carne = almacen.obtener("0905-99-0003")["carne"]
+
+    with gestion_estudiantes.ConsultasParalelas.desde_almacen(almacen, str(tmp_path / "grupo.col"), 2) as consultas:
+        assert [est["carne"] for est in consultas.superiores_a(6.0)] == esperados
+        encontrados = [est["carne"] for est in consultas.buscar_por_nombre(carne, incluir_carne=True)]
+        assert encontrados == [carne]
+        encontrados = [est["carne"] for est in consultas.buscar_por_nombre("empate", incluir_carne=True)]
+        assert encontrados == [f"0905-99-000{i}" for i in range(1, 6)]
+
+
+def test_importacion_perezosa():
+    codigo = ("import sys, gestion_estudiantes; "
+              "print('sqlite3' in sys.modules, 'multiprocessing' in sys.modules); "
+              "from gestion_estudiantes import *; print(AlmacenSQLite.__name__, ConsultasParalelas.__name__)")
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    salida = subprocess.run([sys.executable, "-c", codigo], cwd=raiz, capture_output=True, text=True, check=True)
+    assert salida.stdout.split() == ["False", "False", "AlmacenSQLite", "ConsultasParalelas"]
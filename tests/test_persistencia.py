@@ -0,0 +1,86 @@
+import os
+
+from gestion_estudiantes import AlmacenEstudiantes, ESQUEMA_CLI, Persistencia
+
+
+def _estudiante(i, promedio=7.5):
+    return {"nombre": f"Estudiante {i}", "carne": f"0905-24-{i:04d}", "materias": [("Cálculo I", 4)],
+            "promedio": promedio}
+
+
+def _abrir(directorio, **opciones):
+    almacen = AlmacenEstudiantes(ESQUEMA_CLI, compacto=True)
+    persistencia = Persistencia(str(directorio), **opciones)
+    hay_datos = persistencia.abrir(almacen)
+    return almacen, persistencia, hay_datos
+
+
+def _carnes(almacen):
+    return [est["carne"] for est in almacen]
+
+
+def test_recupera_desde_la_bitacora(tmp_path):
+    almacen, persistencia, hay_datos = _abrir(tmp_path)
+    assert not hay_datos
+    for i in range(1, 6):
+        almacen.agregar(_estudiante(i))
+    almacen.eliminar("0905-24-0002")
+    almacen.actualizar(_estudiante(3, promedio=9.0))
+    # Sin cerrar: simula una caída después de confirmar las operaciones
+    persistencia._bitacora.close()
+
+    recuperado, persistencia, hay_datos = _abrir(tmp_path)
+    assert hay_datos
+    assert _carnes(recuperado) == ["0905-24-0001", "0905-24-0003", "0905-24-0004", "0905-24-0005"]
+    assert recuperado.obtener("0905-24-0003")["promedio"] == 9.0
+    persistencia.cerrar()
+
+
+def test_descarta_un_marco_incompleto_al_final(tmp_path):
+    almacen, persistencia, _ = _abrir(tmp_path)
+    for i in range(1, 4):
+        almacen.agregar(_estudiante(i))
+    persistencia.cerrar()
+    ruta = os.path.join(str(tmp_path), "registro.wal")
+    tamanio = os.path.getsize(ruta)
+    with open(ruta, "ab") as archivo:
+        archivo.write(b"\x40\x00\x00\x00\x00\x00\x00\x00basura")  # Cabecera de un marco a medio escribir
+
+    recuperado, persistencia, _ = _abrir(tmp_path)
+    assert _carnes(recuperado) == ["0905-24-0001", "0905-24-0002", "0905-24-0003"]
+    assert os.path.getsize(ruta) == tamanio  # La cola dañada se truncó
+    recuperado.agregar(_estudiante(4))
+    persistencia.cerrar()
+
+    recuperado, persistencia, _ = _abrir(tmp_path)
+    assert len(recuperado) == 4
+    persistencia.cerrar()
+
+
+def test_marco_corrupto_corta_la_recuperacion(tmp_path):
+    almacen, persistencia, _ = _abrir(tmp_path)
+    for i in range(1, 4):
+        almacen.agregar(_estudiante(i))
+    persistencia.cerrar()
+    ruta = os.path.join(str(tmp_path), "registro.wal")
+    with open(ruta, "r+b") as archivo:
+        archivo.seek(-3, os.SEEK_END)
+        archivo.write(b"\xff\xff\xff")  # Cambia el contenido del último marco: el crc32 ya no coincide
+
+    recuperado, persistencia, _ = _abrir(tmp_path)
+    assert _carnes(recuperado) == ["0905-24-0001", "0905-24-0002"]
+    persistencia.cerrar()
+
+
+def test_instantanea_mas_bitacora(tmp_path):
+    almacen, persistencia, _ = _abrir(tmp_path, operaciones_por_instantanea=4)
+    with persistencia.lote():
+        for i in range(1, 8):  # Se crea una instantánea a la cuarta operación
+            almacen.agregar(_estudiante(i))
+    almacen.eliminar("0905-24-0001")
+    persistencia.cerrar()
+    assert os.path.exists(os.path.join(str(tmp_path), "instantanea.pkl"))
+
+    recuperado, persistencia, _ = _abrir(tmp_path)
+    assert _carnes(recuperado) == [f"0905-24-{i:04d}" for i in range(2, 8)]
+    persistencia.cerrar()
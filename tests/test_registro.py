@@ -0,0 +1,57 @@
+import pickle
+
+import pytest
+
+from gestion_estudiantes import AlmacenEstudiantes, ESQUEMA_CLI, ESQUEMA_RONY, RegistroEstudiante, tipo_registro
+from gestion_estudiantes.registro import (SIN_CREDITOS, CatalogoMaterias, desempaquetar_materias,
+                                          empaquetar_materias)
+
+
+def test_registro_se_lee_como_diccionario():
+    registro = RegistroEstudiante("Ana Pérez", "0905-24-0001", [("Cálculo I", 4), ("Física General", 3)], 8)
+    assert dict(registro) == {"nombre": "Ana Pérez", "carne": "0905-24-0001",
+                              "materias": [("Cálculo I", 4), ("Física General", 3)], "promedio": 8.0}
+    assert registro["promedio"] == 8.0
+    with pytest.raises(KeyError):
+        registro["Carné"]
+    assert not hasattr(registro, "__dict__")
+
+
+def test_pickle_conserva_nombres_de_materia():
+    registro = RegistroEstudiante("Ana Pérez", "0905-24-0001", [("Cálculo I", 4)], 8.5)
+    copia = pickle.loads(pickle.dumps(registro))
+    assert type(copia) is RegistroEstudiante
+    assert copia == registro
+    # Se serializan los nombres, no los índices del catálogo de este proceso
+    assert b"C\xc3\xa1lculo I" in pickle.dumps(registro)
+
+
+def test_pickle_de_registro_rony():
+    tipo = tipo_registro(ESQUEMA_RONY)
+    registro = tipo("Luis Gómez", "0905-24-00001", ["Cálculo I", "Química"], 7.0)
+    copia = pickle.loads(pickle.dumps(registro))
+    assert type(copia) is tipo
+    assert copia["Materias"] == ["Cálculo I", "Química"]
+
+
+def test_catalogo_guarda_cada_nombre_una_vez():
+    catalogo = CatalogoMaterias()
+    datos = empaquetar_materias([("Cálculo I", 4), "Química", ("Cálculo I", 5)], catalogo)
+    assert len(catalogo) == 2
+    assert catalogo.indice("Química") == 1
+    assert desempaquetar_materias(datos, catalogo) == [("Cálculo I", 4), "Química", ("Cálculo I", 5)]
+
+
+def test_creditos_fuera_de_rango():
+    for creditos in (-1, SIN_CREDITOS):
+        with pytest.raises(ValueError):
+            empaquetar_materias([("Cálculo I", creditos)], CatalogoMaterias())
+
+
+def test_almacen_compacto_y_con_diccionarios_dan_lo_mismo():
+    estudiante = {"nombre": "Ana Pérez", "carne": "0905-24-0001", "materias": [("Cálculo I", 4)], "promedio": 8.5}
+    compacto = AlmacenEstudiantes(ESQUEMA_CLI, compacto=True)
+    normal = AlmacenEstudiantes(ESQUEMA_CLI, compacto=False)
+    assert isinstance(compacto.agregar(estudiante), RegistroEstudiante)
+    normal.agregar(estudiante)
+    assert dict(compacto.obtener("0905-24-0001")) == normal.obtener("0905-24-0001")
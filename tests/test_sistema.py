@@ -0,0 +1,11 @@
+import pytest
+
+from gestion_estudiantes import GestorEstudiantes
+
+
+def test_inscribir_fallido_libera_el_carne():
+    sistema = GestorEstudiantes()
+    with pytest.raises(ValueError):
+        sistema.inscribir("Ana Pérez", 24, [("Cálculo I", 70000)], 8.5)
+    assert len(sistema) == 0
+    assert sistema.inscribir("Ana Pérez", 24, [("Cálculo I", 4)], 8.5)["carne"] == "0905-24-0001"
@@ -0,0 +1,25 @@
+import student_management
+from gestion_estudiantes import AlmacenEstudiantes, ESQUEMA_CLI
+
+
+def _responder(monkeypatch, respuestas):
+    respuestas = iter(respuestas)
+    monkeypatch.setattr("builtins.input", lambda mensaje="": next(respuestas))
+
+
+def test_creditos_fuera_de_rango_se_vuelven_a_pedir(monkeypatch, capsys):
+    almacen = AlmacenEstudiantes(ESQUEMA_CLI)
+    _responder(monkeypatch, ["Ana Pérez", "0905-24-0001", "1", "Cálculo I", "70000", "4", "8.5"])
+    student_management.agregar_estudiante(almacen, almacen.set_carnes)
+    assert "entre 1 y 65534" in capsys.readouterr().out
+    assert almacen.obtener("0905-24-0001")["materias"] == [("Cálculo I", 4)]
+
+
+def test_error_del_almacen_se_muestra(monkeypatch, capsys):
+    class Almacen:
+        def agregar(self, estudiante):
+            raise ValueError("Créditos fuera de rango: 70000")
+
+    _responder(monkeypatch, ["Ana Pérez", "0905-24-0001", "0", "8.5"])
+    student_management.agregar_estudiante(Almacen(), set())
+    assert "Error: Créditos fuera de rango" in capsys.readouterr().out